@@ -190,4 +190,17 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Blockchain Configuration for DIT Rewards
 # Set these in environment variables or .env file
 BLOCKCHAIN_RPC_URL = os.getenv('BLOCKCHAIN_RPC_URL', 'https://ethereum-sepolia.wallet.brave.com/')
+# Comma-separated endpoints for the RPC pool; the healthiest one serves each call
+BLOCKCHAIN_RPC_URLS = [url.strip() for url in os.getenv('BLOCKCHAIN_RPC_URLS', BLOCKCHAIN_RPC_URL).split(',') if url.strip()]
 DIT_REWARDS_CONTRACT_ADDRESS = os.getenv('DIT_REWARDS_CONTRACT_ADDRESS', '0x5dB8b867fcC838f37d8aDEb7c38663F5316B7bB9')
+# Optional ws:// or wss:// endpoint for `run_sync_daemon --subscribe` (eth_subscribe instead of polling)
+BLOCKCHAIN_WS_URL = os.getenv('BLOCKCHAIN_WS_URL', '')
+# Blocks below the chain head that can still be reorged; the sync re-checks their hashes every run
+BLOCKCHAIN_CONFIRMATIONS = int(os.getenv('BLOCKCHAIN_CONFIRMATIONS', '12'))
+
+# BSC endpoints used by the CoinMarketCap supply endpoints
+BSC_RPC_URLS = [url.strip() for url in os.getenv(
+    'BSC_RPC_URLS',
+    'https://bsc-dataseed1.binance.org,https://bsc-dataseed2.binance.org,'
+    'https://bsc-dataseed3.binance.org,https://bsc-dataseed4.binance.org'
+).split(',') if url.strip()]
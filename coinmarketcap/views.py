@@ -1,12 +1,15 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
 from django.http import HttpResponse
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .serializers import TokenSupplySerializer
 from decimal import Decimal
+from requests.exceptions import RequestException
 from web3 import Web3
+from diora_reward.services.web3_clients import get_web3_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -63,26 +66,19 @@ class TokenSupplyAPIView(APIView):
         Circulating supply = Total supply - Sum of excluded wallet balances
         """
         try:
-            # Initialize Web3 with BSC mainnet RPC
-            # Using public BSC RPC endpoint
-            w3 = Web3(Web3.HTTPProvider('https://bsc-dataseed1.binance.org'))
+            # Shared BSC client: keep-alive connections, contract built once, no connectivity probe
+            token_contract = get_web3_client(settings.BSC_RPC_URLS).contract(DIT_TOKEN_ADDRESS, ERC20_ABI)
             
-            if not w3.is_connected():
-                logger.error("Failed to connect to BSC network")
+            # Get token decimals
+            try:
+                decimals = token_contract.functions.decimals().call()
+            except RequestException as e:
+                # The first call doubles as the connectivity check
+                logger.error(f"Failed to connect to BSC network: {e}")
                 return Response(
                     {"error": "Failed to connect to blockchain network"},
                     status=status.HTTP_503_SERVICE_UNAVAILABLE
                 )
-            
-            # Create contract instance
-            token_contract = w3.eth.contract(
-                address=Web3.to_checksum_address(DIT_TOKEN_ADDRESS),
-                abi=ERC20_ABI
-            )
-            
-            # Get token decimals
-            try:
-                decimals = token_contract.functions.decimals().call()
             except Exception as e:
                 logger.warning(f"Failed to get decimals, using default 18: {e}")
                 decimals = 18
@@ -164,26 +160,20 @@ class CirculatingSupplyAPIView(APIView):
     def get(self, request):
         """Return circulating supply as a plain number"""
         try:
-            # Initialize Web3 with BSC mainnet RPC
-            w3 = Web3(Web3.HTTPProvider('https://bsc-dataseed1.binance.org'))
+            # Shared BSC client: keep-alive connections, contract built once, no connectivity probe
+            token_contract = get_web3_client(settings.BSC_RPC_URLS).contract(DIT_TOKEN_ADDRESS, ERC20_ABI)
             
-            if not w3.is_connected():
-                logger.error("Failed to connect to BSC network")
+            # Get token decimals
+            try:
+                decimals = token_contract.functions.decimals().call()
+            except RequestException as e:
+                # The first call doubles as the connectivity check
+                logger.error(f"Failed to connect to BSC network: {e}")
                 return HttpResponse(
                     "Service Unavailable",
                     content_type='text/plain',
                     status=503
                 )
-            
-            # Create contract instance
-            token_contract = w3.eth.contract(
-                address=Web3.to_checksum_address(DIT_TOKEN_ADDRESS),
-                abi=ERC20_ABI
-            )
-            
-            # Get token decimals
-            try:
-                decimals = token_contract.functions.decimals().call()
             except Exception as e:
                 logger.warning(f"Failed to get decimals, using default 18: {e}")
                 decimals = 18
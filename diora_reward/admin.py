@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.db import transaction
 from django.utils import timezone
 from .models import RewardDistribution, UserRewardClaim, PendingReward
+from .services.reward_rollups import refresh_reward_rollups_for, distribution_time_range
+from .services.response_cache import bump_rewards_data_version
 
 
 @admin.register(RewardDistribution)
@@ -28,6 +31,23 @@ class RewardDistributionAdmin(admin.ModelAdmin):
         return f"{obj.transaction_hash[:10]}...{obj.transaction_hash[-8:]}"
     transaction_hash_short.short_description = 'Transaction'
 
+    # Keep the daily rollups in step with edits made here
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            refresh_reward_rollups_for([obj.distributed_at])
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            refresh_reward_rollups_for([obj.distributed_at])
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            deleted_times = distribution_time_range(queryset)
+            super().delete_queryset(request, queryset)
+            refresh_reward_rollups_for(deleted_times)
+
 
 @admin.register(UserRewardClaim)
 class UserRewardClaimAdmin(admin.ModelAdmin):
@@ -80,12 +100,32 @@ class PendingRewardAdmin(admin.ModelAdmin):
         return f"{obj.wallet_address[:10]}...{obj.wallet_address[-8:]}"
     wallet_address_short.short_description = 'Wallet'
 
+    # Cached analytics responses include wallet rewards, invalidate them on every edit
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            bump_rewards_data_version()
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            bump_rewards_data_version()
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            bump_rewards_data_version()
+
     def mark_as_sent(self, request, queryset):
-        updated = queryset.update(is_sent=True, sent_at=timezone.now())
+        with transaction.atomic():
+            updated = queryset.update(is_sent=True, sent_at=timezone.now())
+            bump_rewards_data_version()
         self.message_user(request, f"{updated} pending rewards marked as sent.")
     mark_as_sent.short_description = "Mark selected rewards as sent"
 
     def mark_as_pending(self, request, queryset):
-        updated = queryset.update(is_sent=False, sent_at=None)
+        with transaction.atomic():
+            updated = queryset.update(is_sent=False, sent_at=None)
+            bump_rewards_data_version()
         self.message_user(request, f"{updated} rewards marked as pending.")
     mark_as_pending.short_description = "Mark selected rewards as pending"
@@ -0,0 +1,94 @@
+from django.core.management.base import BaseCommand
+from web3 import Web3
+from web3._utils.method_formatters import log_entry_formatter
+import random
+import time
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService
+from diora_reward.services.log_decoder import DISTRIBUTED_TOPIC, CLAIMED_TOPIC, decode_logs
+
+CONTRACT_ADDRESS = '0xc62831c476F6c36D42299b3C6BAa519198302D4b'
+
+
+def _word(value):
+    return f'{value:064x}'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark decoding of raw eth_getLogs results: web3 event processing vs the raw log decoder'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--events',
+            type=int,
+            default=100000,
+            help='Number of synthetic logs, half distributions and half claims (default: 100000)'
+        )
+        parser.add_argument(
+            '--skip-web3',
+            action='store_true',
+            help='Only run the raw decoder (the web3 path is slow on large sets)'
+        )
+
+    def handle(self, *args, **options):
+        raw_logs = self._generate_logs(options['events'])
+        self.stdout.write(f'Generated {len(raw_logs)} synthetic raw logs')
+
+        results = []
+        if not options['skip_web3']:
+            results.append(('web3 log formatter + process_log()', self._time(self._decode_web3, raw_logs)))
+        results.append(('raw decoder (decode_logs)', self._time(decode_logs, raw_logs)))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\n=== Decoding Benchmark ==='))
+        for label, elapsed in results:
+            rate = len(raw_logs) / elapsed if elapsed else 0
+            self.stdout.write(f'  - {label}: {elapsed:.2f}s ({rate:,.0f} events/sec)')
+        if len(results) == 2 and results[1][1]:
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Speedup: {results[0][1] / results[1][1]:.1f}x'))
+
+    def _generate_logs(self, count):
+        """Generate logs shaped like eth_getLogs JSON-RPC results"""
+        raw_logs = []
+        block_number = 1000000
+        for index in range(count):
+            if index % 4 == 0:
+                block_number += 1
+            log = {
+                'address': CONTRACT_ADDRESS.lower(),
+                'blockNumber': hex(block_number),
+                'blockHash': '0x' + _word(block_number),
+                'transactionHash': '0x' + ''.join(random.choices('0123456789abcdef', k=64)),
+                'transactionIndex': hex(index % 50),
+                'logIndex': hex(index % 4),
+                'removed': False,
+            }
+            if index % 2 == 0:
+                wallets = random.randint(10, 500)
+                per_wallet = random.randint(1, 10 ** 6) * 10 ** 15
+                log['topics'] = [DISTRIBUTED_TOPIC, '0x' + _word(random.randint(0, 3))]
+                log['data'] = '0x' + _word(per_wallet * wallets) + _word(per_wallet) + _word(wallets)
+            else:
+                log['topics'] = [CLAIMED_TOPIC, '0x' + _word(random.getrandbits(160))]
+                log['data'] = '0x' + _word(random.randint(1, 10 ** 6) * 10 ** 15)
+            raw_logs.append(log)
+        return raw_logs
+
+    def _time(self, decode, raw_logs):
+        started = time.perf_counter()
+        decode(raw_logs)
+        return time.perf_counter() - started
+
+    def _decode_web3(self, raw_logs):
+        """The previous path: web3's log entry formatter, then ABI decoding per event"""
+        contract = Web3().eth.contract(
+            address=Web3.to_checksum_address(CONTRACT_ADDRESS),
+            abi=DITRewardsBlockchainService.CONTRACT_ABI
+        )
+        events = {
+            DISTRIBUTED_TOPIC: contract.events.RewardsDistributed(),
+            CLAIMED_TOPIC: contract.events.RewardsClaimed(),
+        }
+        decoded = []
+        for raw_log in raw_logs:
+            log = log_entry_formatter(raw_log)
+            decoded.append(events[raw_log['topics'][0]].process_log(log))
+        return decoded
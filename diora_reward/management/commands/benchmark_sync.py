@@ -0,0 +1,138 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+import random
+import time
+from diora_reward.models import RewardDistribution, NFTType
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService
+
+
+class RollbackBenchmark(Exception):
+    """Raised to discard every row written by a benchmark run"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark event ingestion throughput on a synthetic log set (all writes are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--events',
+            type=int,
+            default=100000,
+            help='Number of synthetic RewardsDistributed events (default: 100000)'
+        )
+        parser.add_argument(
+            '--events-per-block',
+            type=int,
+            default=4,
+            help='Average number of events per block (default: 4)'
+        )
+        parser.add_argument(
+            '--chunk-blocks',
+            type=int,
+            default=10000,
+            help='Blocks per sync chunk for the bulk path (default: 10000)'
+        )
+        parser.add_argument(
+            '--skip-legacy',
+            action='store_true',
+            help='Only run the bulk path (the per-event path is slow on large sets)'
+        )
+
+    def handle(self, *args, **options):
+        events = self._generate_events(options['events'], options['events_per_block'])
+        self.stdout.write(f'Generated {len(events)} synthetic events over {events[-1][6] - events[0][6] + 1} blocks')
+
+        results = []
+        if not options['skip_legacy']:
+            results.append(('per-event exists() + create()', self._run(self._ingest_per_event, events)))
+        results.append((
+            f"bulk insert per {options['chunk_blocks']}-block chunk",
+            self._run(self._ingest_bulk, events, options['chunk_blocks'])
+        ))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\n=== Ingestion Benchmark ==='))
+        for label, elapsed in results:
+            rate = len(events) / elapsed if elapsed else 0
+            self.stdout.write(f'  - {label}: {elapsed:.2f}s ({rate:,.0f} events/sec)')
+        if len(results) == 2 and results[1][1]:
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Speedup: {results[0][1] / results[1][1]:.1f}x'))
+
+    def _generate_events(self, count, events_per_block):
+        """Generate decoded events as (nft_type, total, per_wallet, wallets, tx_hash, log_index, block)"""
+        nft_types = [choice[0] for choice in NFTType.choices]
+        block_number = 1000000
+        events = []
+        while len(events) < count:
+            tx_hash = ''.join(random.choices('0123456789abcdef', k=64))
+            for log_index in range(min(random.randint(1, events_per_block * 2 - 1), count - len(events))):
+                wallets = random.randint(10, 500)
+                per_wallet = Decimal(random.randint(1, 10 ** 6)) / Decimal('1000')
+                events.append((
+                    random.choice(nft_types),
+                    per_wallet * wallets,
+                    per_wallet,
+                    wallets,
+                    tx_hash,
+                    log_index,
+                    block_number
+                ))
+            block_number += 1
+        return events
+
+    def _build(self, event, distributed_at):
+        nft_type, total, per_wallet, wallets, tx_hash, log_index, block_number = event
+        return RewardDistribution(
+            nft_type=nft_type,
+            total_amount=total,
+            per_wallet_amount=per_wallet,
+            wallet_count=wallets,
+            transaction_hash=tx_hash,
+            log_index=log_index,
+            block_number=block_number,
+            distributed_at=distributed_at
+        )
+
+    def _run(self, ingest, *args):
+        """Time one ingestion strategy inside a transaction that is rolled back afterwards"""
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                ingest(*args)
+                elapsed = time.perf_counter() - started
+                raise RollbackBenchmark()
+        except RollbackBenchmark:
+            pass
+        return elapsed
+
+    def _ingest_per_event(self, events):
+        """The previous sync loop: one .exists() and one .create() per event"""
+        distributed_at = timezone.now() - timedelta(days=1)
+        for event in events:
+            if RewardDistribution.objects.filter(transaction_hash=event[4], log_index=event[5]).exists():
+                continue
+            self._build(event, distributed_at).save()
+
+    def _ingest_bulk(self, events, chunk_blocks):
+        """The current sync loop: one key lookup and one bulk insert per block chunk"""
+        distributed_at = timezone.now() - timedelta(days=1)
+        index = 0
+        while index < len(events):
+            chunk_start = events[index][6]
+            chunk_end = chunk_start + chunk_blocks - 1
+            chunk = []
+            while index < len(events) and events[index][6] <= chunk_end:
+                chunk.append(events[index])
+                index += 1
+
+            existing_keys = DITRewardsBlockchainService._existing_event_keys(
+                RewardDistribution, chunk_start, chunk_end
+            )
+            records = [
+                self._build(event, distributed_at)
+                for event in chunk
+                if (event[4], event[5]) not in existing_keys
+            ]
+            DITRewardsBlockchainService._bulk_store_events(RewardDistribution, records)
@@ -0,0 +1,134 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService
+from diora_reward.services.fake_chain import FakeChain, FakeChainServer
+import time
+import tracemalloc
+
+SYNC_MODES = ['all', 'separate', 'backfill']
+
+
+class RollbackBenchmark(Exception):
+    """Raised to discard every row written by a benchmark run"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the sync modes against a local fake JSON-RPC chain (all writes are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--events',
+            type=int,
+            default=20000,
+            help='Number of logs in the generated corpus (default: 20000)'
+        )
+        parser.add_argument(
+            '--blocks-per-event',
+            type=int,
+            default=10,
+            help='Average block distance between logs (default: 10)'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=20.0,
+            help='Latency added to every RPC request (default: 20)'
+        )
+        parser.add_argument(
+            '--max-results',
+            type=int,
+            default=10000,
+            help='eth_getLogs result limit of the fake provider, 0 for none (default: 10000)'
+        )
+        parser.add_argument(
+            '--rate-limit',
+            type=int,
+            default=0,
+            help='Requests per second before the fake provider answers HTTP 429, 0 for none (default: 0)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Concurrent log fetchers in backfill mode (default: 4)'
+        )
+        parser.add_argument(
+            '--modes',
+            type=str,
+            default=','.join(SYNC_MODES),
+            help=f'Comma-separated sync modes to run: {", ".join(SYNC_MODES)} (default: all of them)'
+        )
+        parser.add_argument(
+            '--no-memory',
+            action='store_true',
+            help='Skip tracemalloc, which slows Python code down noticeably'
+        )
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = [mode for mode in modes if mode not in SYNC_MODES]
+        if unknown:
+            raise CommandError(f'Unknown sync modes: {", ".join(unknown)}')
+
+        results = []
+        for mode in modes:
+            # A fresh chain per mode, so call counts and the rate limit start from zero
+            chain = FakeChain(
+                events=options['events'],
+                blocks_per_event=options['blocks_per_event'],
+                latency=options['latency_ms'] / 1000,
+                max_results=options['max_results'] or None,
+                rate_limit=options['rate_limit'] or None
+            )
+            if not results:
+                self.stdout.write(
+                    f'Fake chain: {len(chain.logs)} logs over blocks {chain.start_block}-{chain.head}, '
+                    f'{options["latency_ms"]:.0f} ms latency'
+                )
+            with FakeChainServer(chain) as server:
+                with override_settings(BLOCKCHAIN_RPC_URLS=[server.url], DIT_REWARDS_CONTRACT_ADDRESS=chain.contract_address):
+                    self.stdout.write(f'\nRunning {mode} sync...')
+                    elapsed, peak_memory = self._run(mode, chain, options)
+            results.append((mode, chain, elapsed, peak_memory))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\n=== Sync Mode Benchmark ==='))
+        for mode, chain, elapsed, peak_memory in results:
+            rpc_calls = sum(chain.calls.values())
+            rate = len(chain.logs) / elapsed if elapsed else 0
+            memory = f', peak {peak_memory / 1024 / 1024:.1f} MiB' if peak_memory is not None else ''
+            self.stdout.write(
+                f'  - {mode}: {elapsed:.2f}s ({rate:,.0f} events/sec), {rpc_calls} RPC calls '
+                f'({rpc_calls / len(chain.logs):.3f} per event) in {chain.http_requests} HTTP requests '
+                f'({chain.throttled} throttled){memory}'
+            )
+            for method, count in chain.calls.most_common():
+                self.stdout.write(f'      {method}: {count}')
+
+    def _run(self, mode, chain, options):
+        """Time one sync mode inside a transaction that is rolled back afterwards"""
+        track_memory = not options['no_memory']
+        peak_memory = None
+        if track_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                service = DITRewardsBlockchainService()
+                if mode == 'all':
+                    service.sync_all_events(chain.start_block, chain.head)
+                elif mode == 'separate':
+                    service.sync_reward_distributions(chain.start_block, chain.head)
+                    service.sync_user_claims(chain.start_block, chain.head)
+                else:
+                    service.sync_all_events(chain.start_block, chain.head, workers=options['workers'])
+                elapsed = time.perf_counter() - started
+                if track_memory:
+                    peak_memory = tracemalloc.get_traced_memory()[1]
+                raise RollbackBenchmark()
+        except RollbackBenchmark:
+            pass
+        finally:
+            if track_memory:
+                tracemalloc.stop()
+        return elapsed, peak_memory
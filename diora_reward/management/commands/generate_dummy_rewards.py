@@ -3,7 +3,9 @@ from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
 import random
-from diora_reward.models import RewardDistribution, UserRewardClaim, PendingReward, NFTType
+from diora_reward.models import RewardDistribution, UserRewardClaim, PendingReward, NFTType, RewardDailyRollup
+from diora_reward.services.reward_rollups import refresh_reward_rollups_for, distribution_time_range
+from diora_reward.services.response_cache import bump_rewards_data_version
 
 
 class Command(BaseCommand):
@@ -34,6 +36,8 @@ class Command(BaseCommand):
             PendingReward.objects.all().delete()
             UserRewardClaim.objects.all().delete()
             RewardDistribution.objects.all().delete()
+            RewardDailyRollup.objects.all().delete()
+            bump_rewards_data_version()
             self.stdout.write(self.style.SUCCESS('✓ Cleared existing data'))
 
         num_distributions = options['distributions']
@@ -110,6 +114,9 @@ class Command(BaseCommand):
             if i % 10 == 0:
                 self.stdout.write(f'  Created {i}/{num_distributions} distributions...')
         
+        # Dummy rows are created one by one, roll up every day they landed on once at the end
+        refresh_reward_rollups_for(distribution_time_range(RewardDistribution.objects.all()))
+        
         self.stdout.write(self.style.SUCCESS(f'\n✓ Successfully generated:'))
         self.stdout.write(f'  - {distributions_created} reward distributions')
         self.stdout.write(f'  - {pending_rewards_created} pending rewards')
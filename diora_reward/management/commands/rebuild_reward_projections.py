@@ -0,0 +1,148 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService, BULK_INSERT_BATCH_SIZE
+from diora_reward.services.log_decoder import decode_stored_logs, DistributionLog, ClaimLog
+from diora_reward.services.reward_rollups import refresh_reward_rollups_for, distribution_time_range
+from diora_reward.models import RawEventLog, RewardDistribution, UserRewardClaim, SyncEventType
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Fields rewritten on rows that already exist; the (transaction_hash, log_index) key stays
+DISTRIBUTION_UPDATE_FIELDS = [
+    'nft_type',
+    'total_amount',
+    'per_wallet_amount',
+    'wallet_count',
+    'block_number',
+    'distributed_at',
+]
+CLAIM_UPDATE_FIELDS = [
+    'wallet_address',
+    'amount',
+    'block_number',
+    'claimed_at',
+]
+
+
+class Command(BaseCommand):
+    help = 'Re-derive RewardDistribution and UserRewardClaim rows from the stored raw logs, without the RPC'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-block',
+            type=int,
+            default=None,
+            help='First block to rebuild (default: first stored log)'
+        )
+        parser.add_argument(
+            '--to-block',
+            type=int,
+            default=None,
+            help='Last block to rebuild (default: last stored log)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20000,
+            help='Raw logs decoded and written per transaction (default: 20000)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('=== Rebuilding Reward Tables From Raw Logs ==='))
+
+        try:
+            started = time.monotonic()
+            service = DITRewardsBlockchainService()
+            digests = {
+                event_type: service.get_digests(event_type)
+                for event_type in (SyncEventType.REWARDS_DISTRIBUTED, SyncEventType.REWARDS_CLAIMED)
+            }
+
+            raw_logs = RawEventLog.objects.order_by('block_number', 'log_index')
+            if options['from_block'] is not None:
+                raw_logs = raw_logs.filter(block_number__gte=options['from_block'])
+            if options['to_block'] is not None:
+                raw_logs = raw_logs.filter(block_number__lte=options['to_block'])
+
+            totals = {'logs': 0, 'distributions': 0, 'claims': 0}
+            batch = []
+            for row in raw_logs.values_list(
+                'block_number', 'log_index', 'block_timestamp', 'transaction_hash', 'topics', 'data'
+            ).iterator(chunk_size=options['batch_size']):
+                batch.append(row)
+                if len(batch) >= options['batch_size']:
+                    self._rebuild_batch(service, digests, batch, totals)
+                    batch = []
+            if batch:
+                self._rebuild_batch(service, digests, batch, totals)
+
+            elapsed = time.monotonic() - started
+            rate = totals['logs'] / elapsed if elapsed else 0
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ Rebuilt {totals['distributions']} distributions and {totals['claims']} claims "
+                f"from {totals['logs']} raw logs in {elapsed:.1f}s ({rate:,.0f} logs/sec)"
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'✗ Error: {str(e)}'))
+            logger.error(f'Error rebuilding reward projections: {str(e)}')
+            raise
+
+    def _rebuild_batch(self, service, digests, batch, totals):
+        """
+        Upsert the rows derived from one batch of raw logs
+
+        Existing rows are updated in place instead of deleted and re-created,
+        so PendingReward rows referencing a distribution are kept.
+        """
+        timestamps = {block_number: block_timestamp for block_number, _, block_timestamp, _, _, _ in batch}
+        events = decode_stored_logs(
+            (block_number, log_index, transaction_hash, topics, data)
+            for block_number, log_index, _, transaction_hash, topics, data in batch
+        )
+        distributions = service._known_nft_type_events([event for event in events if isinstance(event, DistributionLog)])
+        distribution_records = [
+            service._build_distribution(event, timestamps[event.block_number]) for event in distributions
+        ]
+        claim_records = [
+            service._build_claim(event, timestamps[event.block_number])
+            for event in events if isinstance(event, ClaimLog)
+        ]
+
+        first_block, last_block = batch[0][0], batch[-1][0]
+        with transaction.atomic():
+            # Days of the rows about to be rewritten, in case a timestamp moves to another day
+            previous_times = distribution_time_range(
+                RewardDistribution.objects.filter(block_number__gte=first_block, block_number__lte=last_block)
+            )
+            RewardDistribution.objects.bulk_create(
+                distribution_records,
+                batch_size=BULK_INSERT_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['transaction_hash', 'log_index'],
+                update_fields=DISTRIBUTION_UPDATE_FIELDS
+            )
+            UserRewardClaim.objects.bulk_create(
+                claim_records,
+                batch_size=BULK_INSERT_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['transaction_hash', 'log_index'],
+                update_fields=CLAIM_UPDATE_FIELDS
+            )
+            if distribution_records:
+                digests[SyncEventType.REWARDS_DISTRIBUTED].refresh(first_block, last_block)
+                refresh_reward_rollups_for(
+                    previous_times + [record.distributed_at for record in distribution_records]
+                )
+            if claim_records:
+                digests[SyncEventType.REWARDS_CLAIMED].refresh(first_block, last_block)
+
+        totals['logs'] += len(batch)
+        totals['distributions'] += len(distribution_records)
+        totals['claims'] += len(claim_records)
+        self.stdout.write(
+            f'  📦 Blocks {first_block}-{last_block}: {len(distribution_records)} distributions, '
+            f'{len(claim_records)} claims'
+        )
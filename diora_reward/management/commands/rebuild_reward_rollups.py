@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from diora_reward.models import RewardDailyRollup, RewardDistribution
+from diora_reward.services.reward_rollups import refresh_reward_rollups, distribution_time_range, utc_day
+from diora_reward.services.response_cache import bump_rewards_data_version
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Recompute the RewardDailyRollup table from RewardDistribution (backfill or repair)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-date',
+            type=str,
+            default=None,
+            help='First UTC day to rebuild, YYYY-MM-DD (default: first distribution)'
+        )
+        parser.add_argument(
+            '--to-date',
+            type=str,
+            default=None,
+            help='Last UTC day to rebuild, YYYY-MM-DD (default: last distribution)'
+        )
+        parser.add_argument(
+            '--batch-days',
+            type=int,
+            default=31,
+            help='Days recomputed per transaction (default: 31)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('=== Rebuilding Reward Daily Rollups ==='))
+
+        try:
+            from_date = self._parse_date(options['from_date'], '--from-date')
+            to_date = self._parse_date(options['to_date'], '--to-date')
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['batch_days'] < 1:
+            raise CommandError('--batch-days must be at least 1')
+
+        try:
+            started = time.monotonic()
+            first, last = distribution_time_range(RewardDistribution.objects.all())
+            if first is None:
+                if from_date is None and to_date is None:
+                    RewardDailyRollup.objects.all().delete()
+                    bump_rewards_data_version()
+                self.stdout.write(self.style.WARNING('No reward distributions, nothing to roll up'))
+                return
+
+            first_day = from_date or utc_day(first)
+            last_day = to_date or utc_day(last)
+            if from_date is None and to_date is None:
+                # Full rebuild: drop rollups of days that no longer have distributions at all
+                RewardDailyRollup.objects.exclude(day__gte=first_day, day__lte=last_day).delete()
+                bump_rewards_data_version()
+
+            rows = 0
+            batch_start = first_day
+            while batch_start <= last_day:
+                batch_end = min(batch_start + timedelta(days=options['batch_days'] - 1), last_day)
+                batch_rows = refresh_reward_rollups(batch_start, batch_end)
+                rows += batch_rows
+                self.stdout.write(f'  📦 {batch_start} to {batch_end}: {batch_rows} rollup rows')
+                batch_start = batch_end + timedelta(days=1)
+
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ Rebuilt {rows} rollup rows for {first_day} to {last_day} in {elapsed:.1f}s'
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'✗ Error: {str(e)}'))
+            logger.error(f'Error rebuilding reward rollups: {str(e)}')
+            raise
+
+    @staticmethod
+    def _parse_date(value, option):
+        if value is None:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f'{option} must be a date in YYYY-MM-DD format')
@@ -0,0 +1,216 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q, Sum
+from django.utils import timezone
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService
+from diora_reward.models import PendingReward, UserRewardClaim, ReconciliationRun, SyncEventType
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+import csv
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Wallets per `wallet_address IN (...)` query in incremental mode
+WALLET_QUERY_BATCH_SIZE = 5000
+
+REPORT_FIELDS = [
+    'wallet_address',
+    'db_pending',
+    'chain_pending',
+    'pending_diff',
+    'db_claimed',
+    'chain_claimed',
+    'claimed_diff',
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare per-wallet pending and claimed rewards in the database with the contract'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since-block',
+            type=str,
+            default=None,
+            help='Only re-check wallets touched from this block on, or "last" for the previous run (default: all wallets)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='Report path ending in .json or .csv (default: logs/reconcile_rewards_<timestamp>.json)'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=str,
+            default='0.0001',
+            help='Largest DIT difference not reported, covers 6-decimal rounding in the DB (default: 0.0001)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Multicall batches read concurrently (default: 4)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('=== Reconciling Rewards With The Contract ==='))
+
+        try:
+            tolerance = Decimal(options['tolerance'])
+        except InvalidOperation:
+            raise CommandError(f"Invalid --tolerance: {options['tolerance']}")
+
+        try:
+            started = time.monotonic()
+            service = DITRewardsBlockchainService()
+            block_number = service.w3.eth.block_number
+            since_block = self._resolve_since_block(options['since_block'])
+
+            synced_to = service.get_checkpoints(SyncEventType.REWARDS_CLAIMED).high_water_mark()
+            if synced_to is None or block_number - synced_to > service.confirmations:
+                self.stdout.write(self.style.WARNING(
+                    f'⚠️  Claims are synced to block {synced_to}, chain head is {block_number}. '
+                    f'Recent claims will show up as mismatches.'
+                ))
+
+            wallets = self._wallets_to_check(service, since_block, block_number)
+            scope = f'touched since block {since_block}' if since_block is not None else 'in the database'
+            self.stdout.write(f'Checking {len(wallets):,} wallets {scope} at block {block_number}...')
+
+            db_pending, db_claimed = self._database_balances(wallets, incremental=since_block is not None)
+            chain = service.get_rewards_batch(
+                wallets,
+                block_identifier=block_number,
+                workers=options['workers']
+            )
+
+            mismatches = []
+            for wallet in wallets:
+                chain_pending = chain['pending'].get(wallet, Decimal('0'))
+                chain_claimed = chain['claimed'].get(wallet, Decimal('0'))
+                pending_diff = chain_pending - db_pending.get(wallet, Decimal('0'))
+                claimed_diff = chain_claimed - db_claimed.get(wallet, Decimal('0'))
+                if abs(pending_diff) > tolerance or abs(claimed_diff) > tolerance:
+                    mismatches.append({
+                        'wallet_address': wallet,
+                        'db_pending': str(db_pending.get(wallet, Decimal('0'))),
+                        'chain_pending': str(chain_pending),
+                        'pending_diff': str(pending_diff),
+                        'db_claimed': str(db_claimed.get(wallet, Decimal('0'))),
+                        'chain_claimed': str(chain_claimed),
+                        'claimed_diff': str(claimed_diff),
+                    })
+
+            report_path = self._write_report(options['output'], {
+                'block_number': block_number,
+                'since_block': since_block,
+                'wallets_checked': len(wallets),
+                'tolerance': str(tolerance),
+                'generated_at': timezone.now().isoformat(),
+                'mismatches': mismatches,
+            })
+            ReconciliationRun.objects.create(
+                block_number=block_number,
+                since_block=since_block,
+                wallets_checked=len(wallets),
+                mismatches=len(mismatches),
+                report_path=str(report_path)
+            )
+
+            elapsed = time.monotonic() - started
+            style = self.style.SUCCESS if not mismatches else self.style.ERROR
+            self.stdout.write(style(
+                f'{"✓" if not mismatches else "✗"} {len(mismatches)} of {len(wallets):,} wallets differ '
+                f'({elapsed:.1f}s), report written to {report_path}'
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'✗ Error: {str(e)}'))
+            logger.error(f'Error reconciling rewards: {str(e)}')
+            raise
+
+    def _resolve_since_block(self, since_block):
+        if since_block is None:
+            return None
+        if since_block == 'last':
+            last_run = ReconciliationRun.objects.first()
+            if last_run is None:
+                self.stdout.write('No previous run, checking all wallets')
+                return None
+            return last_run.block_number + 1
+        try:
+            return int(since_block)
+        except ValueError:
+            raise CommandError(f'Invalid --since-block: {since_block}')
+
+    def _wallets_to_check(self, service, since_block, block_number):
+        """Wallets with pending rewards or claims, or only those touched from since_block on"""
+        pending = PendingReward.objects.all()
+        claims = UserRewardClaim.objects.all()
+        if since_block is not None:
+            if since_block > block_number:
+                return []
+            # Admin changes (e.g. marking rewards as sent) have no block number,
+            # so rows updated after the block's timestamp count as touched too
+            since_time = service.get_block_timestamp(since_block)
+            pending = pending.filter(
+                Q(distribution__block_number__gte=since_block) | Q(updated_at__gte=since_time)
+            )
+            claims = claims.filter(block_number__gte=since_block)
+
+        wallets = set(pending.values_list('wallet_address', flat=True).distinct())
+        wallets.update(claims.values_list('wallet_address', flat=True).distinct())
+        return sorted(wallet.lower() for wallet in wallets)
+
+    def _database_balances(self, wallets, incremental):
+        """
+        Expected on-chain balances per wallet
+
+        Rewards marked as sent were credited to the contract's pendingRewards,
+        claims move them to claimedRewards, so pending = sent - claimed.
+
+        Returns:
+            Tuple of (pending, claimed) dicts mapping wallet to Decimal
+        """
+        sent = defaultdict(Decimal)
+        claimed = defaultdict(Decimal)
+        # A full run aggregates the whole table instead of passing every wallet as a parameter
+        wallet_batches = (
+            [wallets[i:i + WALLET_QUERY_BATCH_SIZE] for i in range(0, len(wallets), WALLET_QUERY_BATCH_SIZE)]
+            if incremental else [None]
+        )
+        for batch in wallet_batches:
+            pending_rows = PendingReward.objects.filter(is_sent=True)
+            claim_rows = UserRewardClaim.objects.all()
+            if batch is not None:
+                pending_rows = pending_rows.filter(wallet_address__in=batch)
+                claim_rows = claim_rows.filter(wallet_address__in=batch)
+            for row in pending_rows.values('wallet_address').annotate(total=Sum('dit_amount')):
+                sent[row['wallet_address'].lower()] += row['total']
+            for row in claim_rows.values('wallet_address').annotate(total=Sum('amount')):
+                claimed[row['wallet_address'].lower()] += row['total']
+
+        pending = {wallet: sent[wallet] - claimed[wallet] for wallet in set(sent) | set(claimed)}
+        return pending, dict(claimed)
+
+    def _write_report(self, output, report):
+        if output:
+            path = Path(output)
+        else:
+            path = Path(settings.BASE_DIR) / 'logs' / f'reconcile_rewards_{timezone.now():%Y%m%d_%H%M%S}.json'
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.suffix.lower() == '.csv':
+            with open(path, 'w', newline='') as report_file:
+                writer = csv.DictWriter(report_file, fieldnames=REPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(report['mismatches'])
+        else:
+            with open(path, 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+        return path
@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService
+from diora_reward.services.sync_metrics import track_sync_run
+from diora_reward.models import SyncEventType
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Find block ranges skipped by interrupted syncs and sync only those ranges'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event-type',
+            choices=['distributions', 'claims', 'all'],
+            default='all',
+            help='Event stream to repair (default: all)'
+        )
+        parser.add_argument(
+            '--from-block',
+            type=int,
+            default=None,
+            help='First block that should be covered (default: contract deployment block, else start of the first synced range)'
+        )
+        parser.add_argument(
+            '--to-block',
+            type=int,
+            default=None,
+            help='Last block that should be covered (default: last synced block)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the gaps without syncing them'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            service = DITRewardsBlockchainService()
+
+            streams = []
+            if options['event_type'] in ('distributions', 'all'):
+                streams.append((SyncEventType.REWARDS_DISTRIBUTED, service.sync_reward_distributions))
+            if options['event_type'] in ('claims', 'all'):
+                streams.append((SyncEventType.REWARDS_CLAIMED, service.sync_user_claims))
+
+            # Blocks between the deployment and the first synced range count as a gap too
+            floor = options['from_block']
+            if floor is None:
+                floor = service.get_deployment_block()
+
+            total_repaired = 0
+            for event_type, sync in streams:
+                gaps = service.get_checkpoints(event_type).find_gaps(
+                    floor=floor,
+                    ceiling=options['to_block']
+                )
+                if not gaps:
+                    self.stdout.write(self.style.SUCCESS(f'✓ {event_type}: no gaps found'))
+                    continue
+
+                missing_blocks = sum(gap_end - gap_start + 1 for gap_start, gap_end in gaps)
+                self.stdout.write(f'{event_type}: {len(gaps)} gaps ({missing_blocks} blocks)')
+                for gap_start, gap_end in gaps:
+                    self.stdout.write(f'  - {gap_start} to {gap_end}')
+                    if not options['dry_run']:
+                        with track_sync_run(service, 'repair_sync_gaps'):
+                            total_repaired += sync(gap_start, gap_end)
+
+            if not options['dry_run']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'✓ Repaired gaps, {total_repaired} new events synced'
+                ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'✗ Error: {str(e)}'))
+            logger.error(f'Error repairing sync gaps: {str(e)}')
+            raise
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from diora_reward.services.rpc_pool import get_rpc_pool
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Probe every RPC endpoint of a pool and show its health'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--network',
+            choices=['rewards', 'bsc'],
+            default='rewards',
+            help='rewards = BLOCKCHAIN_RPC_URLS, bsc = BSC_RPC_URLS used by the supply endpoints'
+        )
+        parser.add_argument(
+            '--probes',
+            type=int,
+            default=3,
+            help='eth_blockNumber calls sent to each endpoint (default: 3)'
+        )
+
+    def handle(self, *args, **options):
+        if options['network'] == 'bsc':
+            urls = settings.BSC_RPC_URLS
+        else:
+            urls = getattr(settings, 'BLOCKCHAIN_RPC_URLS', None) or [settings.BLOCKCHAIN_RPC_URL]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'=== RPC Pool: {options["network"]} ==='))
+        pool = get_rpc_pool(urls)
+        for _ in range(options['probes']):
+            pool.probe()
+
+        write_stats(self.stdout, self.style, pool.stats())
+
+
+def write_stats(stdout, style, stats):
+    """Write one line per endpoint, healthiest first"""
+    for endpoint in stats:
+        latency = f"{endpoint['latency_ms']:.0f} ms" if endpoint['latency_ms'] is not None else 'n/a'
+        line = (
+            f"{endpoint['url']}: {latency}, {endpoint['errors']}/{endpoint['requests']} errors "
+            f"(rate {endpoint['error_rate']:.2f}), limit {endpoint['rate_limit']} req/s "
+            f"x {endpoint['concurrency_limit']} concurrent, {endpoint['throttle_events']} throttle events"
+        )
+        if endpoint['last_throttled_at']:
+            line += f" (last at {endpoint['last_throttled_at']})"
+        if endpoint['cooling_down']:
+            stdout.write(style.ERROR(f'✗ {line}, cooling down'))
+        else:
+            stdout.write(style.SUCCESS(f'✓ {line}'))
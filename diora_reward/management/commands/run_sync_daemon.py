@@ -0,0 +1,286 @@
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, DatabaseError
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService
+from diora_reward.services.log_decoder import DISTRIBUTED_TOPIC, CLAIMED_TOPIC
+from diora_reward.services.log_subscription import LogSubscription
+from diora_reward.services.sync_metrics import track_sync_run
+from diora_reward.models import RawEventLog, SyncEventType
+from .rpc_pool_status import write_stats
+import logging
+import signal
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run the blockchain sync as a long-lived process that polls (or subscribes) for new blocks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=12.0,
+            help='Seconds between polls while new blocks keep arriving (default: 12)'
+        )
+        parser.add_argument(
+            '--max-interval',
+            type=float,
+            default=120.0,
+            help='Longest wait between polls when the chain is idle or the RPC fails (default: 120)'
+        )
+        parser.add_argument(
+            '--max-blocks-per-loop',
+            type=int,
+            default=100000,
+            help='Most blocks synced per loop, so shutdown is never delayed by a long catch-up (default: 100000)'
+        )
+        parser.add_argument(
+            '--subscribe',
+            action='store_true',
+            help='Follow the chain with eth_subscribe over WebSocket instead of polling; '
+                 'gaps are filled by polling on every (re)connect'
+        )
+        parser.add_argument(
+            '--ws-url',
+            type=str,
+            default=None,
+            help='WebSocket endpoint for --subscribe (default: BLOCKCHAIN_WS_URL)'
+        )
+
+    def handle(self, *args, **options):
+        ws_url = options['ws_url'] or settings.BLOCKCHAIN_WS_URL
+        if options['subscribe'] and not ws_url:
+            raise CommandError('--subscribe needs a WebSocket endpoint: set BLOCKCHAIN_WS_URL or pass --ws-url')
+
+        self._stop = threading.Event()
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        service = DITRewardsBlockchainService()
+        lock_id = zlib.crc32(f'diora_reward.sync:{service.contract.address.lower()}'.encode())
+
+        if not self._acquire_lock(lock_id):
+            raise CommandError('Another sync daemon holds the lock for this contract, exiting')
+
+        try:
+            if options['subscribe']:
+                self._run_subscribed(service, ws_url, options)
+            else:
+                self._run(service, options)
+        finally:
+            self._release_lock(lock_id)
+            write_stats(self.stdout, self.style, service.rpc_pool.stats())
+            self.stdout.write(self.style.SUCCESS('✓ Sync daemon stopped'))
+
+    def _resume_block(self, service):
+        return min(
+            service.get_resume_block(SyncEventType.REWARDS_DISTRIBUTED),
+            service.get_resume_block(SyncEventType.REWARDS_CLAIMED)
+        )
+
+    def _run(self, service, options):
+        from_block = self._resume_block(service)
+        interval = options['interval']
+        self.stdout.write(self.style.MIGRATE_HEADING(f'=== Sync daemon started at block {from_block} ==='))
+
+        while not self._stop.is_set():
+            try:
+                head = service.w3.eth.block_number
+                if head >= from_block:
+                    to_block = min(head, from_block + options['max_blocks_per_loop'] - 1)
+                    with track_sync_run(service, 'run_sync_daemon'):
+                        service.sync_all_events(from_block, to_block)
+                    from_block = to_block + 1
+                    interval = options['interval']
+                    if to_block < head:
+                        # Still catching up, continue without waiting
+                        continue
+                elif service.rollback_reorged_blocks(head) is not None:
+                    # Same height but a different tip, rescan what was rolled back
+                    from_block = self._resume_block(service)
+                    continue
+                else:
+                    # No new block since the last poll
+                    interval = min(interval * 2, options['max_interval'])
+            except DatabaseError:
+                # The advisory lock lives on the DB session, so a broken
+                # connection means the lock can no longer be trusted
+                raise
+            except Exception as e:
+                logger.error(f'Sync daemon loop failed: {str(e)}')
+                self.stdout.write(self.style.ERROR(f'✗ Sync failed, retrying in {interval:.0f}s: {str(e)}'))
+                interval = min(interval * 2, options['max_interval'])
+
+            self._stop.wait(interval)
+
+    def _run_subscribed(self, service, ws_url, options):
+        """
+        Follow the chain through a log subscription, reconnecting with backoff
+
+        Every (re)connect first polls from the checkpoints up to the head, once
+        before subscribing so the catch-up does not happen while notifications
+        pile up, and once after so blocks mined in between are not missed.
+        """
+        retry_interval = options['interval']
+        self.stdout.write(self.style.MIGRATE_HEADING(f'=== Sync daemon subscribing to {ws_url} ==='))
+
+        while not self._stop.is_set():
+            try:
+                next_block = self._catch_up(service, self._resume_block(service), options)
+                if self._stop.is_set():
+                    break
+                with LogSubscription(ws_url, service.contract.address, [[DISTRIBUTED_TOPIC, CLAIMED_TOPIC]]) as subscription:
+                    next_block = self._catch_up(service, next_block, options)
+                    self.stdout.write(f'📡 Subscribed, following new blocks from {next_block}')
+                    retry_interval = options['interval']
+                    self._follow(service, subscription, next_block, options)
+            except DatabaseError:
+                # Same as polling mode: the advisory lock cannot be trusted anymore
+                raise
+            except Exception as e:
+                logger.error(f'Log subscription failed: {str(e)}')
+                self.stdout.write(self.style.ERROR(
+                    f'✗ Subscription lost, reconnecting in {retry_interval:.0f}s: {str(e) or type(e).__name__}'
+                ))
+                self._stop.wait(retry_interval)
+                retry_interval = min(retry_interval * 2, options['max_interval'])
+
+    def _catch_up(self, service, from_block, options):
+        """
+        Poll-sync from from_block up to the head seen when it starts
+
+        Blocks mined meanwhile are left to the next call or the subscription,
+        so a fast chain cannot keep the daemon polling forever.
+
+        Returns:
+            First block that is not synced yet
+        """
+        head = service.w3.eth.block_number
+        while from_block <= head and not self._stop.is_set():
+            to_block = min(head, from_block + options['max_blocks_per_loop'] - 1)
+            with track_sync_run(service, 'run_sync_daemon'):
+                service.sync_all_events(from_block, to_block)
+            from_block = to_block + 1
+        return from_block
+
+    def _follow(self, service, subscription, next_block, options):
+        """
+        Store pushed logs block by block until the connection drops or the daemon stops
+
+        A block is stored when the header of a later block arrives, by then
+        every log of it has been delivered. Logs below next_block were synced
+        by the catch-up already and are ignored.
+
+        Reorgs show up as removed logs, or as a header that does not extend
+        the last one when the replaced blocks had no reward logs. Either way
+        the stored range is checked and rescanned by polling, since logs the
+        node re-sent for blocks below next_block were ignored.
+
+        Raises:
+            TimeoutError if no new block arrived within --max-interval seconds
+            websockets.ConnectionClosed if the connection dropped
+        """
+        pending = defaultdict(list)
+        headers = {}
+        last_head = None
+        last_head_at = time.monotonic()
+
+        while not self._stop.is_set():
+            try:
+                kind, payload = subscription.receive(timeout=1.0)
+            except TimeoutError:
+                if time.monotonic() - last_head_at > options['max_interval']:
+                    raise TimeoutError(f"No new block for {options['max_interval']:.0f}s")
+                continue
+
+            if kind == 'log':
+                block_number = int(payload['blockNumber'], 16)
+                if payload.get('removed'):
+                    pending[block_number] = [
+                        log for log in pending.get(block_number, [])
+                        if (log['blockHash'], log['logIndex']) != (payload['blockHash'], payload['logIndex'])
+                    ]
+                    if block_number < next_block and self._is_stored(payload):
+                        service.rollback_from_block(block_number)
+                        next_block = self._resync(service, pending, headers, options)
+                elif block_number >= next_block:
+                    pending[block_number].append(payload)
+                continue
+
+            last_head_at = time.monotonic()
+            head = int(payload['number'], 16)
+            parent_hash = headers.get(head - 1, (None, payload['parentHash']))[1]
+            replaced = (last_head is not None and head <= last_head) or parent_hash != payload['parentHash']
+            last_head = head
+            if replaced:
+                service.rollback_reorged_blocks(head)
+                next_block = self._resync(service, pending, headers, options)
+                continue
+
+            headers[head] = (
+                datetime.fromtimestamp(int(payload['timestamp'], 16), tz=dt_timezone.utc),
+                payload['hash']
+            )
+            to_block = head - 1
+            if to_block < next_block:
+                continue
+
+            raw_logs = []
+            for number in sorted(number for number in pending if number <= to_block):
+                raw_logs.extend(pending.pop(number))
+            with track_sync_run(service, 'run_sync_daemon'):
+                service.ingest_logs(next_block, to_block, raw_logs, head, headers)
+            next_block = to_block + 1
+            # Keep the newest header, the next one is checked against it
+            for number in [number for number in headers if number < to_block]:
+                del headers[number]
+
+    def _is_stored(self, log):
+        """Whether a log reported as removed is still in the raw log table"""
+        return RawEventLog.objects.filter(
+            block_number=int(log['blockNumber'], 16),
+            log_index=int(log['logIndex'], 16),
+            transaction_hash=bytes.fromhex(log['transactionHash'][2:])
+        ).exists()
+
+    def _resync(self, service, pending, headers, options):
+        """
+        Poll-sync from the checkpoints after a reorg, then let the subscription continue
+
+        Returns:
+            First block that is not synced yet
+        """
+        self.stdout.write('🔀 Reorg seen on the subscription, resyncing from the checkpoints')
+        next_block = self._catch_up(service, self._resume_block(service), options)
+        for number in [number for number in pending if number < next_block]:
+            del pending[number]
+        headers.clear()
+        return next_block
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write(f'Received signal {signum}, stopping after the current chunk...')
+        self._stop.set()
+
+    def _acquire_lock(self, lock_id):
+        """Take a session-level Postgres advisory lock so only one daemon syncs at a time"""
+        if connection.vendor != 'postgresql':
+            logger.warning('Advisory lock skipped: database is not PostgreSQL')
+            return True
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_try_advisory_lock(%s)', [lock_id])
+            return cursor.fetchone()[0]
+
+    def _release_lock(self, lock_id):
+        if connection.vendor != 'postgresql':
+            return
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [lock_id])
+        except DatabaseError as e:
+            logger.warning(f'Could not release advisory lock: {str(e)}')
@@ -1,16 +1,21 @@
 from django.core.management.base import BaseCommand
-from django.core.management import call_command
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService
+from diora_reward.services.sync_metrics import track_sync_run
+from diora_reward.models import SyncEventType
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
-    help = 'Sync all blockchain data (distributions and claims)'
+    help = 'Sync all blockchain data (distributions and claims) in a single log scan'
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--from-block',
             type=int,
             default=None,
-            help='Starting block number (default: last synced block + 1)'
+            help='Starting block number (default: last synced block + 1, or the contract deployment block on an empty database)'
         )
         parser.add_argument(
             '--to-block',
@@ -18,20 +23,43 @@ class Command(BaseCommand):
             default='latest',
             help='Ending block number or "latest"'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Fetch log chunks concurrently with N workers (backfill mode, default: 1)'
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.MIGRATE_HEADING('=== Starting Blockchain Data Sync ==='))
-        
-        # Sync distributions
-        self.stdout.write(self.style.MIGRATE_LABEL('\n[1/2] Syncing Reward Distributions'))
-        call_command('sync_reward_distributions', 
-                    from_block=options['from_block'],
-                    to_block=options['to_block'])
-        
-        # Sync claims
-        self.stdout.write(self.style.MIGRATE_LABEL('\n[2/2] Syncing User Claims'))
-        call_command('sync_user_claims',
-                    from_block=options['from_block'],
-                    to_block=options['to_block'])
-        
+
+        try:
+            service = DITRewardsBlockchainService()
+
+            # Resume from the stream that is furthest behind; rows the other
+            # stream already has are skipped by the bulk writer
+            if options['from_block'] is None:
+                from_block = min(
+                    service.get_resume_block(SyncEventType.REWARDS_DISTRIBUTED),
+                    service.get_resume_block(SyncEventType.REWARDS_CLAIMED)
+                )
+                self.stdout.write(f'Last synced block: {from_block - 1}')
+            else:
+                from_block = options['from_block']
+
+            to_block = options['to_block']
+
+            self.stdout.write(f'Syncing from block {from_block} to {to_block}...')
+            with track_sync_run(service, 'sync_all_blockchain_data'):
+                distributions, claims = service.sync_all_events(from_block, to_block, workers=options['workers'])
+
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ Successfully synced {distributions} reward distributions and {claims} user claims'
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'✗ Error: {str(e)}'))
+            logger.error(f'Error syncing blockchain data: {str(e)}')
+            raise
+
         self.stdout.write(self.style.SUCCESS('\n=== Blockchain Sync Completed ==='))
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from diora_reward.services.blockchain_service import DITRewardsBlockchainService
-from diora_reward.models import RewardDistribution
+from diora_reward.services.sync_metrics import track_sync_run
+from diora_reward.models import SyncEventType
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,7 @@ class Command(BaseCommand):
             '--from-block',
             type=int,
             default=None,
-            help='Starting block number (default: last synced block + 1)'
+            help='Starting block number (default: last synced block + 1, or the contract deployment block on an empty database)'
         )
         parser.add_argument(
             '--to-block',
@@ -22,6 +23,12 @@ class Command(BaseCommand):
             default='latest',
             help='Ending block number or "latest"'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Fetch log chunks concurrently with N workers (backfill mode, default: 1)'
+        )
 
     def handle(self, *args, **options):
         try:
@@ -29,8 +36,7 @@ class Command(BaseCommand):
             
             # Get the last synced block if not specified
             if options['from_block'] is None:
-                last_distribution = RewardDistribution.objects.order_by('-block_number').first()
-                from_block = last_distribution.block_number + 1 if last_distribution else 0
+                from_block = service.get_resume_block(SyncEventType.REWARDS_DISTRIBUTED)
                 self.stdout.write(f'Last synced block: {from_block - 1}')
             else:
                 from_block = options['from_block']
@@ -38,7 +44,8 @@ class Command(BaseCommand):
             to_block = options['to_block']
             
             self.stdout.write(f'Syncing from block {from_block} to {to_block}...')
-            count = service.sync_reward_distributions(from_block, to_block)
+            with track_sync_run(service, 'sync_reward_distributions'):
+                count = service.sync_reward_distributions(from_block, to_block, workers=options['workers'])
             
             self.stdout.write(self.style.SUCCESS(
                 f'✓ Successfully synced {count} reward distributions'
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from diora_reward.services.blockchain_service import DITRewardsBlockchainService
-from diora_reward.models import UserRewardClaim
+from diora_reward.services.sync_metrics import track_sync_run
+from diora_reward.models import SyncEventType
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,7 @@ class Command(BaseCommand):
             '--from-block',
             type=int,
             default=None,
-            help='Starting block number (default: last synced block + 1)'
+            help='Starting block number (default: last synced block + 1, or the contract deployment block on an empty database)'
         )
         parser.add_argument(
             '--to-block',
@@ -28,6 +29,12 @@ class Command(BaseCommand):
             default=None,
             help='Specific wallet address to sync'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Fetch log chunks concurrently with N workers (backfill mode, default: 1)'
+        )
 
     def handle(self, *args, **options):
         try:
@@ -35,8 +42,7 @@ class Command(BaseCommand):
             
             # Get the last synced block if not specified
             if options['from_block'] is None:
-                last_claim = UserRewardClaim.objects.order_by('-block_number').first()
-                from_block = last_claim.block_number + 1 if last_claim else 0
+                from_block = service.get_resume_block(SyncEventType.REWARDS_CLAIMED)
                 self.stdout.write(f'Last synced block: {from_block - 1}')
             else:
                 from_block = options['from_block']
@@ -48,7 +54,8 @@ class Command(BaseCommand):
                 self.stdout.write(f'Syncing claims for wallet: {wallet_address}')
             
             self.stdout.write(f'Syncing from block {from_block} to {to_block}...')
-            count = service.sync_user_claims(from_block, to_block, wallet_address)
+            with track_sync_run(service, 'sync_user_claims'):
+                count = service.sync_user_claims(from_block, to_block, wallet_address, workers=options['workers'])
             
             self.stdout.write(self.style.SUCCESS(
                 f'✓ Successfully synced {count} user claims'
@@ -0,0 +1,161 @@
+from django.core.management.base import BaseCommand
+from diora_reward.services.blockchain_service import DITRewardsBlockchainService
+from diora_reward.services.digests import DIGEST_BLOCK_SPAN, bucket_bounds, digest_of
+from diora_reward.models import SyncEventType
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = {
+    'distributions': [SyncEventType.REWARDS_DISTRIBUTED],
+    'claims': [SyncEventType.REWARDS_CLAIMED],
+    'all': [SyncEventType.REWARDS_DISTRIBUTED, SyncEventType.REWARDS_CLAIMED],
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare stored range digests with the chain and bisect differing ranges down to a few blocks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event-type',
+            choices=list(EVENT_TYPES),
+            default='all',
+            help='Event stream to verify (default: all)'
+        )
+        parser.add_argument(
+            '--from-block',
+            type=int,
+            default=None,
+            help='First block to verify (default: start of the synced ranges)'
+        )
+        parser.add_argument(
+            '--to-block',
+            type=int,
+            default=None,
+            help='Last block to verify (default: last synced block)'
+        )
+        parser.add_argument(
+            '--min-range',
+            type=int,
+            default=16,
+            help='Stop bisecting at ranges of this many blocks and list their events (default: 16)'
+        )
+        parser.add_argument(
+            '--recompute',
+            action='store_true',
+            help='Compare with digests recomputed from the event tables, catching rows edited after the sync'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('=== Verifying Synced Events ==='))
+
+        try:
+            started = time.monotonic()
+            service = DITRewardsBlockchainService()
+            mismatched_ranges = 0
+
+            for event_type in EVENT_TYPES[options['event_type']]:
+                checkpoints = service.get_checkpoints(event_type)
+                from_block = options['from_block'] if options['from_block'] is not None else checkpoints.low_water_mark()
+                to_block = options['to_block'] if options['to_block'] is not None else checkpoints.high_water_mark()
+                if from_block is None or to_block is None:
+                    self.stdout.write(f'{event_type}: nothing synced yet, skipping')
+                    continue
+
+                self.stdout.write(f'\n{event_type}: verifying blocks {from_block} to {to_block}')
+                mismatched_ranges += self._verify(
+                    service, event_type, from_block, to_block, options['min_range'], options['recompute']
+                )
+
+            elapsed = time.monotonic() - started
+            if mismatched_ranges:
+                self.stdout.write(self.style.ERROR(
+                    f'\n✗ {mismatched_ranges} block ranges differ from the chain ({elapsed:.1f}s)'
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'\n✓ Stored events match the chain ({elapsed:.1f}s)'))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'✗ Error: {str(e)}'))
+            logger.error(f'Error verifying sync: {str(e)}')
+            raise
+
+    def _verify(self, service, event_type, from_block, to_block, min_range, recompute):
+        """Check every digest bucket in the range, returns the number of differing ranges"""
+        digests = service.get_digests(event_type)
+        stored = digests.stored(from_block, to_block)
+        mismatched_ranges = 0
+
+        first_bucket, _ = bucket_bounds(from_block)
+        for bucket_start in range(first_bucket, to_block + 1, DIGEST_BLOCK_SPAN):
+            bucket_end = bucket_start + DIGEST_BLOCK_SPAN - 1
+            range_start, range_end = max(from_block, bucket_start), min(to_block, bucket_end)
+
+            chain_events = []
+            for _, _, events in service.iter_chain_event_keys(event_type, range_start, range_end):
+                chain_events.extend(events)
+
+            if not recompute and (range_start, range_end) == (bucket_start, bucket_end):
+                stored_digest = stored.get(range_start, digest_of([]))
+            else:
+                stored_digest = digests.compute(range_start, range_end)
+            if digest_of(key for _, key in chain_events) == stored_digest:
+                continue
+
+            differences = self._bisect(digests, chain_events, range_start, range_end, min_range)
+            if not differences:
+                # The events match, only the stored digest was stale (e.g. synced before digests existed)
+                digests.refresh(bucket_start, bucket_end)
+                self.stdout.write(f'  ↻ Refreshed stale digest for blocks {range_start}-{range_end}')
+                continue
+
+            for diff_start, diff_end, missing, extra in differences:
+                mismatched_ranges += 1
+                self.stdout.write(self.style.ERROR(
+                    f'  ✗ Blocks {diff_start}-{diff_end}: {len(missing)} missing, {len(extra)} extra'
+                ))
+                for transaction_hash, log_index, amount in missing:
+                    self.stdout.write(f'      missing: {transaction_hash} #{log_index} ({amount} DIT)')
+                for transaction_hash, log_index, amount in extra:
+                    self.stdout.write(f'      extra:   {transaction_hash} #{log_index} ({amount} DIT)')
+                logger.warning(
+                    f'{event_type} blocks {diff_start}-{diff_end} differ from the chain: '
+                    f'{len(missing)} missing, {len(extra)} extra'
+                )
+                if missing:
+                    self.stdout.write(
+                        f'      re-sync with: python manage.py sync_all_blockchain_data '
+                        f'--from-block {diff_start} --to-block {diff_end}'
+                    )
+
+        return mismatched_ranges
+
+    def _bisect(self, digests, chain_events, range_start, range_end, min_range):
+        """
+        Split a differing range in halves until the differences are min_range blocks wide
+
+        The chain side reuses the logs already fetched for the bucket, only the
+        database side is queried again for each half.
+
+        Returns:
+            List of (from_block, to_block, missing_keys, extra_keys)
+        """
+        chain_keys = [key for block, key in chain_events if range_start <= block <= range_end]
+        if digest_of(chain_keys) == digests.compute(range_start, range_end):
+            return []
+        if range_end - range_start + 1 <= min_range:
+            stored_keys = set(digests.stored_keys(range_start, range_end))
+            chain_key_set = set(chain_keys)
+            return [(
+                range_start,
+                range_end,
+                sorted(chain_key_set - stored_keys),
+                sorted(stored_keys - chain_key_set)
+            )]
+        middle = (range_start + range_end) // 2
+        return (
+            self._bisect(digests, chain_events, range_start, middle, min_range)
+            + self._bisect(digests, chain_events, middle + 1, range_end, min_range)
+        )
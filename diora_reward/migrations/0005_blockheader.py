@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-16 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0004_pendingreward"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlockHeader",
+            fields=[
+                (
+                    "number",
+                    models.BigIntegerField(
+                        help_text="Block number", primary_key=True, serialize=False
+                    ),
+                ),
+                ("timestamp", models.DateTimeField(help_text="Block timestamp")),
+            ],
+            options={
+                "verbose_name": "Block Header",
+                "verbose_name_plural": "Block Headers",
+                "ordering": ["-number"],
+            },
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2 on 2026-10-16 20:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0005_blockheader"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "contract_address",
+                    models.CharField(
+                        help_text="Contract address (lowercase)", max_length=42
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("RewardsDistributed", "Rewards Distributed"),
+                            ("RewardsClaimed", "Rewards Claimed"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Sync Checkpoint",
+                "verbose_name_plural": "Sync Checkpoints",
+                "unique_together": {("contract_address", "event_type")},
+            },
+        ),
+        migrations.CreateModel(
+            name="SyncedBlockRange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "from_block",
+                    models.BigIntegerField(help_text="First block of the range"),
+                ),
+                (
+                    "to_block",
+                    models.BigIntegerField(
+                        help_text="Last block of the range (inclusive)"
+                    ),
+                ),
+                ("synced_at", models.DateTimeField(auto_now=True)),
+                (
+                    "checkpoint",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ranges",
+                        to="diora_reward.synccheckpoint",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Synced Block Range",
+                "verbose_name_plural": "Synced Block Ranges",
+                "ordering": ["checkpoint", "from_block"],
+                "indexes": [
+                    models.Index(
+                        fields=["checkpoint", "from_block"],
+                        name="diora_rewar_checkpo_178621_idx",
+                    )
+                ],
+            },
+        ),
+    ]
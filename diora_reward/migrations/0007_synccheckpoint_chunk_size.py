@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-16 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0006_synccheckpoint_syncedblockrange"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="synccheckpoint",
+            name="chunk_size",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="eth_getLogs block window chosen by the adaptive chunker on the last run",
+                null=True,
+            ),
+        ),
+    ]
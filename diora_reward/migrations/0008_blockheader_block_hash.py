@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-16 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0007_synccheckpoint_chunk_size"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blockheader",
+            name="block_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Block hash at the time it was fetched",
+                max_length=66,
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2 on 2026-10-16 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0008_blockheader_block_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReconciliationRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "block_number",
+                    models.BigIntegerField(
+                        help_text="Block the on-chain balances were read at"
+                    ),
+                ),
+                (
+                    "since_block",
+                    models.BigIntegerField(
+                        blank=True,
+                        help_text="Only wallets touched from this block on were checked (empty for a full run)",
+                        null=True,
+                    ),
+                ),
+                ("wallets_checked", models.IntegerField(default=0)),
+                ("mismatches", models.IntegerField(default=0)),
+                (
+                    "report_path",
+                    models.CharField(
+                        blank=True,
+                        help_text="Path of the JSON/CSV diff report",
+                        max_length=500,
+                    ),
+                ),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Reconciliation Run",
+                "verbose_name_plural": "Reconciliation Runs",
+                "ordering": ["-started_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2 on 2026-10-16 20:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0009_reconciliationrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncRangeDigest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "from_block",
+                    models.BigIntegerField(help_text="First block of the bucket"),
+                ),
+                (
+                    "to_block",
+                    models.BigIntegerField(
+                        help_text="Last block of the bucket (inclusive)"
+                    ),
+                ),
+                (
+                    "event_count",
+                    models.IntegerField(
+                        help_text="Number of events stored in the bucket"
+                    ),
+                ),
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="Order-independent hash of (tx_hash, log_index, amount) of the events",
+                        max_length=64,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "checkpoint",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="digests",
+                        to="diora_reward.synccheckpoint",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sync Range Digest",
+                "verbose_name_plural": "Sync Range Digests",
+                "ordering": ["checkpoint", "from_block"],
+                "unique_together": {("checkpoint", "from_block")},
+            },
+        ),
+    ]
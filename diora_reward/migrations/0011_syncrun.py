@@ -0,0 +1,91 @@
+# Generated by Django 5.2 on 2026-10-16 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0010_syncrangedigest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "command",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Management command that ran the sync",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        default="running",
+                        help_text="running, succeeded or failed",
+                        max_length=20,
+                    ),
+                ),
+                ("error", models.TextField(blank=True)),
+                ("from_block", models.BigIntegerField(blank=True, null=True)),
+                ("to_block", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "head_block",
+                    models.BigIntegerField(
+                        blank=True,
+                        help_text="Chain head when the range was resolved",
+                        null=True,
+                    ),
+                ),
+                (
+                    "lag_blocks",
+                    models.BigIntegerField(
+                        blank=True,
+                        help_text="Blocks between the chain head and the last scanned block",
+                        null=True,
+                    ),
+                ),
+                ("chunks", models.IntegerField(default=0)),
+                ("blocks_scanned", models.BigIntegerField(default=0)),
+                ("logs_fetched", models.IntegerField(default=0)),
+                ("events_inserted", models.IntegerField(default=0)),
+                ("events_skipped", models.IntegerField(default=0)),
+                ("rpc_calls", models.IntegerField(default=0)),
+                (
+                    "rpc_stats",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Per RPC method: calls, errors and latency percentiles in ms",
+                    ),
+                ),
+                (
+                    "db_write_stats",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Per chunk DB write time percentiles in ms",
+                    ),
+                ),
+                ("started_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Sync Run",
+                "verbose_name_plural": "Sync Runs",
+                "ordering": ["-started_at"],
+            },
+        ),
+    ]
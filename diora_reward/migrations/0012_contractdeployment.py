@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-16 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0011_syncrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContractDeployment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "contract_address",
+                    models.CharField(
+                        help_text="Contract address (lowercase)",
+                        max_length=42,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "deployment_block",
+                    models.BigIntegerField(
+                        help_text="First block at which the contract has code"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Contract Deployment",
+                "verbose_name_plural": "Contract Deployments",
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2 on 2026-10-16 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0012_contractdeployment"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RawEventLog",
+            fields=[
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "block_number",
+                        "log_index",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("block_number", models.BigIntegerField()),
+                (
+                    "log_index",
+                    models.IntegerField(help_text="Log index within the block"),
+                ),
+                ("block_timestamp", models.DateTimeField()),
+                (
+                    "transaction_hash",
+                    models.BinaryField(
+                        help_text="32-byte transaction hash", max_length=32
+                    ),
+                ),
+                (
+                    "address",
+                    models.BinaryField(
+                        help_text="20-byte address of the emitting contract",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "topics",
+                    models.BinaryField(
+                        help_text="Concatenated 32-byte topics, event signature first"
+                    ),
+                ),
+                (
+                    "data",
+                    models.BinaryField(
+                        help_text="ABI-encoded non-indexed event arguments"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Raw Event Log",
+                "verbose_name_plural": "Raw Event Logs",
+            },
+        ),
+    ]
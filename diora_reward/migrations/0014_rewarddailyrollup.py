@@ -0,0 +1,99 @@
+# Generated by Django 5.2 on 2026-10-16 21:22
+
+from datetime import timezone as dt_timezone
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    """Roll up the distributions that exist already, so the analytics endpoints keep their totals"""
+    RewardDistribution = apps.get_model("diora_reward", "RewardDistribution")
+    RewardDailyRollup = apps.get_model("diora_reward", "RewardDailyRollup")
+    rows = (
+        RewardDistribution.objects.annotate(day=TruncDate("distributed_at", tzinfo=dt_timezone.utc))
+        .values("day", "nft_type")
+        .annotate(total=Sum("total_amount"), wallets=Sum("wallet_count"), distributions=Count("pk"))
+        .order_by()
+    )
+    RewardDailyRollup.objects.bulk_create(
+        [
+            RewardDailyRollup(
+                day=row["day"],
+                nft_type=row["nft_type"],
+                total_amount=row["total"],
+                wallet_count=row["wallets"],
+                distribution_count=row["distributions"],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0013_raweventlog"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RewardDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "day",
+                    models.DateField(help_text="UTC day the distributions happened on"),
+                ),
+                (
+                    "nft_type",
+                    models.CharField(
+                        choices=[
+                            ("RED", "Red NFT"),
+                            ("GREEN", "Green NFT"),
+                            ("BLUE", "Blue NFT"),
+                            ("BLACK", "Black NFT"),
+                            ("DRAGON", "Dragon NFT"),
+                            ("FLAWLESS_DIAMOND", "Flawless Diamond NFT"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=6,
+                        help_text="Sum of total_amount of the day's distributions",
+                        max_digits=30,
+                    ),
+                ),
+                (
+                    "wallet_count",
+                    models.BigIntegerField(
+                        help_text="Sum of wallet_count of the day's distributions"
+                    ),
+                ),
+                (
+                    "distribution_count",
+                    models.IntegerField(help_text="Number of distributions on the day"),
+                ),
+            ],
+            options={
+                "verbose_name": "Reward Daily Rollup",
+                "verbose_name_plural": "Reward Daily Rollups",
+                "ordering": ["-day", "nft_type"],
+                "unique_together": {("day", "nft_type")},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
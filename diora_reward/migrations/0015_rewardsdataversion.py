@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-16 22:05
+
+from django.db import migrations, models
+
+
+def create_version_row(apps, schema_editor):
+    """The single row bumped on every rewards write"""
+    RewardsDataVersion = apps.get_model("diora_reward", "RewardsDataVersion")
+    RewardsDataVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0014_rewarddailyrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RewardsDataVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Rewards Data Version",
+                "verbose_name_plural": "Rewards Data Version",
+            },
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
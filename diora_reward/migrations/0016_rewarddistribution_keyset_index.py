@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diora_reward", "0015_rewardsdataversion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="rewarddistribution",
+            index=models.Index(
+                fields=["-distributed_at", "transaction_hash"],
+                name="diora_rewar_distrib_8348fc_idx",
+            ),
+        ),
+    ]
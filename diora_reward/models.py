@@ -60,6 +60,8 @@ class RewardDistribution(models.Model):
         verbose_name_plural = 'Reward Distributions'
         indexes = [
             models.Index(fields=['-distributed_at', 'nft_type']),
+            # Keyset pagination of the grouped distributions list
+            models.Index(fields=['-distributed_at', 'transaction_hash']),
         ]
         unique_together = [['transaction_hash', 'log_index']]
 
@@ -165,3 +167,328 @@ class PendingReward(models.Model):
     def __str__(self):
         status = "Sent" if self.is_sent else "Pending"
         return f"{self.wallet_address[:10]}... - {self.dit_amount} DIT - {self.nft_type} - {status}"
+
+
+class RewardDailyRollup(models.Model):
+    """
+    RewardDistribution totals per UTC day and NFT type
+    Rewritten for the affected days in the same transaction as every distribution write,
+    so the analytics endpoints read one row per day instead of every distribution.
+    """
+    day = models.DateField(
+        help_text="UTC day the distributions happened on"
+    )
+    nft_type = models.CharField(
+        max_length=20,
+        choices=NFTType.choices
+    )
+    total_amount = models.DecimalField(
+        max_digits=30,
+        decimal_places=6,
+        help_text="Sum of total_amount of the day's distributions"
+    )
+    wallet_count = models.BigIntegerField(
+        help_text="Sum of wallet_count of the day's distributions"
+    )
+    distribution_count = models.IntegerField(
+        help_text="Number of distributions on the day"
+    )
+
+    class Meta:
+        ordering = ['-day', 'nft_type']
+        verbose_name = 'Reward Daily Rollup'
+        verbose_name_plural = 'Reward Daily Rollups'
+        unique_together = [['day', 'nft_type']]
+
+    def __str__(self):
+        return f"{self.day} {self.nft_type} - {self.total_amount} DIT in {self.distribution_count} distributions"
+
+
+class RewardsDataVersion(models.Model):
+    """
+    Single row counting writes to RewardDistribution and PendingReward
+    Bumped in the same transaction as every write, cached analytics responses
+    are keyed by it so they are never served after the data changed.
+    """
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Rewards Data Version'
+        verbose_name_plural = 'Rewards Data Version'
+
+    def __str__(self):
+        return f"Rewards data version {self.version}"
+
+
+class BlockHeader(models.Model):
+    """
+    Block timestamps already fetched from the chain
+    Block timestamps never change, so the sync caches them here instead of asking the RPC again.
+    The hash lets the sync notice when a recent block was replaced by a reorg.
+    """
+    number = models.BigIntegerField(
+        primary_key=True,
+        help_text="Block number"
+    )
+    timestamp = models.DateTimeField(
+        help_text="Block timestamp"
+    )
+    block_hash = models.CharField(
+        max_length=66,
+        blank=True,
+        default='',
+        help_text="Block hash at the time it was fetched"
+    )
+
+    class Meta:
+        ordering = ['-number']
+        verbose_name = 'Block Header'
+        verbose_name_plural = 'Block Headers'
+
+    def __str__(self):
+        return f"Block {self.number} - {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
+
+
+class RawEventLog(models.Model):
+    """
+    Raw logs of the rewards contract exactly as the sync fetched them
+    Append-only source the reward tables can be rebuilt from without the RPC
+    (see the rebuild_reward_projections command). Only reorg rollbacks delete rows.
+    """
+    pk = models.CompositePrimaryKey('block_number', 'log_index')
+    block_number = models.BigIntegerField()
+    log_index = models.IntegerField(
+        help_text="Log index within the block"
+    )
+    block_timestamp = models.DateTimeField()
+    transaction_hash = models.BinaryField(
+        max_length=32,
+        help_text="32-byte transaction hash"
+    )
+    address = models.BinaryField(
+        max_length=20,
+        help_text="20-byte address of the emitting contract"
+    )
+    topics = models.BinaryField(
+        help_text="Concatenated 32-byte topics, event signature first"
+    )
+    data = models.BinaryField(
+        help_text="ABI-encoded non-indexed event arguments"
+    )
+
+    class Meta:
+        verbose_name = 'Raw Event Log'
+        verbose_name_plural = 'Raw Event Logs'
+
+    def __str__(self):
+        return f"Block {self.block_number} log {self.log_index}"
+
+
+class SyncEventType(models.TextChoices):
+    REWARDS_DISTRIBUTED = 'RewardsDistributed', 'Rewards Distributed'
+    REWARDS_CLAIMED = 'RewardsClaimed', 'Rewards Claimed'
+
+
+class SyncCheckpoint(models.Model):
+    """
+    Sync progress for one contract event stream
+    The block ranges that were fully scanned are stored in SyncedBlockRange
+    """
+    contract_address = models.CharField(
+        max_length=42,
+        help_text="Contract address (lowercase)"
+    )
+    event_type = models.CharField(
+        max_length=32,
+        choices=SyncEventType.choices
+    )
+    chunk_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="eth_getLogs block window chosen by the adaptive chunker on the last run"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Sync Checkpoint'
+        verbose_name_plural = 'Sync Checkpoints'
+        unique_together = [['contract_address', 'event_type']]
+
+    def __str__(self):
+        return f"{self.event_type} - {self.contract_address[:10]}..."
+
+
+class ContractDeployment(models.Model):
+    """
+    Block a contract was created in, found once by binary search on eth_getCode
+    Used as the first block to scan when nothing has been synced yet
+    """
+    contract_address = models.CharField(
+        max_length=42,
+        unique=True,
+        help_text="Contract address (lowercase)"
+    )
+    deployment_block = models.BigIntegerField(
+        help_text="First block at which the contract has code"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Contract Deployment'
+        verbose_name_plural = 'Contract Deployments'
+
+    def __str__(self):
+        return f"{self.contract_address[:10]}... deployed at block {self.deployment_block}"
+
+
+class SyncedBlockRange(models.Model):
+    """
+    Inclusive block range whose logs were fully scanned and stored
+    Adjacent ranges are merged, so a healthy checkpoint has a single row
+    """
+    checkpoint = models.ForeignKey(
+        SyncCheckpoint,
+        on_delete=models.CASCADE,
+        related_name='ranges'
+    )
+    from_block = models.BigIntegerField(
+        help_text="First block of the range"
+    )
+    to_block = models.BigIntegerField(
+        help_text="Last block of the range (inclusive)"
+    )
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['checkpoint', 'from_block']
+        verbose_name = 'Synced Block Range'
+        verbose_name_plural = 'Synced Block Ranges'
+        indexes = [
+            models.Index(fields=['checkpoint', 'from_block']),
+        ]
+
+    def __str__(self):
+        return f"{self.checkpoint.event_type}: {self.from_block} - {self.to_block}"
+
+
+class SyncRangeDigest(models.Model):
+    """
+    Fingerprint of the events stored for one fixed block bucket of an event stream
+    verify_sync compares it with the same fingerprint computed from chain logs
+    """
+    checkpoint = models.ForeignKey(
+        SyncCheckpoint,
+        on_delete=models.CASCADE,
+        related_name='digests'
+    )
+    from_block = models.BigIntegerField(
+        help_text="First block of the bucket"
+    )
+    to_block = models.BigIntegerField(
+        help_text="Last block of the bucket (inclusive)"
+    )
+    event_count = models.IntegerField(
+        help_text="Number of events stored in the bucket"
+    )
+    digest = models.CharField(
+        max_length=64,
+        help_text="Order-independent hash of (tx_hash, log_index, amount) of the events"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['checkpoint', 'from_block']
+        verbose_name = 'Sync Range Digest'
+        verbose_name_plural = 'Sync Range Digests'
+        unique_together = [['checkpoint', 'from_block']]
+
+    def __str__(self):
+        return f"{self.checkpoint.event_type}: {self.from_block} - {self.to_block} ({self.event_count} events)"
+
+
+class ReconciliationRun(models.Model):
+    """
+    One run of the reconcile_rewards command
+    The next incremental run re-checks only wallets touched after block_number
+    """
+    block_number = models.BigIntegerField(
+        help_text="Block the on-chain balances were read at"
+    )
+    since_block = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Only wallets touched from this block on were checked (empty for a full run)"
+    )
+    wallets_checked = models.IntegerField(default=0)
+    mismatches = models.IntegerField(default=0)
+    report_path = models.CharField(
+        max_length=500,
+        blank=True,
+        help_text="Path of the JSON/CSV diff report"
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        verbose_name = 'Reconciliation Run'
+        verbose_name_plural = 'Reconciliation Runs'
+
+    def __str__(self):
+        return f"Block {self.block_number} - {self.mismatches}/{self.wallets_checked} mismatches"
+
+
+class SyncRun(models.Model):
+    """
+    Metrics of one sync command run or one daemon loop
+    Read by the sync status endpoint to show throughput and lag
+    """
+    command = models.CharField(
+        max_length=50,
+        db_index=True,
+        help_text="Management command that ran the sync"
+    )
+    status = models.CharField(
+        max_length=20,
+        default='running',
+        help_text="running, succeeded or failed"
+    )
+    error = models.TextField(blank=True)
+    from_block = models.BigIntegerField(null=True, blank=True)
+    to_block = models.BigIntegerField(null=True, blank=True)
+    head_block = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Chain head when the range was resolved"
+    )
+    lag_blocks = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Blocks between the chain head and the last scanned block"
+    )
+    chunks = models.IntegerField(default=0)
+    blocks_scanned = models.BigIntegerField(default=0)
+    logs_fetched = models.IntegerField(default=0)
+    events_inserted = models.IntegerField(default=0)
+    events_skipped = models.IntegerField(default=0)
+    rpc_calls = models.IntegerField(default=0)
+    rpc_stats = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Per RPC method: calls, errors and latency percentiles in ms"
+    )
+    db_write_stats = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Per chunk DB write time percentiles in ms"
+    )
+    started_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        verbose_name = 'Sync Run'
+        verbose_name_plural = 'Sync Runs'
+
+    def __str__(self):
+        return f"{self.command} {self.started_at:%Y-%m-%d %H:%M:%S} - {self.status}"
@@ -0,0 +1,154 @@
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+from web3 import Web3
+from ..models import BlockHeader
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Blocks requested per JSON-RPC batch (public providers reject very large batches)
+RPC_BATCH_SIZE = 100
+
+
+class BlockTimestampCache:
+    """
+    Block timestamp lookup backed by an in-process LRU and the BlockHeader table
+
+    Lookups go LRU -> database -> RPC. Misses that reach the RPC are fetched
+    together in JSON-RPC batch requests, and only successfully fetched
+    timestamps are ever cached.
+    """
+
+    def __init__(self, w3, max_size=50000, retries=3, retry_delay=1.0):
+        self.w3 = w3
+        self.max_size = max_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._lru = OrderedDict()
+
+    def get(self, block_number):
+        """Get the timestamp of a single block"""
+        return self.get_many([block_number])[block_number]
+
+    def get_many(self, block_numbers):
+        """
+        Get timestamps for a set of blocks
+
+        Args:
+            block_numbers: Iterable of block numbers
+
+        Returns:
+            Dict mapping block number to an aware datetime
+
+        Raises:
+            Exception from the RPC if a block could not be fetched after all retries
+        """
+        result = {}
+        missing = []
+        for number in set(block_numbers):
+            if number in self._lru:
+                self._lru.move_to_end(number)
+                result[number] = self._lru[number]
+            else:
+                missing.append(number)
+
+        if missing:
+            stored = dict(
+                BlockHeader.objects.filter(number__in=missing).values_list('number', 'timestamp')
+            )
+            missing = [number for number in missing if number not in stored]
+            if missing:
+                fetched = self._fetch_from_rpc(sorted(missing))
+                BlockHeader.objects.bulk_create(
+                    [
+                        BlockHeader(number=number, timestamp=ts, block_hash=block_hash)
+                        for number, (ts, block_hash) in fetched.items()
+                    ],
+                    ignore_conflicts=True
+                )
+                stored.update((number, ts) for number, (ts, _) in fetched.items())
+
+            for number, timestamp in stored.items():
+                self._remember(number, timestamp)
+            result.update(stored)
+
+        return result
+
+    def _remember(self, number, timestamp):
+        self._lru[number] = timestamp
+        self._lru.move_to_end(number)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def store_headers(self, headers):
+        """
+        Cache headers that arrived some other way (e.g. new head notifications)
+
+        Args:
+            headers: Dict mapping block number to a (timestamp, block_hash) tuple
+        """
+        BlockHeader.objects.bulk_create(
+            [
+                BlockHeader(number=number, timestamp=ts, block_hash=block_hash)
+                for number, (ts, block_hash) in headers.items()
+            ],
+            ignore_conflicts=True
+        )
+        for number, (timestamp, _) in headers.items():
+            self._remember(number, timestamp)
+
+    def fetch_block_hashes(self, block_numbers):
+        """
+        Ask the RPC for the current hash of each block, bypassing the cache
+
+        Returns:
+            Dict mapping block number to its 0x-prefixed hash
+        """
+        return {
+            number: block_hash
+            for number, (_, block_hash) in self._fetch_from_rpc(sorted(set(block_numbers))).items()
+        }
+
+    def forget_from(self, block_number):
+        """Drop cached headers from block_number onward after they were reorged away"""
+        BlockHeader.objects.filter(number__gte=block_number).delete()
+        for number in [number for number in self._lru if number >= block_number]:
+            del self._lru[number]
+
+    def _fetch_from_rpc(self, block_numbers):
+        """
+        Fetch block headers in JSON-RPC batches, retrying failed batches
+
+        Returns:
+            Dict mapping block number to a (timestamp, block_hash) tuple
+        """
+        headers = {}
+        for i in range(0, len(block_numbers), RPC_BATCH_SIZE):
+            batch_numbers = block_numbers[i:i + RPC_BATCH_SIZE]
+            blocks = self._fetch_batch_with_retry(batch_numbers)
+            for number, block in zip(batch_numbers, blocks):
+                headers[number] = (
+                    datetime.fromtimestamp(block['timestamp'], tz=dt_timezone.utc),
+                    Web3.to_hex(block['hash'])
+                )
+        return headers
+
+    def _fetch_batch_with_retry(self, block_numbers):
+        for attempt in range(1, self.retries + 1):
+            try:
+                with self.w3.batch_requests() as batch:
+                    for number in block_numbers:
+                        batch.add(self.w3.eth.get_block(number))
+                    blocks = batch.execute()
+                if len(blocks) != len(block_numbers) or any(block is None for block in blocks):
+                    raise ValueError(f"Incomplete batch response for blocks {block_numbers[0]}-{block_numbers[-1]}")
+                return blocks
+            except Exception as e:
+                logger.warning(
+                    f"Error fetching block headers {block_numbers[0]}-{block_numbers[-1]} "
+                    f"(attempt {attempt}/{self.retries}): {str(e)}"
+                )
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.db.models import Max, Min
+from ..models import SyncCheckpoint, SyncedBlockRange
+
+
+class CheckpointStore:
+    """
+    Records which block ranges of a contract event stream were fully scanned
+    """
+
+    def __init__(self, contract_address, event_type):
+        self.checkpoint, _ = SyncCheckpoint.objects.get_or_create(
+            contract_address=contract_address.lower(),
+            event_type=event_type
+        )
+
+    @property
+    def ranges(self):
+        return self.checkpoint.ranges.order_by('from_block')
+
+    def record_range(self, from_block, to_block):
+        """
+        Mark [from_block, to_block] as scanned, merging with touching ranges
+
+        Call inside the same transaction that stored the range's events so the
+        coverage never claims blocks whose events were rolled back.
+        """
+        with transaction.atomic():
+            touching = list(
+                SyncedBlockRange.objects.select_for_update().filter(
+                    checkpoint=self.checkpoint,
+                    from_block__lte=to_block + 1,
+                    to_block__gte=from_block - 1
+                )
+            )
+            if touching:
+                from_block = min([from_block] + [r.from_block for r in touching])
+                to_block = max([to_block] + [r.to_block for r in touching])
+                SyncedBlockRange.objects.filter(pk__in=[r.pk for r in touching]).delete()
+            SyncedBlockRange.objects.create(
+                checkpoint=self.checkpoint,
+                from_block=from_block,
+                to_block=to_block
+            )
+            self.checkpoint.save(update_fields=['updated_at'])
+
+    def truncate_from(self, block_number):
+        """
+        Forget coverage from block_number onward so those blocks are scanned again
+
+        Ranges that start before block_number are cut short, later ones are removed.
+        """
+        with transaction.atomic():
+            self.checkpoint.ranges.filter(from_block__gte=block_number).delete()
+            self.checkpoint.ranges.filter(to_block__gte=block_number).update(to_block=block_number - 1)
+            self.checkpoint.save(update_fields=['updated_at'])
+
+    def save_chunk_size(self, chunk_size):
+        """Remember the block window that worked on the last run"""
+        self.checkpoint.chunk_size = chunk_size
+        self.checkpoint.save(update_fields=['chunk_size', 'updated_at'])
+
+    def high_water_mark(self):
+        """Highest block covered by any scanned range, or None if nothing was scanned"""
+        return self.checkpoint.ranges.aggregate(block=Max('to_block'))['block']
+
+    def low_water_mark(self):
+        """Lowest block covered by any scanned range, or None if nothing was scanned"""
+        return self.checkpoint.ranges.aggregate(block=Min('from_block'))['block']
+
+    def resume_block(self, default=0):
+        """First block a new run should scan"""
+        high_water_mark = self.high_water_mark()
+        return high_water_mark + 1 if high_water_mark is not None else default
+
+    def find_gaps(self, floor=None, ceiling=None):
+        """
+        List the holes between scanned ranges
+
+        Nothing scanned yet makes [floor, ceiling] one gap when both are
+        given, and no gaps otherwise.
+
+        Args:
+            floor: First block that should be covered (default: start of the first range)
+            ceiling: Last block that should be covered (default: the high-water mark)
+
+        Returns:
+            List of inclusive (from_block, to_block) tuples
+        """
+        ranges = list(self.ranges.values_list('from_block', 'to_block'))
+        if not ranges:
+            if floor is None or ceiling is None or floor > ceiling:
+                return []
+            return [(floor, ceiling)]
+        floor = ranges[0][0] if floor is None else floor
+        ceiling = ranges[-1][1] if ceiling is None else ceiling
+
+        gaps = []
+        cursor = floor
+        for range_start, range_end in ranges:
+            if range_start > cursor:
+                gaps.append((cursor, min(range_start - 1, ceiling)))
+            cursor = max(cursor, range_end + 1)
+            if cursor > ceiling:
+                break
+        if cursor <= ceiling:
+            gaps.append((cursor, ceiling))
+        return [gap for gap in gaps if gap[0] <= gap[1]]
@@ -0,0 +1,223 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+import requests
+from .rate_governor import THROTTLE_MARKERS, is_throttle_error
+
+logger = logging.getLogger(__name__)
+
+# Fragments of provider errors that mean "ask for a smaller block range"
+RANGE_TOO_LARGE_MARKERS = (
+    'too many results',
+    'query returned more than',
+    'block range',
+    'is limited to',
+    'range is too large',
+    'range too large',
+    'response size',
+    'query timeout',
+    'timed out',
+    'timeout',
+)
+
+# JSON-RPC error code used by several providers for "limit exceeded", rate limits included
+LIMIT_EXCEEDED_CODE = -32005
+
+# JSON-RPC error code some providers copy from HTTP 429
+THROTTLE_CODE = 429
+
+
+class RPCResponseError(ValueError):
+    """JSON-RPC error answered for a request, keeping the provider's code and message"""
+
+    def __init__(self, description, error):
+        super().__init__(f"{description} failed: {error}")
+        error = error if isinstance(error, dict) else {}
+        self.code = error.get('code')
+        self.rpc_message = str(error.get('message', ''))
+
+
+def rpc_error(error):
+    """
+    (code, lowercased message) of the JSON-RPC error behind an exception
+
+    Falls back to (None, str(error)) when the exception carries no structured
+    error. Only the provider's message is searched for markers, so block
+    numbers in our own error text cannot match.
+    """
+    if isinstance(error, RPCResponseError):
+        return error.code, error.rpc_message.lower()
+    response = getattr(error, 'rpc_response', None)
+    if isinstance(response, dict) and isinstance(response.get('error'), dict):
+        return response['error'].get('code'), str(response['error'].get('message', '')).lower()
+    return None, str(error).lower()
+
+
+def is_rate_limit_error(error):
+    """Whether an eth_getLogs error is the provider throttling rather than rejecting the range"""
+    if is_throttle_error(error):
+        return True
+    code, message = rpc_error(error)
+    return code == THROTTLE_CODE or any(marker in message for marker in THROTTLE_MARKERS)
+
+
+def is_range_too_large_error(error):
+    """
+    Whether an eth_getLogs error means the block window should be reduced
+
+    Throttling is checked first: a smaller window would only multiply the
+    calls while the provider refuses traffic, the RPC pool backs off instead.
+    """
+    if is_rate_limit_error(error):
+        return False
+    if isinstance(error, requests.Timeout):
+        return True
+    code, message = rpc_error(error)
+    if code == LIMIT_EXCEEDED_CODE or str(LIMIT_EXCEEDED_CODE) in message:
+        return True
+    return any(marker in message for marker in RANGE_TOO_LARGE_MARKERS)
+
+
+class AdaptiveBlockChunker:
+    """
+    Walks a block range with a window that adapts to the provider's limits
+
+    The window doubles after a fast, sparse response and halves when the
+    provider rejects a range as too large or times out. A rejected range is
+    retried with the smaller window, so no block is ever skipped.
+    """
+
+    def __init__(self, initial_size=10000, min_size=1, max_size=1000000,
+                 target_seconds=2.0, sparse_log_count=1000):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.sparse_log_count = sparse_log_count
+        self.size = max(min_size, min(initial_size, max_size))
+
+    def iter_chunks(self, from_block, to_block, fetch):
+        """
+        Fetch logs for [from_block, to_block] chunk by chunk
+
+        Args:
+            from_block: First block number
+            to_block: Last block number (inclusive)
+            fetch: Callable (chunk_start, chunk_end) -> list of logs
+
+        Yields:
+            Tuples of (chunk_start, chunk_end, logs)
+        """
+        current = from_block
+        while current <= to_block:
+            chunk_end = min(current + self.size - 1, to_block)
+            started = time.monotonic()
+            try:
+                logs = fetch(current, chunk_end)
+            except Exception as e:
+                if chunk_end == current or not is_range_too_large_error(e):
+                    raise
+                self.shrink(chunk_end - current + 1)
+                logger.info(f"Range {current}-{chunk_end} rejected ({str(e)[:80]}), window now {self.size} blocks")
+                print(f"  ↘️  Range {current}-{chunk_end} too large, retrying with {self.size} blocks")
+                continue
+
+            self.observe(chunk_end - current + 1, len(logs), time.monotonic() - started)
+            yield current, chunk_end, logs
+            current = chunk_end + 1
+
+    def shrink(self, failed_size):
+        """Halve the window after a rejected range"""
+        self.size = max(self.min_size, failed_size // 2)
+
+    def observe(self, window, log_count, elapsed):
+        """Grow the window after a fast, sparse response that used the full window"""
+        if window >= self.size and elapsed < self.target_seconds and log_count < self.sparse_log_count:
+            self.size = min(self.max_size, self.size * 2)
+
+
+class ParallelChunkFetcher:
+    """
+    Fetches fixed block windows on a thread pool for historical backfills
+
+    Results are yielded strictly in block order, so the caller can write each
+    chunk and advance its checkpoint from a single thread. A window the
+    provider rejects as too large is split in half and retried by the worker.
+    """
+
+    def __init__(self, window=10000, workers=4, min_size=1):
+        self.window = window
+        self.workers = workers
+        self.min_size = min_size
+        self.worker_stats = {}
+        self._stats_lock = threading.Lock()
+
+    def iter_chunks(self, from_block, to_block, fetch):
+        """
+        Fetch logs for [from_block, to_block] with up to `workers` requests in flight
+
+        Args:
+            from_block: First block number
+            to_block: Last block number (inclusive)
+            fetch: Callable (chunk_start, chunk_end) -> list of logs
+
+        Yields:
+            Tuples of (chunk_start, chunk_end, logs) in block order
+        """
+        windows = (
+            (start, min(start + self.window - 1, to_block))
+            for start in range(from_block, to_block + 1, self.window)
+        )
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='sync-worker') as executor:
+            try:
+                for chunk_start, chunk_end in windows:
+                    pending.append((chunk_start, chunk_end, executor.submit(self._fetch, chunk_start, chunk_end, fetch)))
+                    # Keep a bounded read-ahead so memory stays flat on long ranges
+                    while len(pending) >= self.workers * 2:
+                        chunk_start, chunk_end, future = pending.popleft()
+                        yield chunk_start, chunk_end, future.result()
+                while pending:
+                    chunk_start, chunk_end, future = pending.popleft()
+                    yield chunk_start, chunk_end, future.result()
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+
+    def _fetch(self, chunk_start, chunk_end, fetch):
+        started = time.monotonic()
+        logs = self._fetch_split(chunk_start, chunk_end, fetch)
+        elapsed = time.monotonic() - started
+
+        worker = threading.current_thread().name
+        with self._stats_lock:
+            stats = self.worker_stats.setdefault(worker, {'chunks': 0, 'blocks': 0, 'logs': 0, 'seconds': 0.0})
+            stats['chunks'] += 1
+            stats['blocks'] += chunk_end - chunk_start + 1
+            stats['logs'] += len(logs)
+            stats['seconds'] += elapsed
+            blocks_per_second = stats['blocks'] / stats['seconds'] if stats['seconds'] else 0
+        print(
+            f"  🧵 [{worker}] {chunk_start}-{chunk_end}: {len(logs)} logs in {elapsed:.2f}s "
+            f"({blocks_per_second:,.0f} blocks/s)"
+        )
+        return logs
+
+    def _fetch_split(self, chunk_start, chunk_end, fetch):
+        try:
+            return fetch(chunk_start, chunk_end)
+        except Exception as e:
+            if chunk_end - chunk_start + 1 <= self.min_size or not is_range_too_large_error(e):
+                raise
+            middle = (chunk_start + chunk_end) // 2
+            return self._fetch_split(chunk_start, middle, fetch) + self._fetch_split(middle + 1, chunk_end, fetch)
+
+    def print_summary(self):
+        """Print per-worker throughput for the run"""
+        for worker, stats in sorted(self.worker_stats.items()):
+            blocks_per_second = stats['blocks'] / stats['seconds'] if stats['seconds'] else 0
+            print(
+                f"  🧵 {worker}: {stats['chunks']} chunks, {stats['blocks']:,} blocks, "
+                f"{stats['logs']:,} logs ({blocks_per_second:,.0f} blocks/s)"
+            )
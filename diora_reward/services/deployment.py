@@ -0,0 +1,80 @@
+from ..models import ContractDeployment
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Deployment blocks already looked up by this process, by lowercase address
+_deployment_blocks = {}
+_deployment_blocks_lock = threading.Lock()
+
+
+def find_deployment_block(w3, address, head):
+    """
+    Binary search for the first block at which a contract has code
+
+    Takes about log2(head) eth_getCode calls (~25 on mainnet). Needs an RPC
+    endpoint that serves historical state, pruned nodes fail on old blocks.
+
+    Args:
+        w3: Web3 instance
+        address: Checksum contract address
+        head: Latest block number
+
+    Returns:
+        Deployment block number, or None if the address has no code at head
+    """
+    if not w3.eth.get_code(address, block_identifier=head):
+        return None
+    low, high = 0, head
+    while low < high:
+        middle = (low + high) // 2
+        if w3.eth.get_code(address, block_identifier=middle):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def get_deployment_block(w3, address):
+    """
+    Deployment block of a contract, cached in the process and in the database
+
+    Lookup failures (e.g. a node without historical state) are logged and not
+    cached, so callers fall back to block 0 and the next run tries again.
+
+    Returns:
+        Deployment block number, or None if it could not be determined
+    """
+    key = address.lower()
+    if key in _deployment_blocks:
+        return _deployment_blocks[key]
+
+    with _deployment_blocks_lock:
+        if key in _deployment_blocks:
+            return _deployment_blocks[key]
+
+        stored = ContractDeployment.objects.filter(contract_address=key).first()
+        if stored is not None:
+            _deployment_blocks[key] = stored.deployment_block
+            return stored.deployment_block
+
+        try:
+            deployment_block = find_deployment_block(w3, address, w3.eth.block_number)
+        except Exception as e:
+            logger.warning(f"Could not find deployment block of {address}: {str(e)}")
+            print(f"  ⚠️  Could not find deployment block of {address}, starting from block 0")
+            return None
+        if deployment_block is None:
+            logger.warning(f"No contract code at {address}, starting from block 0")
+            print(f"  ⚠️  No contract code at {address}, starting from block 0")
+            return None
+
+        ContractDeployment.objects.update_or_create(
+            contract_address=key,
+            defaults={'deployment_block': deployment_block}
+        )
+        _deployment_blocks[key] = deployment_block
+        logger.info(f"Contract {address} was deployed at block {deployment_block}")
+        print(f"  🔎 Contract deployed at block {deployment_block}")
+        return deployment_block
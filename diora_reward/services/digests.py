@@ -0,0 +1,116 @@
+from decimal import Decimal
+from django.db import transaction
+from ..models import RewardDistribution, UserRewardClaim, SyncEventType, SyncRangeDigest
+import hashlib
+
+# Blocks per stored digest bucket
+DIGEST_BLOCK_SPAN = 10000
+
+# Digests are sums of per-event hashes modulo 2**256, so they can be combined
+# in any order and do not cancel out on duplicates like XOR would
+DIGEST_MODULUS = 2 ** 256
+
+# Events are stored with 6 decimals, chain amounts are rounded the same way before hashing
+AMOUNT_QUANTUM = Decimal('0.000001')
+
+# Model and amount field behind each event stream
+EVENT_MODELS = {
+    SyncEventType.REWARDS_DISTRIBUTED: (RewardDistribution, 'total_amount'),
+    SyncEventType.REWARDS_CLAIMED: (UserRewardClaim, 'amount'),
+}
+
+
+def event_key(transaction_hash, log_index, amount):
+    """Normalized identity of one event as stored in the database"""
+    transaction_hash = transaction_hash.lower()
+    if transaction_hash.startswith('0x'):
+        transaction_hash = transaction_hash[2:]
+    return (transaction_hash, int(log_index), f"{Decimal(amount).quantize(AMOUNT_QUANTUM):f}")
+
+
+def digest_of(keys):
+    """
+    Fingerprint of a set of event keys
+
+    Returns:
+        Tuple of (event_count, 64-char hex digest)
+    """
+    total = 0
+    count = 0
+    for transaction_hash, log_index, amount in keys:
+        item = f"{transaction_hash}:{log_index}:{amount}".encode()
+        total = (total + int.from_bytes(hashlib.sha256(item).digest(), 'big')) % DIGEST_MODULUS
+        count += 1
+    return count, f"{total:064x}"
+
+
+def bucket_bounds(block_number):
+    """First and last block of the digest bucket containing block_number"""
+    start = block_number // DIGEST_BLOCK_SPAN * DIGEST_BLOCK_SPAN
+    return start, start + DIGEST_BLOCK_SPAN - 1
+
+
+class RangeDigestStore:
+    """
+    Per-bucket digests of the events stored for one event stream
+    """
+
+    def __init__(self, checkpoint, event_type):
+        self.checkpoint = checkpoint
+        self.model, self.amount_field = EVENT_MODELS[event_type]
+
+    def stored_keys(self, from_block, to_block):
+        """Event keys stored in the database for [from_block, to_block]"""
+        rows = self.model.objects.filter(
+            block_number__gte=from_block,
+            block_number__lte=to_block
+        ).values_list('transaction_hash', 'log_index', self.amount_field)
+        return [event_key(*row) for row in rows]
+
+    def compute(self, from_block, to_block):
+        """Digest of the stored events in any block range, read from the event table"""
+        return digest_of(self.stored_keys(from_block, to_block))
+
+    def refresh(self, from_block, to_block):
+        """
+        Recompute the stored digest of every bucket touching [from_block, to_block]
+
+        Call inside the transaction that changed the bucket's events.
+        """
+        bucket_start, _ = bucket_bounds(from_block)
+        with transaction.atomic():
+            while bucket_start <= to_block:
+                bucket_end = bucket_start + DIGEST_BLOCK_SPAN - 1
+                count, digest = self.compute(bucket_start, bucket_end)
+                if count:
+                    SyncRangeDigest.objects.update_or_create(
+                        checkpoint=self.checkpoint,
+                        from_block=bucket_start,
+                        defaults={'to_block': bucket_end, 'event_count': count, 'digest': digest}
+                    )
+                else:
+                    SyncRangeDigest.objects.filter(checkpoint=self.checkpoint, from_block=bucket_start).delete()
+                bucket_start += DIGEST_BLOCK_SPAN
+
+    def truncate_from(self, block_number):
+        """Drop digests of buckets after block_number and refresh the bucket containing it"""
+        bucket_start, bucket_end = bucket_bounds(block_number)
+        with transaction.atomic():
+            SyncRangeDigest.objects.filter(checkpoint=self.checkpoint, from_block__gt=bucket_start).delete()
+            self.refresh(bucket_start, bucket_end)
+
+    def stored(self, from_block, to_block):
+        """
+        Stored digests of the buckets inside [from_block, to_block]
+
+        Returns:
+            Dict mapping bucket start block to (event_count, digest); empty buckets are absent
+        """
+        return {
+            row.from_block: (row.event_count, row.digest)
+            for row in SyncRangeDigest.objects.filter(
+                checkpoint=self.checkpoint,
+                from_block__gte=from_block,
+                to_block__lte=to_block
+            )
+        }
@@ -0,0 +1,146 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from decimal import Decimal
+from django.db.models import Max, Q
+from django.utils import timezone
+
+# Order of the grouped distributions list, served by the (-distributed_at, transaction_hash) index
+KEYSET_ORDER = ('-distributed_at', 'transaction_hash')
+
+
+class CursorError(ValueError):
+    """Invalid cursor query parameter, the message is returned to the client"""
+
+
+def encode_cursor(distributed_at, transaction_hash):
+    """Opaque cursor pointing after the transaction with this sort key"""
+    raw = f'{distributed_at.isoformat()}|{transaction_hash}'
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Sort key of the last transaction of the previous page
+
+    Raises:
+        CursorError if the cursor was not made by encode_cursor()
+    """
+    try:
+        raw = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        distributed_at, transaction_hash = raw.split('|', 1)
+        distributed_at = datetime.fromisoformat(distributed_at)
+    except ValueError:
+        raise CursorError("Invalid cursor")
+    if timezone.is_naive(distributed_at):
+        raise CursorError("Invalid cursor")
+    return distributed_at, transaction_hash
+
+
+def _after(distributed_at, transaction_hash):
+    """Rows sorting after (distributed_at, transaction_hash) in KEYSET_ORDER"""
+    return Q(distributed_at__lt=distributed_at) | Q(distributed_at=distributed_at, transaction_hash__gt=transaction_hash)
+
+
+def transaction_page(distributions, page_size, cursor=None):
+    """
+    One page of distributions grouped by transaction hash, using a keyset on (distributed_at, transaction_hash)
+
+    A transaction sorts by its latest distributed_at. Rows are read in index
+    order from the cursor until page_size + 1 transactions are seen, then
+    only those transactions' distributions are fetched, so a page costs the
+    same at any depth and table size.
+
+    Args:
+        distributions: Filtered RewardDistribution queryset
+        page_size: Transactions per page
+        cursor: Sort key from decode_cursor(), None for the first page
+
+    Returns:
+        Tuple of (list of group dicts for GroupedRewardDistributionSerializer,
+        sort key of the last group or None if this is the last page)
+    """
+    keys = distributions.order_by(*KEYSET_ORDER).values_list('distributed_at', 'transaction_hash')
+    if cursor is not None:
+        keys = keys.filter(_after(*cursor))
+
+    # A transaction has at most one row per NFT type, so one batch almost always fills the page
+    batch_size = (page_size + 1) * 8
+    page_keys = {}
+    listed_before = set()
+    scanned = 0
+    while True:
+        batch = list(keys[scanned:scanned + batch_size])
+        scanned += len(batch)
+        found = {}
+        for distributed_at, transaction_hash in batch:
+            if transaction_hash not in page_keys and transaction_hash not in listed_before:
+                found.setdefault(transaction_hash, distributed_at)
+
+        if cursor is not None and found:
+            # Transactions with a row up to the cursor were listed on an earlier page
+            earlier = distributions.filter(transaction_hash__in=list(found)).exclude(_after(*cursor))
+            listed_before.update(earlier.values_list('transaction_hash', flat=True))
+        page_keys.update(
+            (transaction_hash, distributed_at)
+            for transaction_hash, distributed_at in found.items()
+            if transaction_hash not in listed_before
+        )
+        if len(page_keys) > page_size or len(batch) < batch_size:
+            break
+
+    ordered = list(page_keys.items())
+    has_next = len(ordered) > page_size
+    ordered = ordered[:page_size]
+
+    groups = load_groups(distributions, ordered)
+    next_key = (ordered[-1][1], ordered[-1][0]) if has_next else None
+    return groups, next_key
+
+
+def transaction_keys(distributions):
+    """
+    (transaction_hash, distributed_at) of every transaction in KEYSET_ORDER, as a lazy queryset
+
+    Backs the deprecated page-number listing, which counts and slices it.
+    """
+    return (
+        distributions
+        .values('transaction_hash')
+        .annotate(latest=Max('distributed_at'))
+        .order_by('-latest', 'transaction_hash')
+        .values_list('transaction_hash', 'latest')
+    )
+
+
+def load_groups(distributions, ordered):
+    """Group dicts of the (transaction_hash, distributed_at) pairs in ordered, in that order"""
+    groups = {
+        transaction_hash: {
+            'transaction_hash': transaction_hash,
+            'block_number': None,
+            'distributed_at': distributed_at,
+            'distributions': [],
+            'total_amount_all_types': Decimal('0'),
+            'total_wallets_all_types': 0
+        }
+        for transaction_hash, distributed_at in ordered
+    }
+    rows = distributions.filter(transaction_hash__in=list(groups)).order_by(*KEYSET_ORDER, 'log_index')
+    for dist in rows:
+        group = groups[dist.transaction_hash]
+        if group['block_number'] is None:
+            group['block_number'] = dist.block_number
+        group['distributions'].append({
+            'id': dist.id,
+            'nft_type': dist.nft_type,
+            'total_amount': dist.total_amount,
+            'per_wallet_amount': dist.per_wallet_amount,
+            'wallet_count': dist.wallet_count,
+            'log_index': dist.log_index
+        })
+        group['total_amount_all_types'] += dist.total_amount
+        group['total_wallets_all_types'] += dist.wallet_count
+
+    for group in groups.values():
+        group['total_distributions'] = len(group['distributions'])
+    return list(groups.values())
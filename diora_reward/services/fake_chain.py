@@ -0,0 +1,520 @@
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from web3 import Web3
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+from .log_decoder import DISTRIBUTED_TOPIC, CLAIMED_TOPIC
+from .multicall import MULTICALL3_ADDRESS, AGGREGATE3_SELECTOR
+import bisect
+import json
+import random
+import threading
+import time
+
+# Timestamp of block 0 and seconds per block of the generated chain
+GENESIS_TIMESTAMP = 1700000000
+BLOCK_TIME = 12
+
+CHAIN_ID = 11155111
+
+PENDING_REWARDS_SELECTOR = Web3.keccak(text='pendingRewards(address)')[:4]
+CLAIMED_REWARDS_SELECTOR = Web3.keccak(text='claimedRewards(address)')[:4]
+TOTAL_BY_NFT_TYPE_SELECTOR = Web3.keccak(text='totalRewardsByNFTType(uint8)')[:4]
+
+
+def _word(value):
+    return f'{value:064x}'
+
+
+class FakeRPCError(Exception):
+    """JSON-RPC error answered by the fake chain"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeChain:
+    """
+    In-memory stand-in for a JSON-RPC node serving the rewards contract
+
+    Generates a corpus of RewardsDistributed and RewardsClaimed logs and
+    answers eth_blockNumber, eth_getBlockByNumber, eth_getLogs, eth_call
+    (direct contract reads and Multicall3 aggregate3), eth_getCode and
+    eth_chainId from it. Latency, provider result limits and rate limiting
+    (HTTP 429) can be injected to reproduce public endpoint behaviour.
+    mine() and reorg() extend or rewrite the tip and notify listeners such
+    as FakeChainWebSocketServer.
+
+    Only meant for benchmarks and local experiments, never for production settings.
+    """
+
+    def __init__(self, events=10000, blocks_per_event=10, start_block=1000000, contract_address=None,
+                 claim_ratio=0.5, wallets=5000, latency=0.0, max_results=None, rate_limit=None, seed=1):
+        """
+        Args:
+            events: Number of logs in the corpus
+            blocks_per_event: Average block distance between logs (density)
+            start_block: Block the contract is deployed in; the first log follows it
+            contract_address: Address the logs are emitted by
+            claim_ratio: Share of RewardsClaimed logs, the rest are RewardsDistributed
+            wallets: Number of distinct claiming wallets
+            latency: Seconds added to every HTTP request
+            max_results: eth_getLogs answers with a -32005 error above this many logs
+            rate_limit: Requests per second served before answering HTTP 429
+            seed: Random seed of the corpus
+        """
+        self.contract_address = (contract_address or '0xc62831c476F6c36D42299b3C6BAa519198302D4b').lower()
+        self.start_block = start_block
+        self.latency = latency
+        self.max_results = max_results
+        self.rate_limit = rate_limit
+        self.calls = Counter()
+        self.http_requests = 0
+        self.throttled = 0
+        self._recent_requests = []
+        self._lock = threading.Lock()
+        self._claimed = defaultdict(int)
+        self._totals_by_nft_type = defaultdict(int)
+        # Own generator, so the log corpus of a seed stays the same
+        pending_rng = random.Random(seed + 1)
+        self._pending = {0x1000 + index: pending_rng.randint(0, 10 ** 6) * 10 ** 15 for index in range(wallets)}
+        self._claim_ratio = claim_ratio
+        self._wallets = wallets
+        self._rng = random.Random(seed)
+        self._forks = []
+        self._listeners = []
+        self.logs = self._generate(events, blocks_per_event)
+        self._log_blocks = [int(log['blockNumber'], 16) for log in self.logs]
+        self.head = (self._log_blocks[-1] if self.logs else start_block) + 64
+
+    def _generate(self, count, blocks_per_event):
+        logs = []
+        block_number = self.start_block
+        log_index = 0
+        for _ in range(count):
+            step = self._rng.randint(0, blocks_per_event * 2) if blocks_per_event else 0
+            if step:
+                block_number += step
+                log_index = 0
+            logs.append(self._make_log(block_number, log_index))
+            log_index += 1
+        return logs
+
+    def _make_log(self, block_number, log_index):
+        """One random RewardsClaimed or RewardsDistributed log, counted in the contract state"""
+        rng = self._rng
+        if rng.random() < self._claim_ratio:
+            wallet = 0x1000 + rng.randrange(self._wallets)
+            amount = rng.randint(1, 10 ** 6) * 10 ** 15
+            self._claimed[wallet] += amount
+            topics = [CLAIMED_TOPIC, '0x' + _word(wallet)]
+            data = '0x' + _word(amount)
+        else:
+            nft_type = rng.randrange(6)
+            wallet_count = rng.randint(10, 500)
+            per_wallet = rng.randint(1, 10 ** 6) * 10 ** 15
+            self._totals_by_nft_type[nft_type] += per_wallet * wallet_count
+            topics = [DISTRIBUTED_TOPIC, '0x' + _word(nft_type)]
+            data = '0x' + _word(per_wallet * wallet_count) + _word(per_wallet) + _word(wallet_count)
+        return {
+            'address': self.contract_address,
+            'topics': topics,
+            'data': data,
+            'blockNumber': hex(block_number),
+            'blockHash': self._block_hash(block_number),
+            'transactionHash': '0x' + _word(rng.getrandbits(256)),
+            'transactionIndex': hex(log_index),
+            'logIndex': hex(log_index),
+            'removed': False,
+        }
+
+    @staticmethod
+    def wallet_address(index):
+        """Address of the index-th generated wallet"""
+        return '0x' + f'{0x1000 + index:040x}'
+
+    def pending_rewards(self, address):
+        """pendingRewards(address) in wei"""
+        return self._pending.get(int(address, 16), 0)
+
+    def claimed_rewards(self, address):
+        """claimedRewards(address) in wei"""
+        return self._claimed.get(int(address, 16), 0)
+
+    def total_rewards_by_nft_type(self, nft_type_index):
+        """totalRewardsByNFTType(uint8) in wei"""
+        return self._totals_by_nft_type.get(nft_type_index, 0)
+
+    def _block_hash(self, number):
+        """Hash of a block, which changes for every reorg that replaced it"""
+        fork = sum(1 for fork_block in self._forks if fork_block <= number)
+        return '0x' + _word(fork << 128 | number)
+
+    def add_listener(self, callback):
+        """Call callback(logs, header) for every mined block; removed logs come with header None"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            self._listeners.remove(callback)
+
+    def _notify(self, logs, header):
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback(logs, header)
+
+    def mine(self, events=0):
+        """
+        Append a block holding `events` new logs and notify the listeners
+
+        Returns:
+            Number of the new block
+        """
+        with self._lock:
+            block_number = self.head + 1
+            logs = [self._make_log(block_number, log_index) for log_index in range(events)]
+            self.logs.extend(logs)
+            self._log_blocks.extend(block_number for _ in logs)
+            self.head = block_number
+        self._notify(logs, self._eth_getBlockByNumber(hex(block_number)))
+        return block_number
+
+    def reorg(self, depth, events=0):
+        """
+        Replace the last `depth` blocks with new ones holding `events` logs each
+
+        Listeners first get the replaced logs flagged as removed, then the new
+        blocks. Contract state keeps the replaced logs' amounts, only the logs
+        and block hashes change.
+        """
+        with self._lock:
+            fork_block = self.head - depth + 1
+            first = bisect.bisect_left(self._log_blocks, fork_block)
+            removed = [dict(log, removed=True) for log in self.logs[first:]]
+            del self.logs[first:]
+            del self._log_blocks[first:]
+            self._forks.append(fork_block)
+            self.head = fork_block - 1
+        if removed:
+            self._notify(removed, None)
+        for _ in range(depth):
+            self.mine(events)
+
+    def is_throttled(self):
+        """Count an HTTP request against the rate limit, True if it has to be rejected"""
+        now = time.monotonic()
+        with self._lock:
+            self.http_requests += 1
+            if not self.rate_limit:
+                return False
+            self._recent_requests = [at for at in self._recent_requests if now - at < 1.0]
+            if len(self._recent_requests) >= self.rate_limit:
+                self.throttled += 1
+                return True
+            self._recent_requests.append(now)
+            return False
+
+    def handle(self, request):
+        """Answer one JSON-RPC request object"""
+        method = request.get('method')
+        params = request.get('params') or []
+        with self._lock:
+            self.calls[method] += 1
+        handler = getattr(self, f'_{method}', None)
+        if handler is None:
+            return self._error(request, -32601, f'Method {method} not supported')
+        try:
+            result = handler(*params)
+        except FakeRPCError as e:
+            return self._error(request, e.code, str(e))
+        return {'jsonrpc': '2.0', 'id': request.get('id'), 'result': result}
+
+    @staticmethod
+    def _error(request, code, message):
+        return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': {'code': code, 'message': message}}
+
+    def _block_number(self, identifier):
+        if identifier in ('latest', 'safe', 'finalized', 'pending'):
+            return self.head
+        if identifier == 'earliest':
+            return 0
+        return int(identifier, 16)
+
+    def _eth_chainId(self):
+        return hex(CHAIN_ID)
+
+    def _web3_clientVersion(self):
+        return 'FakeChain/1.0'
+
+    def _eth_blockNumber(self):
+        return hex(self.head)
+
+    def _eth_getBlockByNumber(self, identifier, full_transactions=False):
+        number = self._block_number(identifier)
+        if number > self.head:
+            return None
+        return {
+            'number': hex(number),
+            'hash': self._block_hash(number),
+            'parentHash': self._block_hash(max(number - 1, 0)),
+            'timestamp': hex(GENESIS_TIMESTAMP + number * BLOCK_TIME),
+            'miner': '0x' + '00' * 20,
+            'difficulty': '0x0',
+            'totalDifficulty': '0x0',
+            'size': '0x0',
+            'gasLimit': '0x1c9c380',
+            'gasUsed': '0x0',
+            'extraData': '0x',
+            'logsBloom': '0x' + '00' * 256,
+            'nonce': '0x0000000000000000',
+            'sha3Uncles': '0x' + '00' * 32,
+            'stateRoot': '0x' + '00' * 32,
+            'transactionsRoot': '0x' + '00' * 32,
+            'receiptsRoot': '0x' + '00' * 32,
+            'mixHash': '0x' + '00' * 32,
+            'transactions': [],
+            'uncles': [],
+        }
+
+    def _eth_getCode(self, address, identifier='latest'):
+        deployed = address.lower() == self.contract_address and self._block_number(identifier) >= self.start_block
+        return '0x6080604052' if deployed else '0x'
+
+    def _eth_getLogs(self, log_filter):
+        from_block = self._block_number(log_filter.get('fromBlock', 'latest'))
+        to_block = self._block_number(log_filter.get('toBlock', 'latest'))
+        address = log_filter.get('address')
+        if address and (address if isinstance(address, str) else address[0]).lower() != self.contract_address:
+            return []
+        first = bisect.bisect_left(self._log_blocks, from_block)
+        last = bisect.bisect_right(self._log_blocks, to_block)
+        logs = self.logs[first:last]
+
+        topics = log_filter.get('topics') or []
+        for position, wanted in enumerate(topics):
+            if wanted is None:
+                continue
+            wanted = {topic.lower() for topic in (wanted if isinstance(wanted, list) else [wanted])}
+            logs = [log for log in logs if len(log['topics']) > position and log['topics'][position] in wanted]
+
+        if self.max_results is not None and len(logs) > self.max_results:
+            raise FakeRPCError(-32005, f'query returned more than {self.max_results} results')
+        return logs
+
+    def _eth_call(self, transaction, identifier='latest'):
+        to = transaction['to'].lower()
+        data = bytes.fromhex((transaction.get('data') or transaction.get('input'))[2:])
+        if to == MULTICALL3_ADDRESS.lower() and data[:4] == AGGREGATE3_SELECTOR:
+            (calls,) = Web3().codec.decode(['(address,bool,bytes)[]'], data[4:])
+            results = []
+            for target, _, call_data in calls:
+                value = self._read(target.lower(), call_data)
+                results.append((value is not None, (value or 0).to_bytes(32, 'big')))
+            return '0x' + Web3().codec.encode(['(bool,bytes)[]'], [results]).hex()
+        value = self._read(to, data)
+        if value is None:
+            raise FakeRPCError(3, 'execution reverted')
+        return '0x' + _word(value)
+
+    def _read(self, to, call_data):
+        """Result of a rewards contract view function, None if the call would revert"""
+        if to != self.contract_address or len(call_data) < 36:
+            return None
+        selector, argument = bytes(call_data[:4]), int.from_bytes(call_data[4:36], 'big')
+        if selector == PENDING_REWARDS_SELECTOR:
+            return self._pending.get(argument, 0)
+        if selector == CLAIMED_REWARDS_SELECTOR:
+            return self._claimed.get(argument, 0)
+        if selector == TOTAL_BY_NFT_TYPE_SELECTOR:
+            return self._totals_by_nft_type.get(argument, 0)
+        return None
+
+
+class _FakeChainHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        chain = self.server.chain
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if chain.latency:
+            time.sleep(chain.latency)
+        if chain.is_throttled():
+            self._reply(429, b'{"error": "Too Many Requests"}', extra_headers={'Retry-After': '1'})
+            return
+        request = json.loads(body)
+        if isinstance(request, list):
+            response = [chain.handle(item) for item in request]
+        else:
+            response = chain.handle(request)
+        self._reply(200, json.dumps(response).encode())
+
+    def _reply(self, status, payload, extra_headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeChainServer:
+    """
+    Serve a FakeChain over HTTP on localhost, for use as BLOCKCHAIN_RPC_URLS
+
+    Usage:
+        with FakeChainServer(FakeChain(events=100000)) as server:
+            settings.BLOCKCHAIN_RPC_URLS = [server.url]
+    """
+
+    def __init__(self, chain, host='127.0.0.1', port=0):
+        self.chain = chain
+        self._server = ThreadingHTTPServer((host, port), _FakeChainHandler)
+        self._server.daemon_threads = True
+        self._server.chain = chain
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-chain', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class FakeChainWebSocketServer:
+    """
+    Serve a FakeChain over WebSocket on localhost, for use as BLOCKCHAIN_WS_URL
+
+    Supports eth_subscribe for "logs" (address and topic filters) and
+    "newHeads", fed by FakeChain.mine() and reorg(). Other methods are
+    answered like over HTTP.
+
+    Usage:
+        with FakeChainWebSocketServer(chain) as ws_server:
+            call_command('run_sync_daemon', subscribe=True, ws_url=ws_server.url)
+            chain.mine(events=3)
+    """
+
+    def __init__(self, chain, host='127.0.0.1', port=0):
+        self.chain = chain
+        self._server = serve(self._handle_connection, host, port)
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._next_subscription = 1
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.socket.getsockname()[:2]
+        return f'ws://{host}:{port}'
+
+    def start(self):
+        self.chain.add_listener(self._publish)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-chain-ws', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.chain.remove_listener(self._publish)
+        self.disconnect_all()
+        self._server.shutdown()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def disconnect_all(self):
+        """Close every client connection, e.g. to exercise reconnects"""
+        with self._lock:
+            connections = list(self._connections)
+        for websocket in connections:
+            websocket.close()
+
+    def _handle_connection(self, websocket):
+        websocket.subscriptions = {}
+        with self._lock:
+            self._connections.add(websocket)
+        try:
+            for message in websocket:
+                request = json.loads(message)
+                if request.get('method') == 'eth_subscribe':
+                    response = self._subscribe(websocket, request)
+                elif request.get('method') == 'eth_unsubscribe':
+                    found = websocket.subscriptions.pop(request['params'][0], None) is not None
+                    response = {'jsonrpc': '2.0', 'id': request.get('id'), 'result': found}
+                else:
+                    response = self.chain.handle(request)
+                websocket.send(json.dumps(response))
+        except ConnectionClosed:
+            pass
+        finally:
+            with self._lock:
+                self._connections.discard(websocket)
+
+    def _subscribe(self, websocket, request):
+        params = request.get('params') or []
+        kind = params[0] if params else None
+        if kind not in ('logs', 'newHeads'):
+            return FakeChain._error(request, -32602, f'Subscription {kind} not supported')
+        with self._lock:
+            subscription_id = hex(self._next_subscription)
+            self._next_subscription += 1
+        websocket.subscriptions[subscription_id] = (kind, params[1] if len(params) > 1 else {})
+        return {'jsonrpc': '2.0', 'id': request.get('id'), 'result': subscription_id}
+
+    def _publish(self, logs, header):
+        """FakeChain listener: push logs and the new header to matching subscriptions"""
+        with self._lock:
+            connections = list(self._connections)
+        for websocket in connections:
+            for subscription_id, (kind, log_filter) in list(websocket.subscriptions.items()):
+                if kind == 'logs':
+                    results = [log for log in logs if self._matches(log, log_filter)]
+                else:
+                    results = [header] if header is not None else []
+                try:
+                    for result in results:
+                        websocket.send(json.dumps({
+                            'jsonrpc': '2.0',
+                            'method': 'eth_subscription',
+                            'params': {'subscription': subscription_id, 'result': result}
+                        }))
+                except ConnectionClosed:
+                    break
+
+    @staticmethod
+    def _matches(log, log_filter):
+        address = log_filter.get('address')
+        if address:
+            addresses = [address] if isinstance(address, str) else address
+            if log['address'] not in {item.lower() for item in addresses}:
+                return False
+        for position, wanted in enumerate(log_filter.get('topics') or []):
+            if wanted is None:
+                continue
+            wanted = {topic.lower() for topic in (wanted if isinstance(wanted, list) else [wanted])}
+            if len(log['topics']) <= position or log['topics'][position] not in wanted:
+                return False
+        return True
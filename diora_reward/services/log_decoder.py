@@ -0,0 +1,116 @@
+from collections import namedtuple
+from web3 import Web3
+
+# topic0 of the two events emitted by DITRewardsDistributor
+DISTRIBUTED_TOPIC = Web3.to_hex(Web3.keccak(text='RewardsDistributed(uint8,uint256,uint256,uint256)'))
+CLAIMED_TOPIC = Web3.to_hex(Web3.keccak(text='RewardsClaimed(address,uint256)'))
+
+# Decoded events. Transaction hashes are lowercase without 0x (as stored in the
+# database), addresses are lowercase with 0x and amounts are raw wei integers.
+DistributionLog = namedtuple('DistributionLog', [
+    'block_number', 'log_index', 'transaction_hash',
+    'nft_type_index', 'total_amount', 'per_wallet', 'wallet_count',
+])
+ClaimLog = namedtuple('ClaimLog', [
+    'block_number', 'log_index', 'transaction_hash',
+    'wallet_address', 'amount',
+])
+
+
+def _decode_distribution(log, data):
+    return DistributionLog(
+        int(log['blockNumber'], 16),
+        int(log['logIndex'], 16),
+        log['transactionHash'][2:].lower(),
+        int(log['topics'][1], 16),
+        int(data[0:64], 16),
+        int(data[64:128], 16),
+        int(data[128:192], 16),
+    )
+
+
+def _decode_claim(log, data):
+    return ClaimLog(
+        int(log['blockNumber'], 16),
+        int(log['logIndex'], 16),
+        log['transactionHash'][2:].lower(),
+        '0x' + log['topics'][1][-40:].lower(),
+        int(data[0:64], 16),
+    )
+
+
+_DECODERS = {
+    DISTRIBUTED_TOPIC: _decode_distribution,
+    CLAIMED_TOPIC: _decode_claim,
+}
+
+
+def decode_logs(raw_logs):
+    """
+    Decode raw eth_getLogs results of the rewards contract
+
+    Reads topics and 32-byte data words straight from the hex strings instead
+    of going through web3's log formatters and generic ABI decoder, which cost
+    far more per event than these two fixed layouts need.
+
+    Args:
+        raw_logs: Log objects exactly as returned by the JSON-RPC endpoint
+
+    Returns:
+        List of DistributionLog and ClaimLog tuples; removed logs and other events are skipped
+    """
+    decoded = []
+    for log in raw_logs:
+        if log.get('removed'):
+            continue
+        decoder = _DECODERS.get(log['topics'][0].lower()) if log['topics'] else None
+        if decoder is None:
+            continue
+        decoded.append(decoder(log, log['data'][2:]))
+    return decoded
+
+
+_DISTRIBUTED_TOPIC_BYTES = bytes.fromhex(DISTRIBUTED_TOPIC[2:])
+_CLAIMED_TOPIC_BYTES = bytes.fromhex(CLAIMED_TOPIC[2:])
+
+
+def is_reward_log(log):
+    """Whether a raw JSON-RPC log is one of the two events decode_logs() understands"""
+    return not log.get('removed') and bool(log['topics']) and log['topics'][0].lower() in _DECODERS
+
+
+def decode_stored_logs(rows):
+    """
+    Decode logs kept in the RawEventLog table
+
+    Args:
+        rows: (block_number, log_index, transaction_hash, topics, data) tuples
+            with the last three as bytes (memoryview on PostgreSQL)
+
+    Returns:
+        List of DistributionLog and ClaimLog tuples; other events are skipped
+    """
+    decoded = []
+    for block_number, log_index, transaction_hash, topics, data in rows:
+        topics = bytes(topics)
+        data = bytes(data)
+        signature = topics[:32]
+        if signature == _DISTRIBUTED_TOPIC_BYTES:
+            decoded.append(DistributionLog(
+                block_number,
+                log_index,
+                bytes(transaction_hash).hex(),
+                int.from_bytes(topics[32:64], 'big'),
+                int.from_bytes(data[0:32], 'big'),
+                int.from_bytes(data[32:64], 'big'),
+                int.from_bytes(data[64:96], 'big'),
+            ))
+        elif signature == _CLAIMED_TOPIC_BYTES:
+            decoded.append(ClaimLog(
+                block_number,
+                log_index,
+                bytes(transaction_hash).hex(),
+                '0x' + topics[44:64].hex(),
+                int.from_bytes(data[0:32], 'big'),
+            ))
+    return decoded
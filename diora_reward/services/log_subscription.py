@@ -0,0 +1,121 @@
+from websockets.sync.client import connect
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Largest WebSocket message accepted; a block with many reward logs is sent as one notification each
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+class SubscriptionError(Exception):
+    """The node refused a subscription or answered with something unexpected"""
+
+
+class LogSubscription:
+    """
+    eth_subscribe client for the logs of one contract plus new block headers
+
+    Opens a WebSocket connection, subscribes to "logs" filtered on the
+    contract address and topics and to "newHeads", and hands out the
+    notifications one at a time. Headers tell the caller when every log
+    of a block has been delivered, logs flagged "removed" report a reorg.
+
+    The connection is synchronous so the daemon keeps its single-threaded
+    loop and DB connection. Nothing is retried here: the caller reconnects
+    and fills the gap from its checkpoints.
+
+    Usage:
+        with LogSubscription(ws_url, address, [[DISTRIBUTED_TOPIC, CLAIMED_TOPIC]]) as subscription:
+            kind, payload = subscription.receive(timeout=1.0)
+    """
+
+    def __init__(self, ws_url, address, topics, open_timeout=10):
+        """
+        Args:
+            ws_url: ws:// or wss:// endpoint of the node
+            address: Contract address the logs are filtered on
+            topics: eth_subscribe topic filter (same shape as eth_getLogs)
+            open_timeout: Seconds allowed for the handshake and the subscribe calls
+        """
+        self.ws_url = ws_url
+        self.address = address
+        self.topics = topics
+        self.open_timeout = open_timeout
+        self._connection = None
+        self._subscriptions = {}
+        self._queued = []
+        self._next_id = 1
+
+    def open(self):
+        """Connect and subscribe to logs and new heads"""
+        self._connection = connect(self.ws_url, open_timeout=self.open_timeout, max_size=MAX_MESSAGE_SIZE)
+        try:
+            logs_id = self._subscribe(['logs', {'address': self.address, 'topics': self.topics}])
+            heads_id = self._subscribe(['newHeads'])
+        except Exception:
+            self.close()
+            raise
+        self._subscriptions = {logs_id: 'log', heads_id: 'head'}
+        logger.info(f"Subscribed to logs of {self.address} and new heads at {self.ws_url}")
+        return self
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _subscribe(self, params):
+        """Send eth_subscribe and wait for its subscription id"""
+        request_id = self._next_id
+        self._next_id += 1
+        self._connection.send(json.dumps({
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'method': 'eth_subscribe',
+            'params': params
+        }))
+
+        deadline = time.monotonic() + self.open_timeout
+        while True:
+            message = json.loads(self._connection.recv(timeout=max(0.0, deadline - time.monotonic())))
+            if message.get('id') != request_id:
+                # A notification of an earlier subscription, keep it for receive()
+                self._queued.append(message)
+                continue
+            if 'error' in message:
+                raise SubscriptionError(f"eth_subscribe {params[0]} failed: {message['error']}")
+            return message['result']
+
+    def receive(self, timeout=None):
+        """
+        Wait for the next notification
+
+        Args:
+            timeout: Seconds to wait, None to block
+
+        Returns:
+            Tuple of ('log', raw log object) or ('head', raw block header)
+
+        Raises:
+            TimeoutError if nothing arrived in time
+            websockets.ConnectionClosed if the connection dropped
+        """
+        while True:
+            if self._queued:
+                message = self._queued.pop(0)
+            else:
+                message = json.loads(self._connection.recv(timeout=timeout))
+            if message.get('method') != 'eth_subscription':
+                continue
+            params = message.get('params') or {}
+            kind = self._subscriptions.get(params.get('subscription'))
+            if kind is not None:
+                return kind, params['result']
@@ -0,0 +1,159 @@
+from collections import deque
+from django.utils import timezone
+import logging
+import threading
+import time
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Fragments of JSON-RPC error messages providers use when throttling
+THROTTLE_MARKERS = (
+    'rate limit',
+    'too many requests',
+    'request limit',
+    'throttl',
+    'capacity exceeded',
+)
+
+
+def retry_after_seconds(error):
+    """Seconds from a Retry-After header, if the provider sent one"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+class RPCThrottledError(Exception):
+    """Every RPC endpoint kept throttling a call, raised by RPCPool instead of the provider's error"""
+
+
+def is_throttle_error(error):
+    """Whether an exception raised by the HTTP provider is an HTTP 429, or the pool gave up on throttling"""
+    if isinstance(error, RPCThrottledError):
+        return True
+    return (
+        isinstance(error, requests.HTTPError)
+        and error.response is not None
+        and error.response.status_code == 429
+    )
+
+
+def is_throttle_response(response):
+    """Whether a JSON-RPC response (or any item of a batch) is a rate-limit error"""
+    responses = response if isinstance(response, list) else [response]
+    for item in responses:
+        error = item.get('error') if isinstance(item, dict) else None
+        if not isinstance(error, dict):
+            continue
+        message = str(error.get('message', '')).lower()
+        if error.get('code') == 429 or any(marker in message for marker in THROTTLE_MARKERS):
+            return True
+    return False
+
+
+class RateGovernor:
+    """
+    Token bucket plus AIMD concurrency limit for one RPC endpoint
+
+    Every success raises the request rate and the concurrency limit a little
+    (additive increase); a throttled call halves both and pauses the endpoint
+    (multiplicative decrease). Other failures leave the limits alone. Over
+    time the limits settle just below what the provider accepts.
+    """
+
+    def __init__(self, initial_rate=25.0, min_rate=0.5, max_rate=1000.0, rate_step=2.0,
+                 initial_concurrency=8, min_concurrency=1, max_concurrency=64, backoff=1.0):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_step = rate_step
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff = backoff
+
+        self.rate = initial_rate
+        self.concurrency = float(initial_concurrency)
+        self.tokens = 1.0
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.throttle_events = 0
+        self.recent_throttles = deque(maxlen=20)
+        self._refilled_at = time.monotonic()
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        # Burst size follows the rate, so at most one second of requests goes out at once
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def is_paused(self, now):
+        """Whether the endpoint is waiting out a throttle"""
+        return now < self.paused_until
+
+    def acquire(self):
+        """Block until the endpoint may take another request"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.in_flight >= int(self.concurrency):
+                    wait = None
+                elif self.tokens < 1:
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                self._condition.wait(wait)
+
+    def release(self, throttled=False, retry_after=None, success=True):
+        """
+        Finish a request acquired with acquire()
+
+        Args:
+            throttled: The provider rejected the request with a rate-limit error
+            retry_after: Seconds the provider asked us to wait, if known
+            success: False for a request that failed for another reason (e.g. a
+                transport error), which frees its slot without raising the limits
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self._on_throttle(retry_after)
+            elif success:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+                self.rate = min(self.max_rate, self.rate + self.rate_step / self.rate)
+            self._condition.notify_all()
+
+    def _on_throttle(self, retry_after):
+        now = time.monotonic()
+        self.throttle_events += 1
+        # Requests already in flight when the limit was hit fail together,
+        # only the first of them lowers the limits
+        if now >= self.paused_until:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.concurrency = max(float(self.min_concurrency), self.concurrency / 2)
+        self.paused_until = max(self.paused_until, now + (retry_after or self.backoff))
+        logger.info(f"Throttled, limits now {self.rate:.1f} req/s and {int(self.concurrency)} concurrent requests")
+        self.recent_throttles.append({
+            'at': timezone.now().isoformat(),
+            'rate_limit': round(self.rate, 2),
+            'concurrency_limit': int(self.concurrency),
+        })
+
+    def stats(self):
+        with self._condition:
+            return {
+                'rate_limit': round(self.rate, 2),
+                'concurrency_limit': int(self.concurrency),
+                'in_flight': self.in_flight,
+                'throttle_events': self.throttle_events,
+                'last_throttled_at': self.recent_throttles[-1]['at'] if self.recent_throttles else None,
+            }
+
@@ -0,0 +1,137 @@
+from functools import wraps
+from hashlib import sha256
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from ..models import RewardsDataVersion
+
+CACHE_PREFIX = 'diora_reward:response'
+
+# Entries of old versions are never read again, the timeout only frees their memory
+RESPONSE_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Endpoint names passed to cache_analytics_response(), reported by response_cache_stats()
+_endpoints = []
+
+
+def bump_rewards_data_version():
+    """
+    Invalidate every cached analytics response
+
+    Call it inside the transaction that writes RewardDistribution or
+    PendingReward, so the new version becomes visible with the new data.
+    The version row stays locked until that transaction ends, which also
+    serializes the writers that bump it first (see refresh_reward_rollups).
+    """
+    versions = RewardsDataVersion.objects.filter(pk=1)
+    if versions.update(version=F('version') + 1, updated_at=timezone.now()):
+        return
+    _, created = RewardsDataVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+    if not created:
+        # Another transaction created the row first, take the lock the UPDATE would have
+        versions.update(version=F('version') + 1, updated_at=timezone.now())
+
+
+def rewards_data_version():
+    """Current rewards data version, 0 before the first write"""
+    return RewardsDataVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+
+def response_cache_key(endpoint, query_params, params, version, bucket=None):
+    """
+    Cache key of one analytics response
+
+    Only the params the endpoint reads are part of the key, sorted, with
+    blank values dropped, so parameter order and unrelated params (e.g. a
+    cache buster) do not split the cache.
+    """
+    normalized = '&'.join(
+        f'{name}={value.strip()}'
+        for name in sorted(params)
+        for value in sorted(query_params.getlist(name))
+        if value.strip()
+    )
+    digest = sha256(normalized.encode()).hexdigest()[:32]
+    if bucket is not None:
+        digest = f'{digest}:t{bucket}'
+    return f'{CACHE_PREFIX}:{endpoint}:v{version}:{digest}'
+
+
+def _count(outcome, endpoint):
+    key = f'{CACHE_PREFIX}:stats:{outcome}:{endpoint}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Missing (first request or evicted); a concurrent add may win and lose one count
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def cache_analytics_response(endpoint, params, bucket=None):
+    """
+    Cache the 200 responses of an APIView get() by endpoint, query params and data version
+
+    Args:
+        endpoint: Name of the endpoint in cache keys and stats
+        params: Query params the endpoint reads
+        bucket: Optional function of the query params returning an extra key
+            part, for responses that also change with time (e.g. rolling periods)
+    """
+    _endpoints.append(endpoint)
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            key = response_cache_key(
+                endpoint,
+                request.query_params,
+                params,
+                rewards_data_version(),
+                bucket(request.query_params) if bucket else None
+            )
+            data = cache.get(key)
+            if data is not None:
+                _count('hits', endpoint)
+                return Response(data, status=status.HTTP_200_OK)
+
+            _count('misses', endpoint)
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, RESPONSE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
+
+
+def response_cache_stats():
+    """
+    Hit and miss counts per endpoint
+
+    Counters live in the Django cache next to the entries and reset when it
+    is cleared. No CACHES is configured, so the default LocMemCache keeps
+    entries and counters per process: each worker reports its own counts.
+    They cover every worker only when CACHES points at a shared backend
+    (e.g. Redis).
+    """
+    keys = [
+        f'{CACHE_PREFIX}:stats:{outcome}:{endpoint}'
+        for endpoint in _endpoints for outcome in ('hits', 'misses')
+    ]
+    counts = cache.get_many(keys)
+    endpoints = {}
+    for endpoint in _endpoints:
+        hits = counts.get(f'{CACHE_PREFIX}:stats:hits:{endpoint}', 0)
+        misses = counts.get(f'{CACHE_PREFIX}:stats:misses:{endpoint}', 0)
+        endpoints[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+    return {
+        'data_version': rewards_data_version(),
+        'hits': sum(stats['hits'] for stats in endpoints.values()),
+        'misses': sum(stats['misses'] for stats in endpoints.values()),
+        'endpoints': endpoints,
+    }
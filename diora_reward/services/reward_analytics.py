@@ -0,0 +1,292 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+import time
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+from ..models import PendingReward, RewardDailyRollup, RewardDistribution
+from .reward_rollups import day_start, utc_day
+
+# Length in days of the fixed analytics periods
+PERIOD_DAYS = {
+    'week': 7,
+    'month': 30,
+    '6months': 180,
+    'year': 365,
+}
+
+# Cached responses of rolling periods (ending now) are reused within this many seconds
+ROLLING_PERIOD_CACHE_SECONDS = 60
+
+# Query params read by the period analytics endpoints
+PERIOD_PARAMS = ('period', 'start_date', 'end_date')
+
+RewardPeriod = namedtuple('RewardPeriod', ['period', 'start_date', 'end_date', 'prev_start_date', 'prev_end_date'])
+
+
+class PeriodError(ValueError):
+    """Invalid period query parameters, the message is returned to the client"""
+
+
+def resolve_period(period, start_date_str=None, end_date_str=None, now=None):
+    """
+    Resolve the period query parameters of the analytics endpoints
+
+    The current window is [start_date, end_date], the previous one has the
+    same length and ends where the current one starts: [prev_start_date, prev_end_date).
+
+    Args:
+        period: 'week', 'month', '6months', 'year', 'custom' or None
+        start_date_str: Start date (YYYY-MM-DD) for a custom period
+        end_date_str: End date (YYYY-MM-DD, inclusive) for a custom period
+        now: Current time (default: timezone.now())
+
+    Returns:
+        RewardPeriod, or None for all-time totals (no or unknown period)
+
+    Raises:
+        PeriodError if a custom period is missing or has invalid dates
+    """
+    if period in PERIOD_DAYS:
+        end_date = now or timezone.now()
+        start_date = end_date - timedelta(days=PERIOD_DAYS[period])
+        return RewardPeriod(period, start_date, end_date, start_date - timedelta(days=PERIOD_DAYS[period]), start_date)
+
+    if period != 'custom':
+        return None
+
+    if not start_date_str or not end_date_str:
+        raise PeriodError("start_date and end_date are required for custom period")
+    try:
+        start_date = timezone.make_aware(datetime.strptime(start_date_str, '%Y-%m-%d'))
+        end_date = timezone.make_aware(datetime.strptime(end_date_str, '%Y-%m-%d'))
+    except ValueError:
+        raise PeriodError("Invalid date format. Use YYYY-MM-DD")
+    end_date = end_date.replace(hour=23, minute=59, second=59)
+
+    # Previous period with the same duration
+    duration = end_date - start_date
+    return RewardPeriod(period, start_date, end_date, start_date - duration, start_date)
+
+
+def period_cache_bucket(query_params):
+    """
+    Response cache key part for rolling periods
+
+    A rolling period ends at the current time, so its totals change as
+    distributions slide out of the window even without writes.
+
+    Returns:
+        Index of the current ROLLING_PERIOD_CACHE_SECONDS slot, or None for fixed windows
+    """
+    if query_params.get('period') in PERIOD_DAYS:
+        return int(time.time() // ROLLING_PERIOD_CACHE_SECONDS)
+    return None
+
+
+def _split_window(start, end):
+    """
+    Split the window [start, end) into whole UTC days and the partial days at its edges
+
+    Returns:
+        Tuple of ((first_day, last_day) or None, list of (from, to) datetime ranges)
+    """
+    first_day = utc_day(start)
+    if day_start(first_day) < start:
+        first_day += timedelta(days=1)
+    last_day = utc_day(end) - timedelta(days=1)
+    if first_day > last_day:
+        return None, [(start, end)] if start < end else []
+
+    edges = []
+    if start < day_start(first_day):
+        edges.append((start, day_start(first_day)))
+    if day_start(last_day + timedelta(days=1)) < end:
+        edges.append((day_start(last_day + timedelta(days=1)), end))
+    return (first_day, last_day), edges
+
+
+def _merge_rows(rows_by_key, rows, group_by):
+    for row in rows:
+        key = row[group_by] if group_by else None
+        merged = rows_by_key.setdefault(key, {})
+        for name, value in row.items():
+            if name != group_by and value is not None:
+                merged[name] = merged.get(name, 0) + value
+
+
+def query_period_totals(reward_period, nft_type=None, by_nft_type=False):
+    """
+    Current and previous period totals, read from the daily rollups
+
+    Whole days of both windows come from RewardDailyRollup, the partial
+    days at the window edges from the raw RewardDistribution rows, so the
+    cost depends on the number of days rather than distributions. That is
+    two queries, each computing both windows with filtered aggregates.
+
+    Args:
+        reward_period: RewardPeriod from resolve_period()
+        nft_type: Only count this NFT type (default: all)
+        by_nft_type: Group the totals by NFT type
+
+    Returns:
+        Row dict with current_/previous_ distributed, wallets and distributions
+        (missing keys mean zero), or a dict of such rows by nft_type if by_nft_type
+    """
+    windows = {
+        # The current window includes its end, previous ends where current starts
+        'current': _split_window(reward_period.start_date, reward_period.end_date + timedelta(microseconds=1)),
+        'previous': _split_window(reward_period.prev_start_date, reward_period.prev_end_date),
+    }
+    rollup_aggregates, rollup_filters = {}, []
+    raw_aggregates, raw_filters = {}, []
+    for name, (days, edges) in windows.items():
+        if days:
+            in_days = Q(day__gte=days[0], day__lte=days[1])
+            rollup_aggregates[f'{name}_distributed'] = Sum('total_amount', filter=in_days)
+            rollup_aggregates[f'{name}_wallets'] = Sum('wallet_count', filter=in_days)
+            rollup_aggregates[f'{name}_distributions'] = Sum('distribution_count', filter=in_days)
+            rollup_filters.append(in_days)
+        if edges:
+            in_edges = reduce(or_, (Q(distributed_at__gte=edge_start, distributed_at__lt=edge_end) for edge_start, edge_end in edges))
+            raw_aggregates[f'{name}_distributed'] = Sum('total_amount', filter=in_edges)
+            raw_aggregates[f'{name}_wallets'] = Sum('wallet_count', filter=in_edges)
+            raw_aggregates[f'{name}_distributions'] = Count('pk', filter=in_edges)
+            raw_filters.append(in_edges)
+
+    group_by = 'nft_type' if by_nft_type else None
+    rows_by_key = {}
+    for model, aggregates, filters in (
+        (RewardDailyRollup, rollup_aggregates, rollup_filters),
+        (RewardDistribution, raw_aggregates, raw_filters),
+    ):
+        if not aggregates:
+            continue
+        queryset = model.objects.filter(reduce(or_, filters))
+        if nft_type is not None:
+            queryset = queryset.filter(nft_type=nft_type)
+        if group_by:
+            rows = queryset.values(group_by).annotate(**aggregates).order_by()
+        else:
+            rows = [queryset.aggregate(**aggregates)]
+        _merge_rows(rows_by_key, rows, group_by)
+    return rows_by_key if by_nft_type else rows_by_key.get(None, {})
+
+
+def query_all_time_totals(nft_type=None, by_nft_type=False):
+    """
+    All-time totals summed from the daily rollups, in one query
+
+    Returns:
+        Row dict with total_distributed, total_wallets and total_distributions,
+        or a dict of such rows by nft_type if by_nft_type
+    """
+    aggregates = {
+        'total_distributed': Sum('total_amount'),
+        'total_wallets': Sum('wallet_count'),
+        'total_distributions': Sum('distribution_count'),
+    }
+    rollups = RewardDailyRollup.objects.all()
+    if nft_type is not None:
+        rollups = rollups.filter(nft_type=nft_type)
+    if by_nft_type:
+        return {row['nft_type']: row for row in rollups.values('nft_type').annotate(**aggregates).order_by()}
+    return rollups.aggregate(**aggregates)
+
+
+def percentage_change(current, previous):
+    if previous is None or previous == 0:
+        return 100.0 if current and current > 0 else 0.0
+    if current is None:
+        return -100.0
+    return round(((float(current) - float(previous)) / float(previous)) * 100, 2)
+
+
+def period_comparison(row):
+    """
+    Response fragment for one set of period aggregates
+
+    Args:
+        row: Row of query_period_totals(), empty when nothing matched
+
+    Returns:
+        Dict with current_period, previous_period and percentage_change
+    """
+    current = {
+        "total_distributed": row.get('current_distributed') or Decimal('0'),
+        "total_distributions": row.get('current_distributions') or 0,
+        "total_wallets_rewarded": row.get('current_wallets') or 0
+    }
+    previous = {
+        "total_distributed": row.get('previous_distributed') or Decimal('0'),
+        "total_distributions": row.get('previous_distributions') or 0,
+        "total_wallets_rewarded": row.get('previous_wallets') or 0
+    }
+    return {
+        "current_period": current,
+        "previous_period": previous,
+        "percentage_change": {
+            key: percentage_change(current[key], previous[key]) for key in current
+        }
+    }
+
+
+def all_time_totals(row):
+    """Response fragment for a row of query_all_time_totals(), empty when nothing matched"""
+    return {
+        "total_distributed": row.get('total_distributed') or 0,
+        "total_distributions": row.get('total_distributions') or 0,
+        "total_wallets_rewarded": row.get('total_wallets') or 0
+    }
+
+
+def wallet_rewards_by_nft_type(wallet_address, reward_period=None, nft_type=None):
+    """
+    A wallet's pending rewards grouped per distribution transaction, in one query
+
+    Rows are grouped by (nft_type, transaction_hash) in the database. A
+    transaction counts as sent only when every reward row in it was sent.
+
+    Args:
+        wallet_address: Wallet to look up
+        reward_period: Only include distributions in its current window (default: all time)
+        nft_type: Only include this NFT type (default: all)
+
+    Returns:
+        Dict mapping nft_type to its wallet_rewards entries, newest distribution first
+    """
+    rewards = PendingReward.objects.filter(wallet_address=wallet_address)
+    if nft_type is not None:
+        rewards = rewards.filter(nft_type=nft_type)
+    if reward_period is not None:
+        rewards = rewards.filter(
+            distribution__distributed_at__gte=reward_period.start_date,
+            distribution__distributed_at__lte=reward_period.end_date
+        )
+    rows = rewards.values('nft_type', 'distribution__transaction_hash').annotate(
+        distributed_at=Max('distribution__distributed_at'),
+        per_wallet_amount=Max('distribution__per_wallet_amount'),
+        block_number=Max('distribution__block_number'),
+        user_reward=Sum('dit_amount'),
+        unsent=Count('pk', filter=Q(is_sent=False))
+    ).order_by('-distributed_at', 'distribution__transaction_hash')
+
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row['nft_type'], []).append({
+            'transaction_hash': row['distribution__transaction_hash'],
+            'distributed_at': row['distributed_at'],
+            'per_wallet_amount': row['per_wallet_amount'],
+            'user_reward': row['user_reward'],
+            'is_sent': row['unsent'] == 0,
+            'block_number': row['block_number']
+        })
+    return grouped
+
+
+def add_wallet_rewards(data, wallet_rewards):
+    """Set wallet_rewards and total_user_rewards on a response fragment"""
+    data['wallet_rewards'] = wallet_rewards
+    data['total_user_rewards'] = sum(reward['user_reward'] for reward in wallet_rewards)
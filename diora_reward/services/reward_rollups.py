@@ -0,0 +1,89 @@
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate
+from ..models import RewardDailyRollup, RewardDistribution
+from .response_cache import bump_rewards_data_version
+
+# Rollup rows written per INSERT statement
+ROLLUP_BATCH_SIZE = 1000
+
+
+def day_start(day):
+    """Midnight UTC at the start of a day"""
+    return datetime.combine(day, dt_time.min, tzinfo=dt_timezone.utc)
+
+
+def utc_day(moment):
+    """UTC day of an aware datetime"""
+    return moment.astimezone(dt_timezone.utc).date()
+
+
+def refresh_reward_rollups(first_day, last_day):
+    """
+    Recompute the rollup rows of the UTC days [first_day, last_day] from RewardDistribution
+
+    Whole days are recomputed instead of adding deltas, so the rollups stay
+    exact for inserts that skip duplicates, updates and deletes alike. Call
+    it inside the transaction that changed the distributions. Also bumps the
+    rewards data version, which invalidates the cached analytics responses.
+
+    The version bump runs first: its UPDATE locks the RewardsDataVersion row
+    until commit, so concurrent refreshes run one after another and each
+    aggregates only after the previous one has committed, instead of both
+    aggregating the same snapshot and the last writer dropping the other's
+    distributions.
+
+    Returns:
+        Number of rollup rows written
+    """
+    with transaction.atomic():
+        bump_rewards_data_version()
+        rollups = _aggregate_rollups(first_day, last_day)
+        RewardDailyRollup.objects.filter(day__gte=first_day, day__lte=last_day).delete()
+        RewardDailyRollup.objects.bulk_create(rollups, batch_size=ROLLUP_BATCH_SIZE)
+    return len(rollups)
+
+
+def _aggregate_rollups(first_day, last_day):
+    """Unsaved rollup rows of the UTC days [first_day, last_day]"""
+    rows = (
+        RewardDistribution.objects
+        .filter(distributed_at__gte=day_start(first_day), distributed_at__lt=day_start(last_day + timedelta(days=1)))
+        .annotate(day=TruncDate('distributed_at', tzinfo=dt_timezone.utc))
+        .values('day', 'nft_type')
+        .annotate(total=Sum('total_amount'), wallets=Sum('wallet_count'), distributions=Count('pk'))
+        .order_by()
+    )
+    return [
+        RewardDailyRollup(
+            day=row['day'],
+            nft_type=row['nft_type'],
+            total_amount=row['total'],
+            wallet_count=row['wallets'],
+            distribution_count=row['distributions']
+        )
+        for row in rows
+    ]
+
+
+def refresh_reward_rollups_for(distributed_at_values):
+    """
+    Recompute the rollups of every day between the earliest and latest of some timestamps
+
+    Args:
+        distributed_at_values: distributed_at of the distributions that were written or deleted
+
+    Returns:
+        Number of rollup rows written
+    """
+    values = [value for value in distributed_at_values if value is not None]
+    if not values:
+        return 0
+    return refresh_reward_rollups(utc_day(min(values)), utc_day(max(values)))
+
+
+def distribution_time_range(queryset):
+    """Earliest and latest distributed_at of a RewardDistribution queryset, e.g. before deleting it"""
+    bounds = queryset.aggregate(first=Min('distributed_at'), last=Max('distributed_at'))
+    return [bounds['first'], bounds['last']]
@@ -0,0 +1,245 @@
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+from .rate_governor import RateGovernor, RPCThrottledError, is_throttle_error, is_throttle_response, retry_after_seconds
+import logging
+import requests
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds an endpoint is skipped after a failure, doubled per consecutive failure
+FAILURE_COOLDOWN = 15.0
+MAX_FAILURE_COOLDOWN = 300.0
+
+# How much a 100% error rate multiplies an endpoint's latency score
+ERROR_RATE_PENALTY = 10.0
+
+# Weight of the newest sample in the rolling latency and error rate
+HEALTH_SMOOTHING = 0.2
+
+# Rounds over all endpoints before a call that keeps being throttled gives up
+MAX_THROTTLE_ROUNDS = 5
+
+# Keep-alive connections kept open per endpoint, enough for parallel log fetchers and multicall workers
+HTTP_POOL_SIZE = 32
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class EndpointHealth:
+    """
+    Rolling latency and error rate of one RPC endpoint
+    """
+
+    def __init__(self, url, timeout):
+        self.url = url
+        # One session shared by every thread, so connections and TLS sessions are
+        # reused across requests instead of opened per thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Retries are disabled per endpoint, a failing call moves on to the next one instead
+        self.provider = Web3.HTTPProvider(
+            url,
+            request_kwargs={'timeout': timeout},
+            session=self.session,
+            exception_retry_configuration=None
+        )
+        self.governor = RateGovernor()
+        self.requests = 0
+        self.errors = 0
+        self.latency = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def is_cooling_down(self, now):
+        return now < self.cooldown_until
+
+    def score(self):
+        """Lower is healthier. Endpoints without samples score 0 so they get tried."""
+        return (self.latency or 0.0) * (1 + self.error_rate * ERROR_RATE_PENALTY)
+
+    def record_success(self, elapsed):
+        self.requests += 1
+        self.latency = elapsed if self.latency is None else (
+            HEALTH_SMOOTHING * elapsed + (1 - HEALTH_SMOOTHING) * self.latency
+        )
+        self.error_rate = (1 - HEALTH_SMOOTHING) * self.error_rate
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def record_failure(self, now):
+        self.requests += 1
+        self.errors += 1
+        self.error_rate = HEALTH_SMOOTHING + (1 - HEALTH_SMOOTHING) * self.error_rate
+        self.consecutive_failures += 1
+        self.cooldown_until = now + min(
+            FAILURE_COOLDOWN * 2 ** (self.consecutive_failures - 1),
+            MAX_FAILURE_COOLDOWN
+        )
+
+    def as_dict(self, now):
+        return {
+            'url': self.url,
+            'requests': self.requests,
+            'errors': self.errors,
+            'error_rate': round(self.error_rate, 3),
+            'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+            'cooling_down': self.is_cooling_down(now),
+            **self.governor.stats(),
+        }
+
+
+class RPCPool(JSONBaseProvider):
+    """
+    Web3 provider that spreads JSON-RPC calls over several HTTP endpoints
+
+    Each call goes to the healthiest endpoint (lowest latency weighted by
+    error rate). Transport failures such as timeouts, connection errors and
+    HTTP 5xx put the endpoint on a cooldown and the call fails over to
+    the next one. JSON-RPC error responses (e.g. "too many results") come
+    from a working endpoint and are returned to the caller unchanged.
+
+    Every call also passes through the endpoint's RateGovernor. Rate-limit
+    responses (HTTP 429 or a JSON-RPC rate-limit error) lower that endpoint's
+    limits and the call is retried on the next endpoint, or on the same one
+    once its pause is over, instead of failing the sync.
+    """
+
+    def __init__(self, endpoint_urls, timeout=30):
+        super().__init__()
+        if not endpoint_urls:
+            raise ValueError("RPCPool needs at least one endpoint URL")
+        self.endpoints = [EndpointHealth(url, timeout) for url in endpoint_urls]
+        self._lock = threading.Lock()
+        self._observers = []
+
+    def __str__(self):
+        return f"RPC pool of {len(self.endpoints)} endpoints"
+
+    def add_observer(self, observer):
+        """
+        Call observer(method, elapsed_seconds, failed) after every call to an endpoint
+
+        Batches report as 'batch:<methods>'. Observers run on the calling
+        thread and must be thread-safe.
+        """
+        with self._lock:
+            self._observers = self._observers + [observer]
+
+    def remove_observer(self, observer):
+        with self._lock:
+            self._observers = [current for current in self._observers if current is not observer]
+
+    def _notify(self, method, elapsed, failed):
+        for observer in self._observers:
+            observer(method, elapsed, failed)
+
+    def _ranked_endpoints(self):
+        """Endpoints ordered by health, cooling-down and throttled ones last"""
+        now = time.monotonic()
+        with self._lock:
+            return sorted(
+                self.endpoints,
+                key=lambda endpoint: (
+                    endpoint.is_cooling_down(now),
+                    endpoint.governor.is_paused(now),
+                    endpoint.score()
+                )
+            )
+
+    def _send(self, description, send, method):
+        last_error = None
+        throttled_response = None
+        for _ in range(MAX_THROTTLE_ROUNDS):
+            throttled = False
+            for endpoint in self._ranked_endpoints():
+                endpoint.governor.acquire()
+                started = time.monotonic()
+                try:
+                    response = send(endpoint.provider)
+                except Exception as e:
+                    self._notify(method, time.monotonic() - started, True)
+                    if is_throttle_error(e):
+                        endpoint.governor.release(throttled=True, retry_after=retry_after_seconds(e))
+                        logger.warning(f"RPC endpoint {endpoint.url} throttled {description} (HTTP 429)")
+                        throttled = True
+                    else:
+                        endpoint.governor.release(success=False)
+                        with self._lock:
+                            endpoint.record_failure(time.monotonic())
+                        logger.warning(f"RPC endpoint {endpoint.url} failed on {description}, failing over: {str(e)}")
+                    last_error = e
+                    continue
+
+                elapsed = time.monotonic() - started
+                if is_throttle_response(response):
+                    self._notify(method, elapsed, True)
+                    endpoint.governor.release(throttled=True)
+                    logger.warning(f"RPC endpoint {endpoint.url} throttled {description}")
+                    throttled = True
+                    throttled_response = response
+                    continue
+
+                self._notify(method, elapsed, 'error' in response if isinstance(response, dict) else False)
+                endpoint.governor.release()
+                with self._lock:
+                    endpoint.record_success(elapsed)
+                return response
+            if not throttled:
+                break
+
+        # A dedicated error, so callers (e.g. the block window chunker) never mistake
+        # throttling for a rejected request; the governors have already backed off
+        if throttled:
+            raise RPCThrottledError(
+                f"All RPC endpoints throttled {description}: {str(throttled_response or last_error)[:200]}"
+            ) from last_error
+        raise last_error
+
+    def make_request(self, method, params):
+        return self._send(method, lambda provider: provider.make_request(method, params), method)
+
+    def make_batch_request(self, batch_requests):
+        return self._send(
+            f"batch of {len(batch_requests)}",
+            lambda provider: provider.make_batch_request(batch_requests),
+            'batch:' + '+'.join(sorted({method for method, _ in batch_requests}))
+        )
+
+    def probe(self):
+        """Send eth_blockNumber to every endpoint once to refresh its health"""
+        for endpoint in self.endpoints:
+            started = time.monotonic()
+            try:
+                endpoint.provider.make_request('eth_blockNumber', [])
+            except Exception as e:
+                with self._lock:
+                    endpoint.record_failure(time.monotonic())
+                logger.warning(f"RPC endpoint {endpoint.url} failed the probe: {str(e)}")
+                continue
+            with self._lock:
+                endpoint.record_success(time.monotonic() - started)
+
+    def stats(self):
+        """Per-endpoint request counts, error rate and latency, healthiest first"""
+        now = time.monotonic()
+        return [endpoint.as_dict(now) for endpoint in self._ranked_endpoints()]
+
+
+def get_rpc_pool(endpoint_urls):
+    """
+    Process-wide pool for a list of endpoints
+
+    Pools are shared so health learned by one request or sync run is used by the next.
+    """
+    key = tuple(endpoint_urls)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = RPCPool(list(key))
+        return _pools[key]
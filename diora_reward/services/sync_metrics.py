@@ -0,0 +1,306 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from django.db import DatabaseError
+from django.db.models import Max
+from django.utils import timezone
+from ..models import SyncRun, SyncCheckpoint
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# SyncRun rows kept per command, older ones are deleted when a run finishes
+SYNC_RUN_RETENTION = 1000
+
+# Prometheus quantile label of each percentile stored by percentiles()
+QUANTILES = [('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms'), ('1', 'max_ms')]
+
+
+def percentiles(samples):
+    """p50/p95/p99/max and the sum of a list of seconds, in milliseconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2)
+
+    return {
+        'p50_ms': at(0.50),
+        'p95_ms': at(0.95),
+        'p99_ms': at(0.99),
+        'max_ms': round(ordered[-1] * 1000, 2),
+        'sum_ms': round(sum(ordered) * 1000, 2),
+    }
+
+
+class SyncMetrics:
+    """
+    Counters and timings of one sync run
+
+    RPC calls are reported by the RPC pool, possibly from log fetcher threads,
+    so every update takes the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.from_block = None
+        self.to_block = None
+        self.head_block = None
+        self.synced_to = None
+        self.chunks = 0
+        self.blocks_scanned = 0
+        self.logs_fetched = 0
+        self.events_inserted = 0
+        self.events_skipped = 0
+        self.db_write_seconds = []
+        self.rpc_latencies = defaultdict(list)
+        self.rpc_errors = defaultdict(int)
+
+    def observe_rpc(self, method, elapsed, failed):
+        """RPCPool observer: one call to one endpoint"""
+        with self._lock:
+            self.rpc_latencies[method].append(elapsed)
+            if failed:
+                self.rpc_errors[method] += 1
+
+    def record_range(self, from_block, to_block, head_block):
+        with self._lock:
+            self.from_block = from_block if self.from_block is None else min(self.from_block, from_block)
+            self.to_block = to_block if self.to_block is None else max(self.to_block, to_block)
+            self.head_block = head_block
+
+    def record_chunk(self, chunk_start, chunk_end, logs, inserted, skipped, db_seconds):
+        with self._lock:
+            self.chunks += 1
+            self.blocks_scanned += chunk_end - chunk_start + 1
+            self.logs_fetched += logs
+            self.events_inserted += inserted
+            self.events_skipped += skipped
+            self.db_write_seconds.append(db_seconds)
+            self.synced_to = chunk_end if self.synced_to is None else max(self.synced_to, chunk_end)
+
+    def rpc_stats(self):
+        with self._lock:
+            return {
+                method: {'calls': len(latencies), 'errors': self.rpc_errors[method], **percentiles(latencies)}
+                for method, latencies in sorted(self.rpc_latencies.items())
+            }
+
+    def lag_blocks(self):
+        if self.head_block is None:
+            return None
+        synced_to = self.synced_to if self.synced_to is not None else self.to_block
+        return max(0, self.head_block - synced_to) if synced_to is not None else None
+
+    def apply_to(self, run):
+        """Copy the collected numbers onto a SyncRun row"""
+        rpc_stats = self.rpc_stats()
+        with self._lock:
+            run.from_block = self.from_block
+            run.to_block = self.to_block
+            run.head_block = self.head_block
+            run.lag_blocks = self.lag_blocks()
+            run.chunks = self.chunks
+            run.blocks_scanned = self.blocks_scanned
+            run.logs_fetched = self.logs_fetched
+            run.events_inserted = self.events_inserted
+            run.events_skipped = self.events_skipped
+            run.rpc_calls = sum(stats['calls'] for stats in rpc_stats.values())
+            run.rpc_stats = rpc_stats
+            run.db_write_stats = {'chunks': len(self.db_write_seconds), **percentiles(self.db_write_seconds)}
+
+
+@contextmanager
+def track_sync_run(service, command):
+    """
+    Collect metrics of the sync calls made inside the block and store them as a SyncRun
+
+    Args:
+        service: DITRewardsBlockchainService doing the sync
+        command: Name recorded on the run (e.g. 'run_sync_daemon')
+
+    Yields:
+        The SyncMetrics being collected
+    """
+    metrics = SyncMetrics()
+    run = SyncRun.objects.create(command=command)
+    previous_metrics = service.metrics
+    service.metrics = metrics
+    service.rpc_pool.add_observer(metrics.observe_rpc)
+    try:
+        yield metrics
+        run.status = 'succeeded'
+    except Exception as e:
+        run.status = 'failed'
+        run.error = str(e)[:2000]
+        raise
+    finally:
+        service.rpc_pool.remove_observer(metrics.observe_rpc)
+        service.metrics = previous_metrics
+        metrics.apply_to(run)
+        run.finished_at = timezone.now()
+        try:
+            run.save()
+            stale = SyncRun.objects.filter(command=command).values_list('pk', flat=True)[SYNC_RUN_RETENTION:]
+            SyncRun.objects.filter(pk__in=list(stale)).delete()
+        except DatabaseError as e:
+            # Metrics must never hide the sync's own result
+            logger.warning(f"Could not store sync run metrics: {str(e)}")
+
+
+def run_summary(run):
+    """A SyncRun as a plain dict, with throughput derived from its duration"""
+    duration = (run.finished_at - run.started_at).total_seconds() if run.finished_at else None
+    return {
+        'command': run.command,
+        'status': run.status,
+        'error': run.error,
+        'started_at': run.started_at,
+        'finished_at': run.finished_at,
+        'duration_seconds': round(duration, 3) if duration is not None else None,
+        'from_block': run.from_block,
+        'to_block': run.to_block,
+        'head_block': run.head_block,
+        'lag_blocks': run.lag_blocks,
+        'chunks': run.chunks,
+        'blocks_scanned': run.blocks_scanned,
+        'logs_fetched': run.logs_fetched,
+        'events_inserted': run.events_inserted,
+        'events_skipped': run.events_skipped,
+        'blocks_per_second': round(run.blocks_scanned / duration, 1) if duration else None,
+        'events_per_second': round(run.logs_fetched / duration, 1) if duration else None,
+        'rpc_calls': run.rpc_calls,
+        'rpc_calls_per_event': round(run.rpc_calls / run.logs_fetched, 3) if run.logs_fetched else None,
+        'rpc': run.rpc_stats,
+        'db_write': run.db_write_stats,
+    }
+
+
+def sync_status(recent=10):
+    """
+    Current sync position and metrics of recent runs, read from the database only
+
+    Lag is measured from the chain head seen by the latest finished run to
+    the lowest synced block of all event streams, so it needs no RPC call.
+    """
+    checkpoints = list(
+        SyncCheckpoint.objects.annotate(synced_to=Max('ranges__to_block'))
+        .values('contract_address', 'event_type', 'synced_to', 'chunk_size')
+        .order_by('contract_address', 'event_type')
+    )
+    runs = list(SyncRun.objects.all()[:recent])
+    latest = next((run for run in runs if run.finished_at and run.head_block is not None), None)
+
+    synced_to = [checkpoint['synced_to'] for checkpoint in checkpoints if checkpoint['synced_to'] is not None]
+    head_block = latest.head_block if latest else None
+    lag_blocks = max(0, head_block - min(synced_to)) if head_block is not None and synced_to else None
+    return {
+        'head_block': head_block,
+        'head_seen_at': latest.finished_at if latest else None,
+        'lag_blocks': lag_blocks,
+        'checkpoints': checkpoints,
+        'last_run': run_summary(runs[0]) if runs else None,
+        'recent_runs': [run_summary(run) for run in runs],
+    }
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text(status):
+    """
+    Render sync_status() in the Prometheus text exposition format (version 0.0.4)
+
+    Run metrics are gauges of the latest run per command, not counters: old
+    runs are pruned, so totals over stored rows would not be monotonic.
+    RPC and DB write latencies of that run are summaries (quantiles, _sum and
+    _count). Response cache hits and misses, if status has them, are counters.
+    """
+    lines = []
+
+    def metric(name, help_text, samples, metric_type='gauge'):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for labels, value in samples:
+            if value is None:
+                continue
+            label_text = ','.join(f'{key}="{_label(label)}"' for key, label in labels.items())
+            lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+    def summary(name, help_text, series):
+        """series: (labels, stats from percentiles(), observation count) tuples"""
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} summary')
+        for labels, stats, count in series:
+            samples = [
+                (name, {**labels, 'quantile': quantile}, round(stats[key] / 1000, 6))
+                for quantile, key in QUANTILES if key in stats
+            ]
+            if 'sum_ms' in stats:
+                # Runs stored before sums were recorded only have the quantiles
+                samples.append((f'{name}_sum', labels, round(stats['sum_ms'] / 1000, 6)))
+            samples.append((f'{name}_count', labels, count))
+            for sample_name, sample_labels, value in samples:
+                label_text = ','.join(f'{key}="{_label(label)}"' for key, label in sample_labels.items())
+                lines.append(f'{sample_name}{{{label_text}}} {value}')
+
+    metric('diora_sync_head_block', 'Chain head seen by the latest sync run', [({}, status['head_block'])])
+    metric('diora_sync_lag_blocks', 'Blocks between the chain head and the lowest synced block', [({}, status['lag_blocks'])])
+    metric('diora_sync_synced_block', 'Highest scanned block per event stream', [
+        ({'event_type': checkpoint['event_type']}, checkpoint['synced_to']) for checkpoint in status['checkpoints']
+    ])
+    metric('diora_sync_chunk_size_blocks', 'Learned eth_getLogs window per event stream', [
+        ({'event_type': checkpoint['event_type']}, checkpoint['chunk_size']) for checkpoint in status['checkpoints']
+    ])
+
+    latest_runs = {}
+    for run in status['recent_runs']:
+        if run['finished_at'] is not None:
+            latest_runs.setdefault(run['command'], run)
+    for field, help_text in [
+        ('duration_seconds', 'Duration of the latest run'),
+        ('blocks_scanned', 'Blocks scanned by the latest run'),
+        ('logs_fetched', 'Logs fetched by the latest run'),
+        ('events_inserted', 'Events inserted by the latest run'),
+        ('events_skipped', 'Already stored events skipped by the latest run'),
+        ('rpc_calls', 'RPC calls made by the latest run'),
+        ('lag_blocks', 'Blocks behind the head at the end of the latest run'),
+    ]:
+        metric(f'diora_sync_run_{field}', help_text, [
+            ({'command': command}, run[field]) for command, run in latest_runs.items()
+        ])
+    metric('diora_sync_run_success', 'Whether the latest run succeeded', [
+        ({'command': command}, int(run['status'] == 'succeeded')) for command, run in latest_runs.items()
+    ])
+    metric('diora_sync_run_finished_timestamp_seconds', 'When the latest run finished', [
+        ({'command': command}, run['finished_at'].timestamp()) for command, run in latest_runs.items()
+    ])
+    metric('diora_sync_rpc_calls', 'RPC calls per method in the latest run', [
+        ({'command': command, 'method': method}, stats['calls'])
+        for command, run in latest_runs.items() for method, stats in run['rpc'].items()
+    ])
+    metric('diora_sync_rpc_errors', 'Failed or throttled RPC calls per method in the latest run', [
+        ({'command': command, 'method': method}, stats['errors'])
+        for command, run in latest_runs.items() for method, stats in run['rpc'].items()
+    ])
+    summary('diora_sync_rpc_latency_seconds', 'RPC latency per method in the latest run', [
+        ({'command': command, 'method': method}, stats, stats['calls'])
+        for command, run in latest_runs.items() for method, stats in run['rpc'].items()
+    ])
+    summary('diora_sync_db_write_seconds', 'Per chunk DB write time in the latest run', [
+        ({'command': command}, run['db_write'], run['db_write'].get('chunks', 0))
+        for command, run in latest_runs.items() if run['db_write']
+    ])
+
+    response_cache = status.get('response_cache')
+    if response_cache:
+        metric('diora_response_cache_data_version', 'Rewards data version analytics responses are cached under', [
+            ({}, response_cache['data_version'])
+        ])
+        for outcome in ('hits', 'misses'):
+            metric(f'diora_response_cache_{outcome}_total', f'Analytics response cache {outcome} per endpoint', [
+                ({'endpoint': endpoint}, stats[outcome]) for endpoint, stats in response_cache['endpoints'].items()
+            ], metric_type='counter')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,58 @@
+from web3 import Web3
+from .rpc_pool import get_rpc_pool
+import threading
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class Web3Client:
+    """
+    Web3 instance over a shared RPC pool, with contract objects built once
+
+    Construction sends no requests: there is no is_connected() probe, an
+    unreachable network surfaces as an error on the first real call instead.
+    Safe to share across threads; the pool keeps keep-alive HTTP sessions per
+    endpoint and contracts are only read after they have been created.
+    """
+
+    def __init__(self, endpoint_urls):
+        self.endpoint_urls = list(endpoint_urls)
+        self.rpc_pool = get_rpc_pool(self.endpoint_urls)
+        self.w3 = Web3(self.rpc_pool)
+        # The validation middleware sends eth_chainId before every eth_call,
+        # doubling the round trips of read-only calls; nothing here signs transactions
+        self.w3.middleware_onion.remove('validation')
+        self._contracts = {}
+        self._lock = threading.Lock()
+
+    def contract(self, address, abi):
+        """
+        Contract object for an address, parsed from the ABI on first use
+
+        The ABI is only read the first time an address is requested, so each
+        address should always be used with the same ABI.
+        """
+        address = Web3.to_checksum_address(address)
+        contract = self._contracts.get(address)
+        if contract is None:
+            with self._lock:
+                contract = self._contracts.get(address)
+                if contract is None:
+                    contract = self.w3.eth.contract(address=address, abi=abi)
+                    self._contracts[address] = contract
+        return contract
+
+
+def get_web3_client(endpoint_urls):
+    """
+    Process-wide client for a list of endpoints
+
+    Reusing the client keeps HTTP connections and parsed contracts alive
+    between requests, sync runs and service instances.
+    """
+    key = tuple(endpoint_urls)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = Web3Client(key)
+        return _clients[key]
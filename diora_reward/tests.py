@@ -1,3 +1,695 @@
-from django.test import TestCase
+from base64 import urlsafe_b64encode
+from datetime import timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+import threading
+import time
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from .management.commands import run_sync_daemon
+from .models import (
+    NFTType, PendingReward, RawEventLog, RewardDailyRollup, RewardDistribution, SyncedBlockRange, SyncEventType,
+    SyncRun, UserRewardClaim
+)
+from .services.blockchain_service import CLAIMED_TOPIC, DISTRIBUTED_TOPIC, DITRewardsBlockchainService
+from .services.checkpoints import CheckpointStore
+from .services.chunking import AdaptiveBlockChunker, ParallelChunkFetcher, RPCResponseError, is_range_too_large_error
+from .services.rate_governor import RPCThrottledError
+from .services.digests import bucket_bounds
+from .services.fake_chain import FakeChain, FakeChainServer, FakeChainWebSocketServer
+from .services.log_subscription import LogSubscription
+from .services.multicall import MAX_CALLDATA_BYTES
+from .services.rpc_pool import RPCPool
+from .services.response_cache import response_cache_stats, rewards_data_version
+from .services.reward_rollups import refresh_reward_rollups_for
+from .services.sync_metrics import SyncMetrics, prometheus_text, sync_status
 
-# Create your tests here.
+
+class BlockChunkerTests(SimpleTestCase):
+    """Window adaptation of the eth_getLogs chunkers"""
+
+    @staticmethod
+    def too_many_results(from_block, to_block):
+        return RPCResponseError(
+            f"eth_getLogs {from_block}-{to_block}",
+            {'code': -32005, 'message': 'query returned more than 10000 results'}
+        )
+
+    def test_block_numbers_containing_429_are_not_throttling(self):
+        self.assertTrue(is_range_too_large_error(self.too_many_results(7429000, 7438999)))
+        self.assertTrue(is_range_too_large_error(self.too_many_results(7000000, 7009999)))
+        self.assertFalse(is_range_too_large_error(
+            RPCResponseError("eth_getLogs 7429000-7438999", {'code': -32005, 'message': 'rate limit exceeded'})
+        ))
+        self.assertFalse(is_range_too_large_error(RPCThrottledError("All RPC endpoints throttled eth_getLogs")))
+
+    def test_oversized_window_is_halved(self):
+        fetched = []
+
+        def fetch(chunk_start, chunk_end):
+            if chunk_end - chunk_start + 1 > 5000:
+                raise self.too_many_results(chunk_start, chunk_end)
+            fetched.append((chunk_start, chunk_end))
+            return []
+
+        chunker = AdaptiveBlockChunker(initial_size=10000)
+        chunks = [(start, end) for start, end, _ in chunker.iter_chunks(7429000, 7438999, fetch)]
+        self.assertEqual(chunks, fetched)
+        self.assertEqual(chunks[0], (7429000, 7433999))
+        self.assertEqual(chunks[-1][1], 7438999)
+
+        fetcher = ParallelChunkFetcher(window=10000, workers=2)
+        with mock.patch('builtins.print'):
+            chunks = [(start, end) for start, end, _ in fetcher.iter_chunks(7429000, 7438999, fetch)]
+        self.assertEqual(chunks, [(7429000, 7438999)])
+
+    def test_throttling_is_raised_without_shrinking(self):
+        def fetch(chunk_start, chunk_end):
+            raise RPCThrottledError(f"All RPC endpoints throttled eth_getLogs {chunk_start}-{chunk_end}")
+
+        chunker = AdaptiveBlockChunker(initial_size=10000)
+        with self.assertRaises(RPCThrottledError):
+            list(chunker.iter_chunks(7429000, 7438999, fetch))
+        self.assertEqual(chunker.size, 10000)
+
+        fetch = mock.Mock(side_effect=RPCResponseError("eth_getLogs", {'code': 429, 'message': 'Too Many Requests'}))
+        with self.assertRaises(RPCResponseError):
+            ParallelChunkFetcher(window=10000, workers=1)._fetch_split(7429000, 7438999, fetch)
+        self.assertEqual(fetch.call_count, 1)
+
+
+class RPCPoolTests(SimpleTestCase):
+    """Failover and rate governors of the RPC pool"""
+
+    def test_transport_failure_does_not_raise_the_limits(self):
+        chain = FakeChain(events=10)
+        with FakeChainServer(chain) as server:
+            # Nothing listens on port 1, so the first endpoint refuses the connection
+            pool = RPCPool(['http://127.0.0.1:1', server.url], timeout=2)
+            failing, working = pool.endpoints
+            limits = (failing.governor.rate, failing.governor.concurrency)
+            with self.assertLogs('diora_reward.services.rpc_pool', 'WARNING'):
+                response = pool.make_request('eth_blockNumber', [])
+
+        self.assertEqual(int(response['result'], 16), chain.head)
+        self.assertEqual(failing.errors, 1)
+        self.assertEqual((failing.governor.rate, failing.governor.concurrency), limits)
+        self.assertEqual(failing.governor.in_flight, 0)
+        self.assertGreater(working.governor.rate, limits[0])
+        self.assertEqual(working.governor.in_flight, 0)
+
+
+class RewardsBatchTests(SimpleTestCase):
+    """get_rewards_batch() against the local fake JSON-RPC chain"""
+
+    WALLETS = 10000
+
+    def setUp(self):
+        self.chain = FakeChain(events=2000, wallets=self.WALLETS)
+        self.server = FakeChainServer(self.chain).start()
+        self.addCleanup(self.server.stop)
+        settings_override = override_settings(
+            BLOCKCHAIN_RPC_URLS=[self.server.url],
+            DIT_REWARDS_CONTRACT_ADDRESS=self.chain.contract_address
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.service = DITRewardsBlockchainService()
+
+    def test_reads_ten_thousand_wallets_in_a_handful_of_calls(self):
+        wallets = [FakeChain.wallet_address(index) for index in range(self.WALLETS)]
+        nft_type_indexes = list(DITRewardsBlockchainService.NFT_TYPE_MAP)
+
+        with mock.patch.object(self.service.w3.eth, 'call', wraps=self.service.w3.eth.call) as eth_call:
+            results = self.service.get_rewards_batch(wallets, nft_type_indexes)
+
+        # 20,006 reads of 224 encoded bytes each, split at 256 KiB of calldata
+        self.assertGreater(self.chain.calls['eth_call'], 1)
+        self.assertLessEqual(self.chain.calls['eth_call'], 20)
+        self.assertEqual(eth_call.call_count, self.chain.calls['eth_call'])
+        for call in eth_call.call_args_list:
+            # Selector, array offset and length precede the encoded entries
+            self.assertLessEqual(len(call.args[0]['data']) - 4 - 64, MAX_CALLDATA_BYTES)
+
+        self.assertEqual(len(results['pending']), self.WALLETS)
+        self.assertEqual(len(results['claimed']), self.WALLETS)
+        for wallet in wallets:
+            self.assertEqual(results['pending'][wallet], self.service.wei_to_dit(self.chain.pending_rewards(wallet)))
+            self.assertEqual(results['claimed'][wallet], self.service.wei_to_dit(self.chain.claimed_rewards(wallet)))
+        for nft_type_index in nft_type_indexes:
+            self.assertEqual(
+                results['nft_types'][nft_type_index],
+                self.service.wei_to_dit(self.chain.total_rewards_by_nft_type(nft_type_index))
+            )
+        self.assertTrue(any(value > Decimal('0') for value in results['pending'].values()))
+        self.assertTrue(any(value > Decimal('0') for value in results['claimed'].values()))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class RewardAnalyticsQueryCountTests(TestCase):
+    """
+    Query counts of the analytics endpoints, with the response cache out of the way
+
+    All-time totals are one grouped query over the daily rollups. A period
+    adds one filtered aggregate over the raw distributions of the partial
+    days at the window edges. wallet_address adds one grouped query.
+    """
+
+    WALLET = '0x' + 'ab' * 20
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        nft_types = [choice for choice, _ in NFTType.choices]
+        distributed_at_values = []
+        for index, days_ago in enumerate([1, 3, 10, 20, 40]):
+            for log_index, nft_type in enumerate(nft_types[:3]):
+                distributed_at = now - timedelta(days=days_ago, hours=log_index)
+                distribution = RewardDistribution.objects.create(
+                    nft_type=nft_type,
+                    total_amount=Decimal('300') * (index + 1),
+                    per_wallet_amount=Decimal('100') * (index + 1),
+                    wallet_count=3,
+                    transaction_hash='0x' + f'{index:064x}',
+                    log_index=log_index,
+                    block_number=1000 + index,
+                    distributed_at=distributed_at
+                )
+                PendingReward.objects.create(
+                    wallet_address=cls.WALLET,
+                    nft_type=nft_type,
+                    dit_amount=distribution.per_wallet_amount,
+                    distribution=distribution,
+                    is_sent=index % 2 == 0
+                )
+                distributed_at_values.append(distributed_at)
+        refresh_reward_rollups_for(distributed_at_values)
+
+    def setUp(self):
+        self.client = APIClient()
+        # The data version lookup belongs to the response cache, not to the analytics queries
+        version = mock.patch('diora_reward.services.response_cache.rewards_data_version', return_value=0)
+        version.start()
+        self.addCleanup(version.stop)
+
+    def get(self, name, queries, **params):
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def period_params(self):
+        today = timezone.now().date()
+        return [
+            {'period': 'week'},
+            {'period': 'month'},
+            {'period': 'custom', 'start_date': str(today - timedelta(days=15)), 'end_date': str(today)},
+        ]
+
+    @staticmethod
+    def raw_totals(nft_type, start, end):
+        return RewardDistribution.objects.filter(
+            nft_type=nft_type, distributed_at__gte=start, distributed_at__lte=end
+        ).aggregate(total=Sum('total_amount'), distributions=Count('pk'))
+
+    def test_all_nft_types_all_time(self):
+        data = self.get('all-nft-types-rewards', 1)
+        self.assertEqual(data['nft_types']['RED']['total_distributions'], 5)
+        self.assertEqual(data['nft_types']['RED']['total_distributed'], Decimal('4500'))
+        self.assertEqual(data['nft_types']['DRAGON']['total_distributions'], 0)
+
+        data = self.get('all-nft-types-rewards', 2, wallet_address=self.WALLET)
+        self.assertEqual(len(data['nft_types']['RED']['wallet_rewards']), 5)
+        self.assertEqual(data['nft_types']['RED']['total_user_rewards'], Decimal('1500'))
+
+    def test_all_nft_types_periods(self):
+        for params in self.period_params():
+            with self.subTest(**params):
+                data = self.get('all-nft-types-rewards', 2, **params)
+                self.assertEqual(set(data['nft_types']), {choice for choice, _ in NFTType.choices})
+                self.get('all-nft-types-rewards', 3, wallet_address=self.WALLET, **params)
+
+    def test_nft_type_all_time(self):
+        data = self.get('nft-type-rewards', 1, nft_type='GREEN')
+        self.assertEqual(data['total_distributions'], 5)
+        self.assertEqual(data['total_distributed'], Decimal('4500'))
+
+        data = self.get('nft-type-rewards', 2, nft_type='GREEN', wallet_address=self.WALLET)
+        self.assertEqual(data['total_user_rewards'], Decimal('1500'))
+
+    def test_nft_type_periods(self):
+        now = timezone.now()
+        for params in self.period_params():
+            with self.subTest(**params):
+                data = self.get('nft-type-rewards', 2, nft_type='BLUE', **params)
+                if params['period'] == 'week':
+                    expected = self.raw_totals('BLUE', now - timedelta(days=7), now)
+                    self.assertEqual(data['current_period']['total_distributions'], expected['distributions'])
+                    self.assertEqual(data['current_period']['total_distributed'], expected['total'])
+                self.get('nft-type-rewards', 3, nft_type='BLUE', wallet_address=self.WALLET, **params)
+
+
+class RewardDistributionPaginationTests(TestCase):
+    """Keyset pages of the grouped distributions list"""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now().replace(microsecond=0)
+        nft_types = [choice for choice, _ in NFTType.choices]
+        # Pairs of transactions share a timestamp, so the transaction hash breaks ties
+        for index in range(12):
+            distributed_at = now - timedelta(minutes=index // 2)
+            for log_index, nft_type in enumerate(nft_types[:index % 3 + 1]):
+                RewardDistribution.objects.create(
+                    nft_type=nft_type,
+                    total_amount=Decimal('30'),
+                    per_wallet_amount=Decimal('10'),
+                    wallet_count=3,
+                    transaction_hash='0x' + f'{(index * 7) % 12:064x}',
+                    log_index=log_index,
+                    block_number=1000 + index,
+                    distributed_at=distributed_at - timedelta(seconds=log_index)
+                )
+        cls.expected = [
+            transaction_hash for transaction_hash, _ in sorted(
+                RewardDistribution.objects.values('transaction_hash').annotate(latest=Max('distributed_at'))
+                .values_list('transaction_hash', 'latest'),
+                key=lambda row: (-row[1].timestamp(), row[0])
+            )
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_first_page(self):
+        data = self.get(reverse('reward-distributions'), {'page_size': 5}).data
+        self.assertEqual([group['transaction_hash'] for group in data['results']], self.expected[:5])
+        self.assertIn('cursor=', data['next'])
+        for group in data['results']:
+            rows = RewardDistribution.objects.filter(transaction_hash=group['transaction_hash'])
+            self.assertEqual(group['total_distributions'], rows.count())
+
+    def test_following_next_lists_every_transaction_once(self):
+        for page_size in (1, 2, 5, 12, 20):
+            with self.subTest(page_size=page_size):
+                listed = []
+                url, params = reverse('reward-distributions'), {'page_size': page_size}
+                while url:
+                    data = self.get(url, params).data
+                    self.assertLessEqual(len(data['results']), page_size)
+                    listed.extend(group['transaction_hash'] for group in data['results'])
+                    url, params = data['next'], None
+                self.assertEqual(listed, self.expected)
+
+    def test_ties_on_distributed_at_are_ordered_by_transaction_hash(self):
+        data = self.get(reverse('reward-distributions'), {'page_size': 1}).data
+        first = data['results'][0]
+        second = self.get(data['next']).data['results'][0]
+        self.assertEqual(first['distributed_at'], second['distributed_at'])
+        self.assertLess(first['transaction_hash'], second['transaction_hash'])
+
+    def test_tampered_cursor_is_rejected(self):
+        naive = urlsafe_b64encode(b'2026-01-15T10:30:00|0xabc').decode()
+        for cursor in ('not-a-cursor', '%%%', 'ü', urlsafe_b64encode(b'\xff\xfe').decode(), naive, 'MjAyNg'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('reward-distributions'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {'error': 'Invalid cursor'})
+
+    def test_deprecated_page_number(self):
+        response = self.get(reverse('reward-distributions'), {'page': 2, 'page_size': 5})
+        self.assertEqual(response['Deprecation'], 'true')
+        self.assertEqual(response.data['count'], len(self.expected))
+        self.assertIsNotNone(response.data['previous'])
+        self.assertEqual([group['transaction_hash'] for group in response.data['results']], self.expected[5:10])
+        self.assertEqual(self.client.get(reverse('reward-distributions'), {'page': 9}).status_code, 404)
+
+
+class ReorgRollbackTests(TestCase):
+    """Re-syncing after the fake chain replaced its tail blocks"""
+
+    CONFIRMATIONS = 100
+    DEPTH = 80
+
+    def setUp(self):
+        self.chain = FakeChain(events=400, blocks_per_event=1, wallets=50)
+        self.server = FakeChainServer(self.chain).start()
+        self.addCleanup(self.server.stop)
+        settings_override = override_settings(
+            BLOCKCHAIN_RPC_URLS=[self.server.url],
+            DIT_REWARDS_CONTRACT_ADDRESS=self.chain.contract_address,
+            BLOCKCHAIN_CONFIRMATIONS=self.CONFIRMATIONS
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        quiet = mock.patch('builtins.print')
+        quiet.start()
+        self.addCleanup(quiet.stop)
+
+    def chain_transactions(self, topic, from_block=0):
+        """Transaction hashes of the chain's logs, stored without the 0x prefix"""
+        return {
+            log['transactionHash'][2:] for log in self.chain.logs
+            if log['topics'][0] == topic and int(log['blockNumber'], 16) >= from_block
+        }
+
+    def assert_matches_chain(self):
+        self.assertEqual(
+            set(RewardDistribution.objects.values_list('transaction_hash', flat=True)),
+            self.chain_transactions(DISTRIBUTED_TOPIC)
+        )
+        self.assertEqual(
+            set(UserRewardClaim.objects.values_list('transaction_hash', flat=True)),
+            self.chain_transactions(CLAIMED_TOPIC)
+        )
+        self.assertEqual(RawEventLog.objects.count(), len(self.chain.logs))
+        self.assert_derived_data_consistent()
+
+    def assert_derived_data_consistent(self):
+        distributions = (
+            RewardDistribution.objects
+            .annotate(day=TruncDate('distributed_at', tzinfo=dt_timezone.utc))
+            .values('day', 'nft_type')
+            .annotate(total=Sum('total_amount'), distributions=Count('pk'))
+            .order_by()
+        )
+        self.assertEqual(
+            {(row['day'], row['nft_type']): (row['total'], row['distributions']) for row in distributions},
+            {
+                (rollup.day, rollup.nft_type): (rollup.total_amount, rollup.distribution_count)
+                for rollup in RewardDailyRollup.objects.all()
+            }
+        )
+        service = DITRewardsBlockchainService()
+        for event_type in SyncEventType:
+            digests = service.get_digests(event_type)
+            for bucket_start, (count, digest) in digests.stored(0, 10 ** 12).items():
+                self.assertEqual((count, digest), digests.compute(*bucket_bounds(bucket_start)))
+            self.assertEqual(
+                sum(count for count, _ in digests.stored(0, 10 ** 12).values()),
+                digests.model.objects.count()
+            )
+
+    def test_orphaned_events_are_rolled_back_and_resynced(self):
+        service = DITRewardsBlockchainService()
+        service.sync_all_events(self.chain.start_block, self.chain.head)
+        self.assert_matches_chain()
+
+        fork_block = self.chain.head - self.DEPTH + 1
+        orphaned_distributions = self.chain_transactions(DISTRIBUTED_TOPIC, fork_block)
+        orphaned_claims = self.chain_transactions(CLAIMED_TOPIC, fork_block)
+        self.assertTrue(orphaned_distributions and orphaned_claims)
+        self.chain.reorg(self.DEPTH, events=2)
+
+        service = DITRewardsBlockchainService()
+        with self.assertLogs('diora_reward.services.blockchain_service', 'WARNING'):
+            rollback_block = service.rollback_reorged_blocks()
+        self.assertIsNotNone(rollback_block)
+        self.assertLessEqual(rollback_block, fork_block)
+        self.assertGreater(rollback_block, self.chain.head - self.CONFIRMATIONS)
+        self.assertFalse(RewardDistribution.objects.filter(transaction_hash__in=orphaned_distributions).exists())
+        self.assertFalse(UserRewardClaim.objects.filter(transaction_hash__in=orphaned_claims).exists())
+        for model in (RewardDistribution, UserRewardClaim, RawEventLog):
+            self.assertFalse(model.objects.filter(block_number__gte=rollback_block).exists())
+        for event_type in SyncEventType:
+            self.assertEqual(service.get_checkpoints(event_type).high_water_mark(), rollback_block - 1)
+        self.assertFalse(SyncedBlockRange.objects.filter(to_block__gte=rollback_block).exists())
+        self.assert_derived_data_consistent()
+
+        service.sync_all_events(self.chain.start_block, self.chain.head)
+        self.assert_matches_chain()
+        for event_type in SyncEventType:
+            self.assertEqual(service.get_checkpoints(event_type).find_gaps(self.chain.start_block, self.chain.head), [])
+
+
+class CheckpointStoreTests(TestCase):
+    """Scanned block ranges of one event stream"""
+
+    def setUp(self):
+        self.store = CheckpointStore('0x' + 'cd' * 20, SyncEventType.REWARDS_DISTRIBUTED)
+
+    def ranges(self):
+        return list(self.store.ranges.values_list('from_block', 'to_block'))
+
+    def test_adjacent_ranges_are_merged(self):
+        self.store.record_range(100, 199)
+        self.store.record_range(200, 299)
+        self.store.record_range(0, 99)
+        self.assertEqual(self.ranges(), [(0, 299)])
+
+    def test_overlapping_ranges_are_merged(self):
+        self.store.record_range(100, 199)
+        self.store.record_range(150, 249)
+        self.assertEqual(self.ranges(), [(100, 249)])
+        self.store.record_range(120, 130)
+        self.assertEqual(self.ranges(), [(100, 249)])
+        self.store.record_range(300, 399)
+        self.store.record_range(500, 599)
+        self.store.record_range(50, 550)
+        self.assertEqual(self.ranges(), [(50, 599)])
+
+    def test_separate_ranges_are_kept(self):
+        self.store.record_range(100, 199)
+        self.store.record_range(201, 299)
+        self.assertEqual(self.ranges(), [(100, 199), (201, 299)])
+        self.assertEqual(self.store.high_water_mark(), 299)
+        self.assertEqual(self.store.low_water_mark(), 100)
+
+    def test_gaps_at_start_middle_and_end(self):
+        self.store.record_range(100, 199)
+        self.store.record_range(300, 399)
+        self.store.record_range(450, 499)
+        self.assertEqual(self.store.find_gaps(), [(200, 299), (400, 449)])
+        self.assertEqual(
+            self.store.find_gaps(floor=0, ceiling=600),
+            [(0, 99), (200, 299), (400, 449), (500, 600)]
+        )
+        self.assertEqual(self.store.find_gaps(floor=150, ceiling=420), [(200, 299), (400, 420)])
+        self.assertEqual(self.store.find_gaps(floor=300, ceiling=399), [])
+
+    def test_empty_table(self):
+        self.assertEqual(self.ranges(), [])
+        self.assertEqual(self.store.find_gaps(), [])
+        self.assertEqual(self.store.find_gaps(floor=100), [])
+        self.assertEqual(self.store.find_gaps(floor=100, ceiling=199), [(100, 199)])
+        self.assertIsNone(self.store.high_water_mark())
+        self.assertEqual(self.store.resume_block(default=42), 42)
+
+    def test_truncate_from(self):
+        self.store.record_range(100, 199)
+        self.store.record_range(300, 399)
+        self.store.truncate_from(150)
+        self.assertEqual(self.ranges(), [(100, 149)])
+        self.assertEqual(self.store.find_gaps(floor=100, ceiling=199), [(150, 199)])
+
+
+class LogSubscriptionDaemonTests(TestCase):
+    """run_sync_daemon --subscribe against the fake chain's WebSocket server"""
+
+    TIMEOUT = 15
+
+    def setUp(self):
+        self.chain = FakeChain(events=50, blocks_per_event=2, wallets=20)
+        self.server = FakeChainServer(self.chain).start()
+        self.addCleanup(self.server.stop)
+        self.ws_server = FakeChainWebSocketServer(self.chain).start()
+        self.addCleanup(self.ws_server.stop)
+        settings_override = override_settings(
+            BLOCKCHAIN_RPC_URLS=[self.server.url],
+            DIT_REWARDS_CONTRACT_ADDRESS=self.chain.contract_address
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        quiet = mock.patch('builtins.print')
+        quiet.start()
+        self.addCleanup(quiet.stop)
+
+        self.command = run_sync_daemon.Command(stdout=StringIO())
+        self.command._stop = threading.Event()
+        # Set when _follow() starts on the first connection and on the reconnect
+        self.following = [threading.Event(), threading.Event()]
+        self.missed_mined = threading.Event()
+        self.ingested = []
+        self.ingested_event = threading.Event()
+
+    def chain_blocks(self, first_block):
+        return {int(log['blockNumber'], 16) for log in self.chain.logs if int(log['blockNumber'], 16) >= first_block}
+
+    def wait_ingested(self, block_number):
+        """Wait until the daemon stored block_number from pushed logs"""
+        deadline = time.monotonic() + self.TIMEOUT
+        while not any(to_block >= block_number for _, to_block, _ in self.ingested):
+            self.ingested_event.clear()
+            if not self.ingested_event.wait(max(0.0, deadline - time.monotonic())):
+                raise AssertionError(f"Block {block_number} was never ingested from the subscription")
+
+    def drive_chain(self, marks, errors):
+        """Mine blocks while the daemon follows them, dropping the connection halfway"""
+        try:
+            if not self.following[0].wait(self.TIMEOUT):
+                raise AssertionError("The daemon never subscribed")
+            marks['pushed_from'] = self.chain.mine(events=3)
+            pushed_to = self.chain.mine(events=3)
+            self.chain.mine()
+            self.wait_ingested(pushed_to)
+
+            marks['get_logs_before_drop'] = self.chain.calls['eth_getLogs']
+            self.ws_server.disconnect_all()
+            marks['missed_from'] = self.chain.mine(events=2)
+            self.chain.mine(events=2)
+            marks['missed_to'] = self.chain.mine()
+            self.missed_mined.set()
+
+            if not self.following[1].wait(self.TIMEOUT):
+                raise AssertionError("The daemon never resubscribed")
+            marks['resumed_from'] = self.chain.mine(events=1)
+            self.chain.mine()
+            self.wait_ingested(marks['resumed_from'])
+        except AssertionError as e:
+            errors.append(e)
+        finally:
+            self.command._stop.set()
+
+    def test_pushed_logs_are_stored_and_missed_blocks_backfilled(self):
+        service = DITRewardsBlockchainService()
+        service.sync_all_events(self.chain.start_block, self.chain.head)
+        test = self
+        ingest_logs = DITRewardsBlockchainService.ingest_logs
+
+        class GatedSubscription(LogSubscription):
+            def open(self):
+                if test.following[0].is_set():
+                    # Reconnect only after the blocks it has to backfill were mined
+                    test.missed_mined.wait(test.TIMEOUT)
+                return super().open()
+
+        follow = self.command._follow
+
+        def tracked_follow(*args):
+            self.following[1 if self.following[0].is_set() else 0].set()
+            return follow(*args)
+
+        def tracked_ingest_logs(service, from_block, to_block, raw_logs, *args, **kwargs):
+            result = ingest_logs(service, from_block, to_block, raw_logs, *args, **kwargs)
+            self.ingested.append((from_block, to_block, {int(log['blockNumber'], 16) for log in raw_logs}))
+            self.ingested_event.set()
+            return result
+
+        marks = {}
+        errors = []
+        driver = threading.Thread(target=self.drive_chain, args=(marks, errors), daemon=True)
+        options = {'interval': 0.05, 'max_interval': 5.0, 'max_blocks_per_loop': 100000}
+        with mock.patch.object(run_sync_daemon, 'LogSubscription', GatedSubscription), \
+                mock.patch.object(self.command, '_follow', tracked_follow), \
+                mock.patch.object(DITRewardsBlockchainService, 'ingest_logs', tracked_ingest_logs), \
+                self.assertLogs('diora_reward.management.commands.run_sync_daemon', 'ERROR') as logs:
+            driver.start()
+            self.command._run_subscribed(service, self.ws_server.url, options)
+        driver.join(self.TIMEOUT)
+        if errors:
+            raise errors[0]
+        self.assertIn('Log subscription failed', logs.output[0])
+
+        # Logs of the blocks mined while connected arrived over the subscription
+        pushed_blocks = set().union(*(blocks for _, _, blocks in self.ingested))
+        self.assertTrue({marks['pushed_from'], marks['pushed_from'] + 1} <= pushed_blocks)
+        self.assertIn(marks['resumed_from'], pushed_blocks)
+        # The blocks mined while disconnected were backfilled with eth_getLogs
+        missed_blocks = self.chain_blocks(marks['missed_from']) - self.chain_blocks(marks['missed_to'])
+        self.assertEqual(len(missed_blocks), 2)
+        self.assertFalse(missed_blocks & pushed_blocks)
+        self.assertGreater(self.chain.calls['eth_getLogs'], marks['get_logs_before_drop'])
+
+        stored = set(RawEventLog.objects.values_list('block_number', 'log_index'))
+        self.assertEqual(stored, {(int(log['blockNumber'], 16), int(log['logIndex'], 16)) for log in self.chain.logs})
+        for event_type in SyncEventType:
+            checkpoints = service.get_checkpoints(event_type)
+            self.assertEqual(checkpoints.find_gaps(self.chain.start_block, marks['resumed_from']), [])
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'diora-reward-response-cache-tests',
+}})
+class AnalyticsResponseCacheTests(TestCase):
+    """Cached analytics responses are invalidated by rewards writes"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def create_distribution(self, index):
+        response = self.client.post(reverse('reward-distributions'), {
+            'nft_type': 'GREEN',
+            'total_amount': '300.000000',
+            'per_wallet_amount': '100.000000',
+            'wallet_count': 3,
+            'transaction_hash': '0x' + f'{index:064x}',
+            'log_index': 0,
+            'block_number': 1000 + index,
+            'distributed_at': (timezone.now() - timedelta(days=index)).isoformat()
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def total_distributed(self):
+        response = self.client.get(reverse('nft-type-rewards'), {'nft_type': 'GREEN'})
+        self.assertEqual(response.status_code, 200)
+        return response.data['total_distributed']
+
+    def test_distribution_write_invalidates_cached_response(self):
+        self.create_distribution(1)
+        version = rewards_data_version()
+        self.assertEqual(self.total_distributed(), Decimal('300'))
+        with self.assertNumQueries(1):
+            # Only the data version is read, the response comes from the cache
+            self.assertEqual(self.total_distributed(), Decimal('300'))
+        self.assertEqual(response_cache_stats()['endpoints']['nft-type'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+        self.create_distribution(2)
+        self.assertGreater(rewards_data_version(), version)
+        self.assertEqual(self.total_distributed(), Decimal('600'))
+        self.assertEqual(response_cache_stats()['endpoints']['nft-type']['misses'], 2)
+
+
+class SyncMetricsExportTests(TestCase):
+    """Prometheus rendering of the stored sync runs"""
+
+    def test_latencies_are_exported_as_summaries(self):
+        metrics = SyncMetrics()
+        for elapsed in (0.1, 0.2, 0.3, 0.4):
+            metrics.observe_rpc('eth_getLogs', elapsed, False)
+        metrics.record_range(100, 199, 250)
+        metrics.record_chunk(100, 149, 3, 3, 0, 0.01)
+        metrics.record_chunk(150, 199, 2, 2, 0, 0.03)
+        run = SyncRun(command='sync_rewards', status='succeeded')
+        metrics.apply_to(run)
+        run.finished_at = timezone.now()
+        run.save()
+
+        lines = prometheus_text(sync_status()).splitlines()
+        self.assertIn('# TYPE diora_sync_rpc_latency_seconds summary', lines)
+        rpc_labels = 'command="sync_rewards",method="eth_getLogs"'
+        self.assertIn(f'diora_sync_rpc_latency_seconds{{{rpc_labels},quantile="0.5"}} 0.3', lines)
+        self.assertIn(f'diora_sync_rpc_latency_seconds{{{rpc_labels},quantile="1"}} 0.4', lines)
+        self.assertIn(f'diora_sync_rpc_latency_seconds_sum{{{rpc_labels}}} 1.0', lines)
+        self.assertIn(f'diora_sync_rpc_latency_seconds_count{{{rpc_labels}}} 4', lines)
+
+        self.assertIn('# TYPE diora_sync_db_write_seconds summary', lines)
+        self.assertIn('diora_sync_db_write_seconds{command="sync_rewards",quantile="0.99"} 0.03', lines)
+        self.assertIn('diora_sync_db_write_seconds_sum{command="sync_rewards"} 0.04', lines)
+        self.assertIn('diora_sync_db_write_seconds_count{command="sync_rewards"} 2', lines)
+        self.assertNotIn('# TYPE diora_sync_rpc_latency_seconds gauge', lines)
+        self.assertNotIn('# TYPE diora_sync_db_write_seconds gauge', lines)
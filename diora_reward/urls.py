@@ -7,7 +7,9 @@ from .views import (
     NFTTypeRewardsAPIView,
     AllNFTTypesRewardsAPIView,
     BulkRewardDistributionAPIView,
-    PendingRewardAPIView
+    PendingRewardAPIView,
+    SyncStatusAPIView,
+    SyncMetricsAPIView
 )
 
 urlpatterns = [
@@ -26,4 +28,8 @@ urlpatterns = [
     path('total/', TotalRewardsAPIView.as_view(), name='total-rewards'),
     path('nft-type/', NFTTypeRewardsAPIView.as_view(), name='nft-type-rewards'),
     path('all-nft-types/', AllNFTTypesRewardsAPIView.as_view(), name='all-nft-types-rewards'),
+    
+    # Sync Monitoring
+    path('sync/status/', SyncStatusAPIView.as_view(), name='sync-status'),
+    path('sync/metrics/', SyncMetricsAPIView.as_view(), name='sync-metrics'),
 ]
@@ -12,12 +12,31 @@ from .serializers import (
 from .models import RewardDistribution, UserRewardClaim, NFTType, PendingReward
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.db.models import Sum, Q
+from django.db.models import Sum
 from django.utils import timezone
-from datetime import timedelta
 from decimal import Decimal
 from django.db import transaction as db_transaction
 from collections import OrderedDict
+from django.http import HttpResponse
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .services.sync_metrics import sync_status, prometheus_text
+from .services.distribution_pages import (
+    CursorError, decode_cursor, encode_cursor, load_groups, transaction_keys, transaction_page
+)
+from .services.reward_rollups import refresh_reward_rollups_for
+from .services.response_cache import cache_analytics_response, response_cache_stats
+from .services.reward_analytics import (
+    PERIOD_PARAMS,
+    PeriodError,
+    period_cache_bucket,
+    resolve_period,
+    query_period_totals,
+    query_all_time_totals,
+    period_comparison,
+    all_time_totals,
+    wallet_rewards_by_nft_type,
+    add_wallet_rewards,
+)
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -33,57 +52,62 @@ class RewardDistributionAPIView(APIView):
     @swagger_auto_schema(
         manual_parameters=[
             openapi.Parameter('nft_type', openapi.IN_QUERY, description="Filter by NFT type (RED, GREEN, BLUE, BLACK, DRAGON, FLAWLESS_DIAMOND)", type=openapi.TYPE_STRING),
-            openapi.Parameter('page', openapi.IN_QUERY, description="Page number", type=openapi.TYPE_INTEGER),
-            openapi.Parameter('page_size', openapi.IN_QUERY, description="Number of results per page (max 100)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('cursor', openapi.IN_QUERY, description="Cursor from the previous page's next link (omit for the first page)", type=openapi.TYPE_STRING),
+            openapi.Parameter('page_size', openapi.IN_QUERY, description="Number of transactions per page (max 100)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('page', openapi.IN_QUERY, description="Deprecated: page number, returns the old count/next/previous/results response; use cursor instead", type=openapi.TYPE_INTEGER),
         ],
         responses={200: GroupedRewardDistributionSerializer(many=True)}
     )
     def get(self, request):
-        """Get list of all reward distributions grouped by transaction hash"""
-        distributions = RewardDistribution.objects.all().order_by('-distributed_at', 'transaction_hash', 'log_index')
+        """Get list of all reward distributions grouped by transaction hash, newest first"""
+        distributions = RewardDistribution.objects.all()
         
         # Filter by NFT type
         nft_type = request.query_params.get('nft_type', None)
         if nft_type:
             distributions = distributions.filter(nft_type=nft_type.upper())
         
-        # Group distributions by transaction hash
-        grouped_data = OrderedDict()
-        for dist in distributions:
-            tx_hash = dist.transaction_hash
-            if tx_hash not in grouped_data:
-                grouped_data[tx_hash] = {
-                    'transaction_hash': tx_hash,
-                    'block_number': dist.block_number,
-                    'distributed_at': dist.distributed_at,
-                    'distributions': [],
-                    'total_amount_all_types': Decimal('0'),
-                    'total_wallets_all_types': 0
-                }
-            
-            grouped_data[tx_hash]['distributions'].append({
-                'id': dist.id,
-                'nft_type': dist.nft_type,
-                'total_amount': dist.total_amount,
-                'per_wallet_amount': dist.per_wallet_amount,
-                'wallet_count': dist.wallet_count,
-                'log_index': dist.log_index
-            })
-            grouped_data[tx_hash]['total_amount_all_types'] += dist.total_amount
-            grouped_data[tx_hash]['total_wallets_all_types'] += dist.wallet_count
-        
-        # Add total_distributions count
-        for tx_hash, data in grouped_data.items():
-            data['total_distributions'] = len(data['distributions'])
+        if 'page' in request.query_params and 'cursor' not in request.query_params:
+            return self.get_page_number(request, distributions)
         
-        # Convert to list for pagination
-        grouped_list = list(grouped_data.values())
+        cursor = request.query_params.get('cursor', None)
+        try:
+            cursor = decode_cursor(cursor) if cursor else None
+        except CursorError as e:
+            return Response({
+                "error": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Pagination
+        # Keyset pagination over transactions in the database, then only the page's distributions are loaded
+        page_size = self.pagination_class().get_page_size(request)
+        groups, next_key = transaction_page(distributions, page_size, cursor)
+        
+        next_url = None
+        if next_key is not None:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', encode_cursor(*next_key))
+        serializer = GroupedRewardDistributionSerializer(groups, many=True)
+        return Response(OrderedDict([
+            ('next', next_url),
+            ('results', serializer.data)
+        ]))
+
+    def get_page_number(self, request, distributions):
+        """
+        Deprecated page-number listing, kept until clients move to the cursor
+
+        Same count/next/previous/results response as before the keyset
+        pagination, with a Deprecation header. Deep pages cost an OFFSET
+        over the grouped transactions.
+        """
         paginator = self.pagination_class()
-        paginated_groups = paginator.paginate_queryset(grouped_list, request)
-        serializer = GroupedRewardDistributionSerializer(paginated_groups, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        page_keys = paginator.paginate_queryset(transaction_keys(distributions), request)
+        serializer = GroupedRewardDistributionSerializer(load_groups(distributions, page_keys), many=True)
+        response = paginator.get_paginated_response(serializer.data)
+        response['Deprecation'] = 'true'
+        response['Link'] = '<{}>; rel="successor-version"'.format(
+            remove_query_param(request.build_absolute_uri(), 'page')
+        )
+        return response
 
     @swagger_auto_schema(
         request_body=RewardDistributionSerializer,
@@ -93,7 +117,9 @@ class RewardDistributionAPIView(APIView):
         """Create a new reward distribution record (from blockchain sync)"""
         serializer = RewardDistributionSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            with db_transaction.atomic():
+                distribution = serializer.save()
+                refresh_reward_rollups_for([distribution.distributed_at])
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -207,6 +233,7 @@ class BulkRewardDistributionAPIView(APIView):
         block_number = serializer.validated_data.get('block_number', 0)
         
         distribution_results = []
+        distributed_at_values = []
         total_wallets = 0
         total_dit = Decimal('0')
         
@@ -264,8 +291,12 @@ class BulkRewardDistributionAPIView(APIView):
                         "pending_rewards_created": len(created_pending_rewards)
                     })
                     
+                    distributed_at_values.append(reward_distribution.distributed_at)
                     total_wallets += wallet_count
                     total_dit += total_dit_amount
+                
+                # Daily rollups commit together with the distributions
+                refresh_reward_rollups_for(distributed_at_values)
             
             return Response({
                 "message": "Successfully distributed rewards",
@@ -434,127 +465,32 @@ class TotalRewardsAPIView(APIView):
             }
         )}
     )
+    @cache_analytics_response('total', PERIOD_PARAMS, bucket=period_cache_bucket)
     def get(self, request):
         """Get total rewards distributed with time filtering and percentage changes"""
-        period = request.query_params.get('period', None)
-        start_date_str = request.query_params.get('start_date', None)
-        end_date_str = request.query_params.get('end_date', None)
-        
-        now = timezone.now()
-        
-        # Determine date range based on period
-        if period == 'week':
-            end_date = now
-            start_date = now - timedelta(days=7)
-            prev_start_date = start_date - timedelta(days=7)
-            prev_end_date = start_date
-        elif period == 'month':
-            end_date = now
-            start_date = now - timedelta(days=30)
-            prev_start_date = start_date - timedelta(days=30)
-            prev_end_date = start_date
-        elif period == '6months':
-            end_date = now
-            start_date = now - timedelta(days=180)
-            prev_start_date = start_date - timedelta(days=180)
-            prev_end_date = start_date
-        elif period == 'year':
-            end_date = now
-            start_date = now - timedelta(days=365)
-            prev_start_date = start_date - timedelta(days=365)
-            prev_end_date = start_date
-        elif period == 'custom':
-            if not start_date_str or not end_date_str:
-                return Response({
-                    "error": "start_date and end_date are required for custom period"
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            try:
-                from datetime import datetime
-                start_date = timezone.make_aware(datetime.strptime(start_date_str, '%Y-%m-%d'))
-                end_date = timezone.make_aware(datetime.strptime(end_date_str, '%Y-%m-%d'))
-                end_date = end_date.replace(hour=23, minute=59, second=59)
-                
-                # Calculate previous period with same duration
-                duration = end_date - start_date
-                prev_end_date = start_date
-                prev_start_date = start_date - duration
-            except ValueError:
-                return Response({
-                    "error": "Invalid date format. Use YYYY-MM-DD"
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            # No period specified - return all time totals without comparison
-            totals = RewardDistribution.objects.aggregate(
-                total_distributed=Sum('total_amount'),
-                total_wallets=Sum('wallet_count')
+        try:
+            reward_period = resolve_period(
+                request.query_params.get('period', None),
+                request.query_params.get('start_date', None),
+                request.query_params.get('end_date', None)
             )
-            total_distributions = RewardDistribution.objects.count()
-            
+        except PeriodError as e:
             return Response({
-                "total_distributed": totals['total_distributed'] or 0,
-                "total_distributions": total_distributions,
-                "total_wallets_rewarded": totals['total_wallets'] or 0
-            }, status=status.HTTP_200_OK)
-        
-        # Get current period totals
-        current_totals = RewardDistribution.objects.filter(
-            distributed_at__gte=start_date,
-            distributed_at__lte=end_date
-        ).aggregate(
-            total_distributed=Sum('total_amount'),
-            total_wallets=Sum('wallet_count')
-        )
-        current_distributions_count = RewardDistribution.objects.filter(
-            distributed_at__gte=start_date,
-            distributed_at__lte=end_date
-        ).count()
-        
-        # Get previous period totals
-        prev_totals = RewardDistribution.objects.filter(
-            distributed_at__gte=prev_start_date,
-            distributed_at__lt=prev_end_date
-        ).aggregate(
-            total_distributed=Sum('total_amount'),
-            total_wallets=Sum('wallet_count')
-        )
-        prev_distributions_count = RewardDistribution.objects.filter(
-            distributed_at__gte=prev_start_date,
-            distributed_at__lt=prev_end_date
-        ).count()
+                "error": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Calculate percentage changes
-        def calculate_percentage_change(current, previous):
-            if previous is None or previous == 0:
-                return 100.0 if current and current > 0 else 0.0
-            if current is None:
-                return -100.0
-            return round(((float(current) - float(previous)) / float(previous)) * 100, 2)
+        if reward_period is None:
+            # No period specified - return all time totals without comparison
+            return Response(all_time_totals(query_all_time_totals()), status=status.HTTP_200_OK)
         
-        current_distributed = current_totals['total_distributed'] or Decimal('0')
-        current_wallets = current_totals['total_wallets'] or 0
-        prev_distributed = prev_totals['total_distributed'] or Decimal('0')
-        prev_wallets = prev_totals['total_wallets'] or 0
+        # Current and previous period from the daily rollups
+        totals = query_period_totals(reward_period)
         
         return Response({
-            "period": period,
-            "start_date": start_date.strftime('%Y-%m-%d'),
-            "end_date": end_date.strftime('%Y-%m-%d'),
-            "current_period": {
-                "total_distributed": current_distributed,
-                "total_distributions": current_distributions_count,
-                "total_wallets_rewarded": current_wallets
-            },
-            "previous_period": {
-                "total_distributed": prev_distributed,
-                "total_distributions": prev_distributions_count,
-                "total_wallets_rewarded": prev_wallets
-            },
-            "percentage_change": {
-                "total_distributed": calculate_percentage_change(current_distributed, prev_distributed),
-                "total_distributions": calculate_percentage_change(current_distributions_count, prev_distributions_count),
-                "total_wallets_rewarded": calculate_percentage_change(current_wallets, prev_wallets)
-            }
+            "period": reward_period.period,
+            "start_date": reward_period.start_date.strftime('%Y-%m-%d'),
+            "end_date": reward_period.end_date.strftime('%Y-%m-%d'),
+            **period_comparison(totals)
         }, status=status.HTTP_200_OK)
 
 
@@ -605,6 +541,7 @@ class NFTTypeRewardsAPIView(APIView):
             }
         ), 400: "Bad Request"}
     )
+    @cache_analytics_response('nft-type', ('nft_type', 'wallet_address', *PERIOD_PARAMS), bucket=period_cache_bucket)
     def get(self, request):
         """Get rewards for a specific NFT type with time filtering and percentage changes"""
         nft_type = request.query_params.get('nft_type', None)
@@ -621,188 +558,49 @@ class NFTTypeRewardsAPIView(APIView):
                 "error": f"Invalid nft_type. Must be one of: {', '.join([choice[0] for choice in NFTType.choices])}"
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        period = request.query_params.get('period', None)
-        start_date_str = request.query_params.get('start_date', None)
-        end_date_str = request.query_params.get('end_date', None)
-        
-        now = timezone.now()
+        try:
+            reward_period = resolve_period(
+                request.query_params.get('period', None),
+                request.query_params.get('start_date', None),
+                request.query_params.get('end_date', None)
+            )
+        except PeriodError as e:
+            return Response({
+                "error": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Determine date range based on period
-        if period == 'week':
-            end_date = now
-            start_date = now - timedelta(days=7)
-            prev_start_date = start_date - timedelta(days=7)
-            prev_end_date = start_date
-        elif period == 'month':
-            end_date = now
-            start_date = now - timedelta(days=30)
-            prev_start_date = start_date - timedelta(days=30)
-            prev_end_date = start_date
-        elif period == '6months':
-            end_date = now
-            start_date = now - timedelta(days=180)
-            prev_start_date = start_date - timedelta(days=180)
-            prev_end_date = start_date
-        elif period == 'year':
-            end_date = now
-            start_date = now - timedelta(days=365)
-            prev_start_date = start_date - timedelta(days=365)
-            prev_end_date = start_date
-        elif period == 'custom':
-            if not start_date_str or not end_date_str:
-                return Response({
-                    "error": "start_date and end_date are required for custom period"
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            try:
-                from datetime import datetime
-                start_date = timezone.make_aware(datetime.strptime(start_date_str, '%Y-%m-%d'))
-                end_date = timezone.make_aware(datetime.strptime(end_date_str, '%Y-%m-%d'))
-                end_date = end_date.replace(hour=23, minute=59, second=59)
-                
-                # Calculate previous period with same duration
-                duration = end_date - start_date
-                prev_end_date = start_date
-                prev_start_date = start_date - duration
-            except ValueError:
-                return Response({
-                    "error": "Invalid date format. Use YYYY-MM-DD"
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
+        if reward_period is None:
             # No period specified - return all time totals for this NFT type
-            totals = RewardDistribution.objects.filter(nft_type=nft_type).aggregate(
-                total_distributed=Sum('total_amount'),
-                total_wallets=Sum('wallet_count')
-            )
-            total_distributions = RewardDistribution.objects.filter(nft_type=nft_type).count()
-            
+            totals = query_all_time_totals(nft_type=nft_type)
             response_data = {
                 "nft_type": nft_type,
-                "total_distributed": totals['total_distributed'] or 0,
-                "total_distributions": total_distributions,
-                "total_wallets_rewarded": totals['total_wallets'] or 0
+                **all_time_totals(totals)
             }
             
             # If wallet_address is provided, get that wallet's rewards for this NFT type
             if wallet_address:
-                wallet_rewards = PendingReward.objects.filter(
-                    wallet_address=wallet_address,
-                    nft_type=nft_type
-                ).select_related('distribution').order_by('-distribution__distributed_at')
-                
-                # Group by transaction hash
-                grouped_rewards = {}
-                for reward in wallet_rewards:
-                    tx_hash = reward.distribution.transaction_hash
-                    if tx_hash not in grouped_rewards:
-                        grouped_rewards[tx_hash] = {
-                            'transaction_hash': tx_hash,
-                            'distributed_at': reward.distribution.distributed_at,
-                            'per_wallet_amount': reward.distribution.per_wallet_amount,
-                            'user_reward': Decimal('0'),
-                            'is_sent': reward.is_sent,
-                            'block_number': reward.distribution.block_number
-                        }
-                    grouped_rewards[tx_hash]['user_reward'] += reward.dit_amount
-                
+                wallet_rewards = wallet_rewards_by_nft_type(wallet_address, nft_type=nft_type)
                 response_data['wallet_address'] = wallet_address
-                response_data['wallet_rewards'] = list(grouped_rewards.values())
-                response_data['total_user_rewards'] = sum(r['user_reward'] for r in grouped_rewards.values())
+                add_wallet_rewards(response_data, wallet_rewards.get(nft_type, []))
             
             return Response(response_data, status=status.HTTP_200_OK)
         
-        # Get current period totals for this NFT type
-        current_totals = RewardDistribution.objects.filter(
-            nft_type=nft_type,
-            distributed_at__gte=start_date,
-            distributed_at__lte=end_date
-        ).aggregate(
-            total_distributed=Sum('total_amount'),
-            total_wallets=Sum('wallet_count')
-        )
-        current_distributions_count = RewardDistribution.objects.filter(
-            nft_type=nft_type,
-            distributed_at__gte=start_date,
-            distributed_at__lte=end_date
-        ).count()
-        
-        # Get previous period totals for this NFT type
-        prev_totals = RewardDistribution.objects.filter(
-            nft_type=nft_type,
-            distributed_at__gte=prev_start_date,
-            distributed_at__lt=prev_end_date
-        ).aggregate(
-            total_distributed=Sum('total_amount'),
-            total_wallets=Sum('wallet_count')
-        )
-        prev_distributions_count = RewardDistribution.objects.filter(
-            nft_type=nft_type,
-            distributed_at__gte=prev_start_date,
-            distributed_at__lt=prev_end_date
-        ).count()
-        
-        # Calculate percentage changes
-        def calculate_percentage_change(current, previous):
-            if previous is None or previous == 0:
-                return 100.0 if current and current > 0 else 0.0
-            if current is None:
-                return -100.0
-            return round(((float(current) - float(previous)) / float(previous)) * 100, 2)
-        
-        current_distributed = current_totals['total_distributed'] or Decimal('0')
-        current_wallets = current_totals['total_wallets'] or 0
-        prev_distributed = prev_totals['total_distributed'] or Decimal('0')
-        prev_wallets = prev_totals['total_wallets'] or 0
+        # Current and previous period from the daily rollups
+        totals = query_period_totals(reward_period, nft_type=nft_type)
         
         response_data = {
             "nft_type": nft_type,
-            "period": period,
-            "start_date": start_date.strftime('%Y-%m-%d'),
-            "end_date": end_date.strftime('%Y-%m-%d'),
-            "current_period": {
-                "total_distributed": current_distributed,
-                "total_distributions": current_distributions_count,
-                "total_wallets_rewarded": current_wallets
-            },
-            "previous_period": {
-                "total_distributed": prev_distributed,
-                "total_distributions": prev_distributions_count,
-                "total_wallets_rewarded": prev_wallets
-            },
-            "percentage_change": {
-                "total_distributed": calculate_percentage_change(current_distributed, prev_distributed),
-                "total_distributions": calculate_percentage_change(current_distributions_count, prev_distributions_count),
-                "total_wallets_rewarded": calculate_percentage_change(current_wallets, prev_wallets)
-            }
+            "period": reward_period.period,
+            "start_date": reward_period.start_date.strftime('%Y-%m-%d'),
+            "end_date": reward_period.end_date.strftime('%Y-%m-%d'),
+            **period_comparison(totals)
         }
         
         # If wallet_address is provided, get that wallet's rewards for this NFT type in the current period
         if wallet_address:
-            wallet_rewards = PendingReward.objects.filter(
-                wallet_address=wallet_address,
-                nft_type=nft_type,
-                distribution__distributed_at__gte=start_date,
-                distribution__distributed_at__lte=end_date
-            ).select_related('distribution').order_by('-distribution__distributed_at')
-            
-            # Group by transaction hash
-            grouped_rewards = {}
-            for reward in wallet_rewards:
-                tx_hash = reward.distribution.transaction_hash
-                if tx_hash not in grouped_rewards:
-                    grouped_rewards[tx_hash] = {
-                        'transaction_hash': tx_hash,
-                        'distributed_at': reward.distribution.distributed_at,
-                        'per_wallet_amount': reward.distribution.per_wallet_amount,
-                        'user_reward': Decimal('0'),
-                        'is_sent': reward.is_sent,
-                        'block_number': reward.distribution.block_number
-                    }
-                grouped_rewards[tx_hash]['user_reward'] += reward.dit_amount
-            
+            wallet_rewards = wallet_rewards_by_nft_type(wallet_address, reward_period, nft_type)
             response_data['wallet_address'] = wallet_address
-            response_data['wallet_rewards'] = list(grouped_rewards.values())
-            response_data['total_user_rewards'] = sum(r['user_reward'] for r in grouped_rewards.values())
+            add_wallet_rewards(response_data, wallet_rewards.get(nft_type, []))
         
         return Response(response_data, status=status.HTTP_200_OK)
 
@@ -838,205 +636,116 @@ class AllNFTTypesRewardsAPIView(APIView):
             }
         )}
     )
+    @cache_analytics_response('all-nft-types', ('wallet_address', *PERIOD_PARAMS), bucket=period_cache_bucket)
     def get(self, request):
         """Get rewards breakdown for all NFT types with percentage changes"""
         wallet_address = request.query_params.get('wallet_address', None)
-        period = request.query_params.get('period', None)
-        start_date_str = request.query_params.get('start_date', None)
-        end_date_str = request.query_params.get('end_date', None)
-        
-        now = timezone.now()
+        try:
+            reward_period = resolve_period(
+                request.query_params.get('period', None),
+                request.query_params.get('start_date', None),
+                request.query_params.get('end_date', None)
+            )
+        except PeriodError as e:
+            return Response({
+                "error": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Determine date range based on period
-        if period == 'week':
-            end_date = now
-            start_date = now - timedelta(days=7)
-            prev_start_date = start_date - timedelta(days=7)
-            prev_end_date = start_date
-        elif period == 'month':
-            end_date = now
-            start_date = now - timedelta(days=30)
-            prev_start_date = start_date - timedelta(days=30)
-            prev_end_date = start_date
-        elif period == '6months':
-            end_date = now
-            start_date = now - timedelta(days=180)
-            prev_start_date = start_date - timedelta(days=180)
-            prev_end_date = start_date
-        elif period == 'year':
-            end_date = now
-            start_date = now - timedelta(days=365)
-            prev_start_date = start_date - timedelta(days=365)
-            prev_end_date = start_date
-        elif period == 'custom':
-            if not start_date_str or not end_date_str:
-                return Response({
-                    "error": "start_date and end_date are required for custom period"
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            try:
-                from datetime import datetime
-                start_date = timezone.make_aware(datetime.strptime(start_date_str, '%Y-%m-%d'))
-                end_date = timezone.make_aware(datetime.strptime(end_date_str, '%Y-%m-%d'))
-                end_date = end_date.replace(hour=23, minute=59, second=59)
-                
-                # Calculate previous period with same duration
-                duration = end_date - start_date
-                prev_end_date = start_date
-                prev_start_date = start_date - duration
-            except ValueError:
-                return Response({
-                    "error": "Invalid date format. Use YYYY-MM-DD"
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
+        # Totals grouped by nft_type from the daily rollups, one more query for the wallet's rewards
+        if reward_period is None:
             # No period specified - return all time totals for all NFT types
-            nft_types_data = {}
-            for nft_choice in NFTType.choices:
-                nft_type = nft_choice[0]
-                totals = RewardDistribution.objects.filter(nft_type=nft_type).aggregate(
-                    total_distributed=Sum('total_amount'),
-                    total_wallets=Sum('wallet_count')
-                )
-                total_distributions = RewardDistribution.objects.filter(nft_type=nft_type).count()
-                
-                nft_types_data[nft_type] = {
-                    "total_distributed": totals['total_distributed'] or 0,
-                    "total_distributions": total_distributions,
-                    "total_wallets_rewarded": totals['total_wallets'] or 0
-                }
-                
-                # If wallet_address is provided, get that wallet's rewards for this NFT type
-                if wallet_address:
-                    wallet_rewards = PendingReward.objects.filter(
-                        wallet_address=wallet_address,
-                        nft_type=nft_type
-                    ).select_related('distribution').order_by('-distribution__distributed_at')
-                    
-                    # Group by transaction hash
-                    grouped_rewards = {}
-                    for reward in wallet_rewards:
-                        tx_hash = reward.distribution.transaction_hash
-                        if tx_hash not in grouped_rewards:
-                            grouped_rewards[tx_hash] = {
-                                'transaction_hash': tx_hash,
-                                'distributed_at': reward.distribution.distributed_at,
-                                'per_wallet_amount': reward.distribution.per_wallet_amount,
-                                'user_reward': Decimal('0'),
-                                'is_sent': reward.is_sent,
-                                'block_number': reward.distribution.block_number
-                            }
-                        grouped_rewards[tx_hash]['user_reward'] += reward.dit_amount
-                    
-                    nft_types_data[nft_type]['wallet_rewards'] = list(grouped_rewards.values())
-                    nft_types_data[nft_type]['total_user_rewards'] = sum(r['user_reward'] for r in grouped_rewards.values())
-            
+            totals = query_all_time_totals(by_nft_type=True)
+            nft_types_data = {
+                nft_type: all_time_totals(totals.get(nft_type, {})) for nft_type, _ in NFTType.choices
+            }
             response_data = {"nft_types": nft_types_data}
-            if wallet_address:
-                response_data['wallet_address'] = wallet_address
-            
-            return Response(response_data, status=status.HTTP_200_OK)
-        
-        # Calculate percentage changes helper
-        def calculate_percentage_change(current, previous):
-            if previous is None or previous == 0:
-                return 100.0 if current and current > 0 else 0.0
-            if current is None:
-                return -100.0
-            return round(((float(current) - float(previous)) / float(previous)) * 100, 2)
-        
-        # Get data for all NFT types
-        nft_types_data = {}
-        for nft_choice in NFTType.choices:
-            nft_type = nft_choice[0]
-            
-            # Current period
-            current_totals = RewardDistribution.objects.filter(
-                nft_type=nft_type,
-                distributed_at__gte=start_date,
-                distributed_at__lte=end_date
-            ).aggregate(
-                total_distributed=Sum('total_amount'),
-                total_wallets=Sum('wallet_count')
-            )
-            current_distributions_count = RewardDistribution.objects.filter(
-                nft_type=nft_type,
-                distributed_at__gte=start_date,
-                distributed_at__lte=end_date
-            ).count()
-            
-            # Previous period
-            prev_totals = RewardDistribution.objects.filter(
-                nft_type=nft_type,
-                distributed_at__gte=prev_start_date,
-                distributed_at__lt=prev_end_date
-            ).aggregate(
-                total_distributed=Sum('total_amount'),
-                total_wallets=Sum('wallet_count')
-            )
-            prev_distributions_count = RewardDistribution.objects.filter(
-                nft_type=nft_type,
-                distributed_at__gte=prev_start_date,
-                distributed_at__lt=prev_end_date
-            ).count()
-            
-            current_distributed = current_totals['total_distributed'] or Decimal('0')
-            current_wallets = current_totals['total_wallets'] or 0
-            prev_distributed = prev_totals['total_distributed'] or Decimal('0')
-            prev_wallets = prev_totals['total_wallets'] or 0
-            
-            nft_types_data[nft_type] = {
-                "current_period": {
-                    "total_distributed": current_distributed,
-                    "total_distributions": current_distributions_count,
-                    "total_wallets_rewarded": current_wallets
-                },
-                "previous_period": {
-                    "total_distributed": prev_distributed,
-                    "total_distributions": prev_distributions_count,
-                    "total_wallets_rewarded": prev_wallets
-                },
-                "percentage_change": {
-                    "total_distributed": calculate_percentage_change(current_distributed, prev_distributed),
-                    "total_distributions": calculate_percentage_change(current_distributions_count, prev_distributions_count),
-                    "total_wallets_rewarded": calculate_percentage_change(current_wallets, prev_wallets)
-                }
+        else:
+            totals = query_period_totals(reward_period, by_nft_type=True)
+            nft_types_data = {
+                nft_type: period_comparison(totals.get(nft_type, {})) for nft_type, _ in NFTType.choices
+            }
+            response_data = {
+                "period": reward_period.period,
+                "start_date": reward_period.start_date.strftime('%Y-%m-%d'),
+                "end_date": reward_period.end_date.strftime('%Y-%m-%d'),
+                "nft_types": nft_types_data
             }
-            
-            # If wallet_address is provided, get that wallet's rewards for this NFT type in the current period
-            if wallet_address:
-                wallet_rewards = PendingReward.objects.filter(
-                    wallet_address=wallet_address,
-                    nft_type=nft_type,
-                    distribution__distributed_at__gte=start_date,
-                    distribution__distributed_at__lte=end_date
-                ).select_related('distribution').order_by('-distribution__distributed_at')
-                
-                # Group by transaction hash
-                grouped_rewards = {}
-                for reward in wallet_rewards:
-                    tx_hash = reward.distribution.transaction_hash
-                    if tx_hash not in grouped_rewards:
-                        grouped_rewards[tx_hash] = {
-                            'transaction_hash': tx_hash,
-                            'distributed_at': reward.distribution.distributed_at,
-                            'per_wallet_amount': reward.distribution.per_wallet_amount,
-                            'user_reward': Decimal('0'),
-                            'is_sent': reward.is_sent,
-                            'block_number': reward.distribution.block_number
-                        }
-                    grouped_rewards[tx_hash]['user_reward'] += reward.dit_amount
-                
-                nft_types_data[nft_type]['wallet_rewards'] = list(grouped_rewards.values())
-                nft_types_data[nft_type]['total_user_rewards'] = sum(r['user_reward'] for r in grouped_rewards.values())
-        
-        response_data = {
-            "period": period,
-            "start_date": start_date.strftime('%Y-%m-%d'),
-            "end_date": end_date.strftime('%Y-%m-%d'),
-            "nft_types": nft_types_data
-        }
         
+        # If wallet_address is provided, add that wallet's rewards per NFT type (current period only)
         if wallet_address:
+            wallet_rewards = wallet_rewards_by_nft_type(wallet_address, reward_period)
+            for nft_type, data in nft_types_data.items():
+                add_wallet_rewards(data, wallet_rewards.get(nft_type, []))
             response_data['wallet_address'] = wallet_address
         
         return Response(response_data, status=status.HTTP_200_OK)
+
+
+
+class SyncStatusAPIView(APIView):
+    """Sync position, lag and metrics of recent sync runs"""
+    
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('runs', openapi.IN_QUERY, description="Number of recent runs to include (default 10, max 100)", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: openapi.Response(
+            description="Sync status",
+            examples={
+                "application/json": {
+                    "head_block": 7412903,
+                    "head_seen_at": "2025-01-15T10:30:12Z",
+                    "lag_blocks": 3,
+                    "checkpoints": [
+                        {"contract_address": "0xc628...2d4b", "event_type": "RewardsDistributed", "synced_to": 7412900, "chunk_size": 20000}
+                    ],
+                    "last_run": {
+                        "command": "run_sync_daemon",
+                        "status": "succeeded",
+                        "duration_seconds": 0.84,
+                        "blocks_scanned": 1,
+                        "logs_fetched": 2,
+                        "events_inserted": 2,
+                        "rpc_calls": 4,
+                        "rpc": {"eth_getLogs": {"calls": 1, "errors": 0, "p50_ms": 210.4, "p95_ms": 210.4, "p99_ms": 210.4, "max_ms": 210.4, "sum_ms": 210.4}},
+                        "db_write": {"chunks": 1, "p50_ms": 12.1, "p95_ms": 12.1, "p99_ms": 12.1, "max_ms": 12.1, "sum_ms": 12.1}
+                    },
+                    "recent_runs": [],
+                    "response_cache": {
+                        "data_version": 1842,
+                        "hits": 9120,
+                        "misses": 311,
+                        "endpoints": {"total": {"hits": 4410, "misses": 95, "hit_ratio": 0.9789}}
+                    }
+                }
+            }
+        )}
+    )
+    def get(self, request):
+        """Read from the database only, no RPC calls"""
+        try:
+            runs = min(max(int(request.query_params.get('runs', 10)), 1), 100)
+        except ValueError:
+            return Response({"error": "runs must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            **sync_status(recent=runs),
+            "response_cache": response_cache_stats()
+        }, status=status.HTTP_200_OK)
+
+
+class SyncMetricsAPIView(APIView):
+    """Sync status in the Prometheus text exposition format"""
+    
+    @swagger_auto_schema(
+        operation_description="Prometheus scrape target for sync lag, throughput, RPC latency and DB write time",
+        responses={200: openapi.Response(
+            description="Prometheus text format",
+            examples={"text/plain": "diora_sync_lag_blocks 3"}
+        )}
+    )
+    def get(self, request):
+        """Return metrics as plain text for Prometheus"""
+        return HttpResponse(
+            prometheus_text({**sync_status(recent=100), 'response_cache': response_cache_stats()}),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
@@ -16,17 +16,13 @@ TIMESTAMP=$(date '+%Y-%m-%d %H:%M:%S')
 
 echo "[$TIMESTAMP] Starting blockchain sync..." >> logs/sync.log
 
-# Sync reward distributions
-python manage.py sync_reward_distributions >> logs/sync_distributions.log 2>&1
-DIST_EXIT_CODE=$?
-
-# Sync user claims
-python manage.py sync_user_claims >> logs/sync_claims.log 2>&1
-CLAIMS_EXIT_CODE=$?
+# Sync reward distributions and user claims in a single log scan
+python manage.py sync_all_blockchain_data >> logs/sync_events.log 2>&1
+SYNC_EXIT_CODE=$?
 
 # Log completion
-if [ $DIST_EXIT_CODE -eq 0 ] && [ $CLAIMS_EXIT_CODE -eq 0 ]; then
+if [ $SYNC_EXIT_CODE -eq 0 ]; then
     echo "[$TIMESTAMP] Sync completed successfully" >> logs/sync.log
 else
-    echo "[$TIMESTAMP] Sync completed with errors (dist: $DIST_EXIT_CODE, claims: $CLAIMS_EXIT_CODE)" >> logs/sync.log
+    echo "[$TIMESTAMP] Sync completed with errors (exit code: $SYNC_EXIT_CODE)" >> logs/sync.log
 fi